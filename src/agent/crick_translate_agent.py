@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
-import json
 import logging
 import argparse
 import asyncio
+import contextvars
 import sys
 import io
+import time
 from typing import Any, Dict, List, Optional
 from strands import Agent, tool
 from strands.models import BedrockModel
@@ -13,26 +14,46 @@ from bedrock_agentcore.runtime import BedrockAgentCoreApp
 # Import common functionality
 from common.cricket_translation import (
     translate_cricket_text,
-    get_cricket_terminology_data,
+    stream_cricket_translation,
+    METRICS,
+    get_cricket_terminology_response,
     validate_language,
+    ModelBusyError,
+    ModelUnavailableError,
+    TranslationError,
+    AUTO_MODEL,
+    TERMINOLOGY,
     logger
 )
+from common.batch_translation import translate_cricket_batch as translate_cricket_batch_texts
+from common.document_translation import needs_chunking, stream_cricket_document, translate_cricket_document
+from common.multilingual_translation import translate_cricket_multilingual
+from common.serialization import encode_json
+
+# Tool run times for the invocation in progress, used for the agent path latency breakdown
+_TOOL_TIMINGS: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar("tool_timings", default=None)
+
+def _record_tool_time(started: float) -> None:
+    timings = _TOOL_TIMINGS.get()
+    if timings is not None:
+        timings.append((time.perf_counter() - started) * 1000)
 
 # ==================== TRANSLATION TOOLS ====================
 
 @tool(description="translate the cricket text, say commentary, article, pre and post analysis report etc")
-async def translate_cricket(input_text, target_language, model_id="us.amazon.nova-lite-v1:0"):
+async def translate_cricket(input_text, target_language, model_id=AUTO_MODEL):
     """
     Translates cricket text to the specified Indian regional language while preserving cricket terminology.
     
     Args:
         input_text (str): The cricket text to translate
         target_language (str): Target language for translation (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi)
-        model_id (str): The model ID to use for translation (default: "us.amazon.nova-lite-v1:0")
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
         
     Returns:
         str: JSON response containing the translated text and metadata
     """
+    started = time.perf_counter()
     try:
         if not input_text:
             return "Error: Input text cannot be empty"
@@ -43,68 +64,288 @@ async def translate_cricket(input_text, target_language, model_id="us.amazon.nov
         
         logger.info(f"Translating cricket text to {target_language} using model {model_id}")
         
+        if needs_chunking(input_text):
+            # Long articles and reports are translated in chunks and reassembled
+            result = await translate_cricket_document(input_text, target_language, model_id)
+            return encode_json({
+                "translated_text": result["translated_text"],
+                "source_language": "English",
+                "target_language": target_language,
+                "chunks": result["chunks"],
+                "failed_chunks": result["failed_chunks"]
+            })
+        
         # Call the translation function
         result = await translate_cricket_text(input_text, target_language, model_id)
         
-        # Return the result as JSON with ensure_ascii=False to preserve Unicode characters
-        return json.dumps({
+        # Return the result as compact JSON; encode_json keeps Unicode characters as they are
+        return encode_json({
             "translated_text": result["translated_text"],
             "source_language": "English",
             "target_language": target_language
-        }, indent=2, ensure_ascii=False)
+        })
+    except (ModelBusyError, ModelUnavailableError) as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Error translating cricket text: {str(e)}"
+    finally:
+        _record_tool_time(started)
 
-@tool()
-async def get_cricket_terminology(target_language):
+@tool(description="translate many cricket texts, say ball-by-ball commentary lines, into one or more languages in a single call")
+async def translate_cricket_batch(input_texts, target_languages, model_id=AUTO_MODEL):
     """
-    Get cricket terminology reference for the specified language.
+    Translates a list of cricket texts into one or more Indian regional languages in a single call.
     
     Args:
-        target_language (str): Target language (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi)
+        input_texts (list): The cricket texts to translate, e.g. ball-by-ball commentary lines
+        target_languages (list): Target languages for translation (any of Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, Marathi)
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
         
     Returns:
-        str: JSON response containing cricket terminology in the target language
+        str: JSON response with one result per input text, in input order, holding a translation or an error per language
     """
+    started = time.perf_counter()
     try:
-        is_valid, error_message = validate_language(target_language)
-        if not is_valid:
-            return error_message
+        if isinstance(input_texts, str):
+            input_texts = [input_texts]
+        if isinstance(target_languages, str):
+            target_languages = [target_languages]
+        if not input_texts:
+            return "Error: Input texts cannot be empty"
+        if not target_languages:
+            return "Error: At least one target language is required"
         
-        logger.info(f"Getting cricket terminology for {target_language}")
+        logger.info(f"Translating {len(input_texts)} cricket texts to {', '.join(target_languages)} using model {model_id}")
         
-        # Get the terminology data
-        result = await get_cricket_terminology_data(target_language)
+        # Call the batch translation function
+        result = await translate_cricket_batch_texts(input_texts, target_languages, model_id)
         
-        # Return the terminology as JSON with ensure_ascii=False to preserve Unicode characters
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        # Return the result as JSON
+        return encode_json(result)
+    except Exception as e:
+        return f"Error translating cricket texts: {str(e)}"
+    finally:
+        _record_tool_time(started)
+
+@tool()
+async def get_cricket_terminology(target_language, terms=None, if_none_match=None):
+    """
+    Get cricket terminology reference for the specified language.
+    
+    Args:
+        target_language (str): Target language (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi), or "all" for every language in one response
+        terms (list): Only return these term keys, e.g. ["over", "wicket"] (default: all terms)
+        if_none_match (str): The etag of a terminology response already held; when it still matches, a short not_modified answer is returned instead of the terms
+        
+    Returns:
+        str: JSON response containing cricket terminology in the target language and its etag
+    """
+    try:
+        if isinstance(terms, str):
+            terms = [terms]
+        # Responses are serialized when the terminology is loaded, so this is a lookup
+        response = get_cricket_terminology_response(target_language, terms)
+        if response is None:
+            _, error_message = validate_language(target_language)
+            return error_message
+        if if_none_match and if_none_match == response.etag:
+            return response.not_modified
+        return response.body
     except Exception as e:
         return f"Error getting cricket terminology: {str(e)}"
     
 
 app = BedrockAgentCoreApp()
 
-agent = Agent(
-    system_prompt="You are a professional cricket translator specializing in Indian regional languages. Translate the following cricket text accurately while maintaining proper cricket terminology and cultural context. executing always using the tool",
-    tools=[translate_cricket]
-)
+AGENT_SYSTEM_PROMPT = "You are a professional cricket translator specializing in Indian regional languages. Translate the following cricket text accurately while maintaining proper cricket terminology and cultural context. executing always using the tool"
+
+# The model and its boto client are built once and shared; the Agent around them is not
+orchestrator_model = BedrockModel()
+
+
+def build_agent() -> Agent:
+    """
+    Build the orchestrating agent for one invocation.
+
+    An Agent keeps the conversation history of every call made through it and
+    rejects concurrent calls, so concurrent invocations each get a fresh one
+    around the shared model, as the translation client pool does.
+    """
+    return Agent(
+        model=orchestrator_model,
+        system_prompt=AGENT_SYSTEM_PROMPT,
+        tools=[translate_cricket, translate_cricket_batch]
+    )
+
+
+async def stream_invoke(payload):
+    """
+    Stream a translation as it is generated.
+    
+    Payloads carrying "text" and "target_language" are streamed straight from the
+    translation pipeline; free-form prompts stream the orchestrating agent's output.
+    
+    Yields:
+        {"type": "chunk", "text": ...} events followed by one {"type": "done", ...} event
+    """
+    input_text = payload.get("text")
+    target_language = payload.get("target_language")
+    if input_text and target_language:
+        is_valid, error_message = validate_language(target_language)
+        if not is_valid:
+            yield {"type": "error", "error": error_message}
+            return
+        model_id = payload.get("model_id", AUTO_MODEL)
+        try:
+            if needs_chunking(input_text):
+                # Long documents stream one translated chunk at a time, in order
+                async for event in stream_cricket_document(input_text, target_language, model_id):
+                    yield event
+                yield {"type": "done", "source_language": "English", "target_language": target_language}
+                return
+            async for event in stream_cricket_translation(input_text, target_language, model_id):
+                yield event
+        except (ModelBusyError, ModelUnavailableError, TranslationError) as e:
+            yield {"type": "error", "error": f"Error: {str(e)}"}
+        return
+    
+    user_message = payload.get(
+        "prompt", "No prompt found in input, please guide customer to create a json payload with prompt key"
+    )
+    started = time.perf_counter()
+    first_chunk_ms = None
+    async for event in build_agent().stream_async(user_message):
+        if "data" in event and event["data"]:
+            if first_chunk_ms is None:
+                first_chunk_ms = round((time.perf_counter() - started) * 1000, 2)
+                METRICS.observe("time_to_first_chunk_ms", first_chunk_ms)
+            yield {"type": "chunk", "text": event["data"]}
+        elif "result" in event:
+            yield {"type": "done", "result": str(event["result"]), "time_to_first_chunk_ms": first_chunk_ms}
+
+
+def _latency_metadata(path: str, started: float, **stages: float) -> Dict[str, Any]:
+    """Build the response metadata for an invocation and record its latency per path."""
+    total_ms = round((time.perf_counter() - started) * 1000, 2)
+    METRICS.histogram("invoke_duration_ms", total_ms, {"path": path})
+    latency_ms = {name: round(value, 2) for name, value in stages.items()}
+    latency_ms["total"] = total_ms
+    return {"path": path, "latency_ms": latency_ms}
+
+
+async def invoke_direct(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate a structured payload without the orchestrating agent.
+    
+    Payloads carrying "text" and "target_language" are translated with one pipeline
+    call; "text" with a list of "target_languages" is translated into all of them
+    with one model call; payloads carrying "texts" (and "target_languages" or
+    "target_language") go through batch translation.
+    
+    Args:
+        payload: The invocation payload
+        
+    Returns:
+        {"result": ..., "metadata": {"path", "latency_ms"}} or {"error": ...}
+    """
+    started = time.perf_counter()
+    model_id = payload.get("model_id", AUTO_MODEL)
+    try:
+        if payload.get("texts") is not None:
+            texts = payload["texts"]
+            if isinstance(texts, str):
+                texts = [texts]
+            languages = payload.get("target_languages") or payload.get("target_language")
+            if isinstance(languages, str):
+                languages = [languages]
+            if not texts:
+                return {"error": "Error: Input texts cannot be empty"}
+            if not languages:
+                return {"error": "Error: At least one target language is required"}
+            translate_started = time.perf_counter()
+            result = await translate_cricket_batch_texts(texts, languages, model_id)
+            translate_ms = (time.perf_counter() - translate_started) * 1000
+            return {"result": result, "metadata": _latency_metadata("direct_batch", started, translation=translate_ms)}
+
+        input_text = payload["text"]
+        if payload.get("target_languages") and not needs_chunking(input_text):
+            languages = payload["target_languages"]
+            if isinstance(languages, str):
+                languages = [languages]
+            translate_started = time.perf_counter()
+            result = await translate_cricket_multilingual(input_text, languages, model_id)
+            translate_ms = (time.perf_counter() - translate_started) * 1000
+            return {"result": result, "metadata": _latency_metadata("direct_multilingual", started, translation=translate_ms)}
+
+        target_language = payload.get("target_language")
+        if not target_language:
+            return {"error": "Error: Long documents are translated into one target_language at a time"}
+        is_valid, error_message = validate_language(target_language)
+        if not is_valid:
+            return {"error": error_message}
+        translate_started = time.perf_counter()
+        if needs_chunking(input_text):
+            result = await translate_cricket_document(input_text, target_language, model_id)
+            path = "direct_document"
+        else:
+            result = await translate_cricket_text(input_text, target_language, model_id)
+            # The full prompt is only useful for debugging and dwarfs the translation
+            result.pop("prompt_used", None)
+            path = "direct"
+        translate_ms = (time.perf_counter() - translate_started) * 1000
+        return {"result": result, "metadata": _latency_metadata(path, started, translation=translate_ms)}
+    except (ModelBusyError, ModelUnavailableError, TranslationError) as e:
+        return {"error": f"Error: {str(e)}"}
+
+
+def is_direct_payload(payload: Dict[str, Any]) -> bool:
+    """Check whether a payload names its text and languages, so no agent is needed to interpret it."""
+    if payload.get("texts") is not None:
+        return bool(payload.get("target_languages") or payload.get("target_language"))
+    return bool(payload.get("text") and (payload.get("target_language") or payload.get("target_languages")))
 
 
 # Specify the entry point function invoking the agent
 @app.entrypoint
-def invoke(payload):
-    """Handler for agent invocation"""
+async def invoke(payload):
+    """
+    Handler for agent invocation. Set "stream": true in the payload to stream the response.
+    
+    Structured payloads ("text" + "target_language" or "target_languages", or
+    "texts" + "target_languages") call the translation pipeline directly, saving the orchestrating model round trip.
+    Free-form "prompt" payloads go through the agent.
+    """
+    if payload.get("stream"):
+        # AgentCore sends async generator results back as server-sent events
+        return stream_invoke(payload)
+    
+    if is_direct_payload(payload):
+        return await invoke_direct(payload)
+    
     user_message = payload.get(
         "prompt", "No prompt found in input, please guide customer to create a json payload with prompt key"
     )
-    result = agent(user_message)
+    started = time.perf_counter()
+    tool_timings: List[float] = []
+    token = _TOOL_TIMINGS.set(tool_timings)
+    try:
+        result = await build_agent().invoke_async(user_message)
+    finally:
+        _TOOL_TIMINGS.reset(token)
     
     # Ensure proper encoding when returning the result
     # Convert result to string and ensure it's properly encoded
     result_str = str(result)
     
+    # Tool time is the translation itself; the rest is the orchestrating model
+    tool_ms = sum(tool_timings)
+    agent_ms = (time.perf_counter() - started) * 1000
+    metadata = _latency_metadata("agent", started, orchestration=agent_ms - tool_ms, tools=tool_ms)
+    
     # Return as JSON with ensure_ascii=False to preserve Unicode characters
-    return {"result": result_str}
+    return {"result": result_str, "metadata": metadata}
 
 if __name__ == "__main__":
+    # Terminology file changes are picked up without redeploying the runtime
+    TERMINOLOGY.watch()
     app.run()
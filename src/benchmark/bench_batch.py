@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Batch translation benchmark.
+
+Translates a commentary corpus into several languages twice against a fake
+model: once with one translate_cricket_text call per (line, language) pair and
+once with translate_cricket_batch. Reports the number of model calls and the
+wall-clock time for each path.
+
+Usage:
+    python bench_batch.py --latency 0.3 --token-rate 200 --lines 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    CLIENT_POOL,
+    MODEL_EXECUTOR
+)
+from common.batch_translation import translate_cricket_batch
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+LANGUAGES = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+
+
+def load_corpus(lines: int) -> list:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    return (corpus * (lines // len(corpus) + 1))[:lines]
+
+
+def model_calls() -> int:
+    return CLIENT_POOL.get(MODEL_ID).calls
+
+
+async def run_single(texts: list, languages: list) -> dict:
+    before = model_calls()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        translate_cricket_text(text, language, MODEL_ID, use_cache=False)
+        for text in texts for language in languages
+    ))
+    return {
+        "path": "per-item",
+        "model_calls": model_calls() - before,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+async def run_batch(texts: list, languages: list, segments_per_request: int) -> dict:
+    before = model_calls()
+    started = time.perf_counter()
+    result = await translate_cricket_batch(
+        texts, languages, MODEL_ID, segments_per_request=segments_per_request, use_cache=False
+    )
+    errors = sum(1 for item in result["results"] for r in item["translations"].values() if "error" in r)
+    return {
+        "path": "batch",
+        "model_calls": model_calls() - before,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "item_errors": errors,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batch vs per-item translation benchmark with a fake model")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model base latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=200, help="Fake model output tokens per second")
+    parser.add_argument("--lines", type=int, default=32, help="Number of commentary lines to translate")
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES, help="Target languages")
+    parser.add_argument("--segments-per-request", type=int, default=10, help="Lines packed into one model request")
+    parser.add_argument("--model-concurrency", type=int, default=8, help="Concurrent model calls per model ID")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    set_model_factory(fake_model_factory(latency=args.latency, token_rate=args.token_rate))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=args.model_concurrency, max_queue_depth=100000)
+    texts = load_corpus(args.lines)
+    single = asyncio.run(run_single(texts, args.languages))
+    batch = asyncio.run(run_batch(texts, args.languages, args.segments_per_request))
+    MODEL_EXECUTOR.shutdown()
+    print(json.dumps({
+        "lines": len(texts),
+        "languages": len(args.languages),
+        "results": [single, batch],
+        "call_reduction": round(single["model_calls"] / max(batch["model_calls"], 1), 2),
+        "speedup": round(single["elapsed_s"] / max(batch["elapsed_s"], 1e-9), 2),
+    }, indent=2))
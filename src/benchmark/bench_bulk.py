@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Bulk translation benchmark and regression check.
+
+Writes an archive of distinct commentary lines, with a long match report
+every 50 records and a few broken lines, and measures:
+
+- the cost of translating it one standalone process per record and language,
+  estimated from a few real standalone launches with the fake model;
+- records per second through run_bulk in process, with --concurrency records
+  in flight, for JSONL and for the same records as CSV (with quoted
+  multi-line fields);
+- peak Python memory for the archive and for one four times its size;
+- a bulk mode server process killed with SIGKILL part way through, then
+  started again on the same output.
+
+Exits non-zero if an output does not hold every record exactly once in
+input order, if the restarted run translates records the killed one had
+written, or if peak memory grows with the input.
+
+Usage:
+    python bench_bulk.py --records 500 --concurrency 32 --latency 0.05
+"""
+
+import argparse
+import ast
+import asyncio
+import csv
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.bulk_translation import run_bulk
+from common.cricket_translation import set_model_factory, MODEL_EXECUTOR, TRANSLATION_CACHE
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+LANGUAGES = ["Tamil", "Hindi"]
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_PATH = os.path.join(os.path.dirname(BENCHMARK_DIR), "mcp", "crick_translate_server.py")
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, "data", "commentary.txt")
+# Every 50th record is a long report and every 97th a broken line
+REPORT_EVERY = 50
+BROKEN_EVERY = 97
+
+
+def archive_records(count: int, corpus: list) -> list:
+    records = []
+    for i in range(1, count + 1):
+        if i % BROKEN_EVERY == 0:
+            records.append(None)
+        elif i % REPORT_EVERY == 0:
+            paragraphs = ["\n".join(corpus[(i + j) % len(corpus)] for j in range(p, p + 8)) for p in range(0, 64, 8)]
+            records.append({"id": f"report-{i}", "text": f"Match report {i}\n\n" + "\n\n".join(paragraphs)})
+        else:
+            # Numbers make every line unique, so nothing is served from the cache
+            records.append({"id": f"ball-{i}", "text": f"{corpus[i % len(corpus)]} ({i})"})
+    return records
+
+
+def write_jsonl(path: str, records: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write((json.dumps(record, ensure_ascii=False) if record else "{not json") + "\n")
+
+
+def write_csv(path: str, records: list) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "text"])
+        for i, record in enumerate(records, 1):
+            writer.writerow([record["id"], record["text"]] if record else [f"broken-{i}", ""])
+
+
+def check_output(path: str, records: list, label: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    if len(lines) != len(records):
+        return [f"{label}: {len(lines)} output lines for {len(records)} records"]
+    problems = []
+    for i, (line, record) in enumerate(zip(lines, records), 1):
+        if record is None:
+            if "error" not in line:
+                problems.append(f"{label}: broken record {i} was not written as an error")
+        elif line["id"] != record["id"] or set(line.get("translations", {})) != set(LANGUAGES):
+            problems.append(f"{label}: record {i} is {line.get('id')}, expected {record['id']} in every language")
+        if len(problems) >= 5:
+            break
+    return problems
+
+
+def standalone_launch_s(runs: int, latency: float) -> float:
+    command = [sys.executable, SERVER_PATH, "--mode", "standalone", "--function", "translate",
+               "--input-text", "Kohli drives through the covers for four", "--target-language", "Tamil",
+               "--model-id", MODEL_ID, "--fake-model", "--fake-latency", str(latency), "--fake-token-rate", "0"]
+    started = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, capture_output=True, check=True)
+    return (time.perf_counter() - started) / runs
+
+
+async def bulk(path: str, output: str, concurrency: int) -> dict:
+    return await run_bulk(path, LANGUAGES, MODEL_ID, output_path=output, concurrency=concurrency, progress_interval=0)
+
+
+def peak_memory_mb(path: str, output: str, concurrency: int) -> float:
+    tracemalloc.start()
+    asyncio.run(bulk(path, output, concurrency))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 1e6, 2)
+
+
+def kill_and_resume(path: str, output: str, args) -> dict:
+    command = [sys.executable, SERVER_PATH, "--mode", "bulk", "--bulk-input", path, "--bulk-output", output,
+               "--bulk-languages", *LANGUAGES, "--bulk-concurrency", str(args.concurrency),
+               "--bulk-progress-interval", "0", "--model-id", MODEL_ID, "--model-concurrency", "64",
+               "--model-queue-depth", "100000", "--fake-model", "--fake-latency", str(args.latency),
+               "--fake-token-rate", "0", "--cache-size", "0"]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Kill it once the checkpoint shows some progress, without letting it finish
+    checkpoint = f"{output}.checkpoint"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline and process.poll() is None:
+        if os.path.exists(checkpoint):
+            with open(checkpoint, encoding="utf-8") as f:
+                if json.load(f)["records"] >= args.records // 4:
+                    break
+        time.sleep(0.05)
+    process.send_signal(signal.SIGKILL)
+    process.wait()
+    with open(checkpoint, encoding="utf-8") as f:
+        written_before = json.load(f)["records"]
+    with open(output, encoding="utf-8") as f:
+        lines_at_kill = sum(1 for _ in f)
+    started = time.perf_counter()
+    resumed = subprocess.run(command, capture_output=True, text=True)
+    finished = [line for line in resumed.stderr.splitlines() if "Bulk translation finished" in line]
+    return {
+        "checkpointed_at_kill": written_before,
+        "output_lines_at_kill": lines_at_kill,
+        "resume_exit_code": resumed.returncode,
+        "resume_s": round(time.perf_counter() - started, 3),
+        "resume_summary": finished[-1].split("finished: ", 1)[-1] if finished else None,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bulk translation benchmark with a fake model")
+    parser.add_argument("--records", type=int, default=500, help="Records in the archive")
+    parser.add_argument("--concurrency", type=int, default=32, help="Records in flight")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency in seconds")
+    parser.add_argument("--launches", type=int, default=3, help="Standalone processes timed for the per-record estimate")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    set_model_factory(fake_model_factory(latency=args.latency))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=64, max_queue_depth=100000)
+    # A bounded cache, so peak memory reflects the bulk pipeline rather than the cache filling up
+    TRANSLATION_CACHE.configure(max_entries=200)
+
+    problems = []
+    records = archive_records(args.records, corpus)
+    large = archive_records(args.records * 4, corpus)
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = {name: os.path.join(workdir, name) for name in
+                 ("archive.jsonl", "archive.csv", "large.jsonl", "out.jsonl", "csv_out.jsonl", "large_out.jsonl",
+                  "small_out.jsonl", "killed_out.jsonl")}
+        write_jsonl(paths["archive.jsonl"], records)
+        write_csv(paths["archive.csv"], records)
+        write_jsonl(paths["large.jsonl"], large)
+
+        launch_s = standalone_launch_s(args.launches, args.latency)
+        jsonl = asyncio.run(bulk(paths["archive.jsonl"], paths["out.jsonl"], args.concurrency))
+        problems += check_output(paths["out.jsonl"], records, "jsonl")
+        TRANSLATION_CACHE.clear()
+        from_csv = asyncio.run(bulk(paths["archive.csv"], paths["csv_out.jsonl"], args.concurrency))
+        problems += check_output(paths["csv_out.jsonl"], records, "csv")
+
+        TRANSLATION_CACHE.clear()
+        small_mb = peak_memory_mb(paths["archive.jsonl"], paths["small_out.jsonl"], args.concurrency)
+        TRANSLATION_CACHE.clear()
+        large_mb = peak_memory_mb(paths["large.jsonl"], paths["large_out.jsonl"], args.concurrency)
+        # Four times the input may cost a little more (counters, histograms), but nowhere near four times the memory
+        if large_mb > small_mb * 1.5:
+            problems.append(f"peak memory grew from {small_mb}MB to {large_mb}MB for four times the input")
+
+        killed = kill_and_resume(paths["archive.jsonl"], paths["killed_out.jsonl"], args)
+        problems += check_output(paths["killed_out.jsonl"], records, "killed and resumed")
+        if killed["resume_exit_code"]:
+            problems.append(f"resumed bulk run exited with {killed['resume_exit_code']}")
+        resumed_records = ast.literal_eval(killed["resume_summary"])["records"] if killed["resume_summary"] else None
+        if resumed_records != args.records - killed["checkpointed_at_kill"]:
+            problems.append(f"resumed run read {resumed_records} records, expected the "
+                            f"{args.records - killed['checkpointed_at_kill']} after the checkpoint")
+        killed["resumed_records"] = resumed_records
+    MODEL_EXECUTOR.shutdown()
+
+    print(json.dumps({
+        "records": args.records,
+        "languages": len(LANGUAGES),
+        "standalone_per_launch_s": round(launch_s, 3),
+        "standalone_estimate_s": round(launch_s * args.records * len(LANGUAGES), 1),
+        "jsonl": jsonl,
+        "csv": from_csv,
+        "speedup_vs_standalone": round(launch_s * args.records * len(LANGUAGES) / jsonl["elapsed_s"], 1),
+        "peak_memory_mb": {"records": small_mb, "four_times_the_records": large_mb},
+        "kill_and_resume": killed,
+    }, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for translate_cricket_text.
+
+Fires batches of concurrent translations at a fake model that sleeps, and
+reports throughput for each concurrency level together with how many requests
+were rejected as busy. With the model call running off the event loop,
+throughput should grow with the number of concurrent clients up to the
+configured per-model concurrency limit.
+
+Usage:
+    python bench_concurrency.py --latency 0.2 --clients 1 4 16 --model-concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    get_translation_stats_data,
+    ModelBusyError,
+    MODEL_EXECUTOR
+)
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+TEXT = "Kohli hits a magnificent six over long-on"
+
+
+async def run_level(clients: int, requests_per_client: int) -> dict:
+    busy = 0
+
+    async def client():
+        nonlocal busy
+        for _ in range(requests_per_client):
+            try:
+                # Every call must reach the executor, not the translation cache
+                await translate_cricket_text(TEXT, "Tamil", MODEL_ID, use_cache=False)
+            except ModelBusyError:
+                busy += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    total = clients * requests_per_client
+    return {
+        "clients": clients,
+        "requests": total,
+        "busy_rejections": busy,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round((total - busy) / elapsed, 2),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrency benchmark with a fake model")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake model latency in seconds")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Concurrency levels to run")
+    parser.add_argument("--requests-per-client", type=int, default=5, help="Sequential requests per client")
+    parser.add_argument("--model-concurrency", type=int, default=8, help="Concurrent model calls per model ID")
+    parser.add_argument("--model-queue-depth", type=int, default=32, help="Queued model calls per model ID")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    set_model_factory(fake_model_factory(latency=args.latency))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=args.model_concurrency, max_queue_depth=args.model_queue_depth)
+    results = [asyncio.run(run_level(clients, args.requests_per_client)) for clients in args.clients]
+    MODEL_EXECUTOR.shutdown()
+    # Prompt size per call should be identical across levels: no context carries over
+    stats = get_translation_stats_data()
+    print(json.dumps({
+        "levels": results,
+        "prompt_tokens": stats["metrics"]["summaries"].get("prompt_tokens"),
+    }, indent=2))
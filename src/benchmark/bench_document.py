@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Long-document translation benchmark.
+
+Builds a document of the requested size by repeating the match report from
+cricket_translations.md, writes it to a temporary file, and translates it
+with the chunking pipeline against a fake model, reading and emitting one
+chunk at a time. Reports chunk count, wall-clock time, retries, failed chunks
+and peak Python memory, which should stay flat as the document grows.
+
+Usage:
+    python bench_document.py --size-kb 64 256 1024 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import set_model_factory, METRICS, MODEL_EXECUTOR
+from common.document_translation import stream_cricket_document
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARTICLE_PATH = os.path.join(REPO_ROOT, "cricket_translations.md")
+
+
+def load_article() -> str:
+    with open(ARTICLE_PATH, encoding="utf-8") as f:
+        # The original English report is the first fenced block
+        return f.read().split("```")[1].strip()
+
+
+def write_document(path: str, size_kb: int) -> None:
+    article = load_article()
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size_kb * 1024:
+            f.write(article + "\n\n")
+            written += len(article) + 2
+
+
+async def run(path: str, args) -> dict:
+    before = METRICS.snapshot()["counters"]
+    chunks = failed = 0
+    started = time.perf_counter()
+    tracemalloc.start()
+    with open(path, encoding="utf-8") as source, open(os.devnull, "w", encoding="utf-8") as sink:
+        async for event in stream_cricket_document(source, args.language, MODEL_ID, args.chunk_tokens,
+                                                   args.concurrency, use_cache=False):
+            chunks += 1
+            failed += "error" in event
+            sink.write(event["joiner"] + event["text"])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = METRICS.snapshot()["counters"]
+    return {
+        "size_kb": os.path.getsize(path) // 1024,
+        "chunks": chunks,
+        "retries": after.get("document_chunk_retries", 0) - before.get("document_chunk_retries", 0),
+        "failed_chunks": failed,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "peak_memory_kb": peak // 1024,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Chunked long-document translation benchmark with a fake model")
+    parser.add_argument("--size-kb", type=int, nargs="+", default=[64, 256, 1024], help="Document sizes to translate")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model base latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="Share of fake model calls that fail")
+    parser.add_argument("--chunk-tokens", type=int, default=800, help="Token budget per chunk")
+    parser.add_argument("--concurrency", type=int, default=8, help="Chunks translated at the same time")
+    parser.add_argument("--language", default="Tamil", help="Target language")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    set_model_factory(fake_model_factory(latency=args.latency, failure_rate=args.failure_rate))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=args.concurrency, max_queue_depth=100000)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_kb in args.size_kb:
+            path = os.path.join(tmp, f"document_{size_kb}kb.txt")
+            write_document(path, size_kb)
+            results.append(asyncio.run(run(path, args)))
+    MODEL_EXECUTOR.shutdown()
+    print(json.dumps({"language": args.language, "results": results}, indent=2))
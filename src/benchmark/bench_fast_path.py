@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fast path benchmark.
+
+Translates the commentary corpora with the template fast path on and off
+against a fake model, and reports the fast path hit rate and the average
+latency of lines served from templates versus lines sent to the model.
+
+Usage:
+    python bench_fast_path.py --latency 0.3 --languages Tamil Hindi
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import common.cricket_translation as cricket_translation
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    MODEL_EXECUTOR
+)
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CORPORA = ["ball_by_ball.txt", "commentary.txt"]
+
+
+def load_corpus(name: str) -> list:
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def timed(text: str, language: str) -> tuple:
+    started = time.perf_counter()
+    result = await translate_cricket_text(text, language, MODEL_ID, use_cache=False)
+    return result.get("fast_path", False), (time.perf_counter() - started) * 1000
+
+
+async def run(lines: list, languages: list, fast_path: bool) -> dict:
+    cricket_translation.FAST_PATH_ENABLED = fast_path
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(timed(text, language) for text in lines for language in languages))
+    fast = [ms for hit, ms in timings if hit]
+    model = [ms for hit, ms in timings if not hit]
+    return {
+        "fast_path": fast_path,
+        "hit_rate": round(len(fast) / len(timings), 4),
+        "fast_path_avg_ms": round(sum(fast) / len(fast), 3) if fast else None,
+        "model_path_avg_ms": round(sum(model) / len(model), 3) if model else None,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Template fast path vs model path benchmark with a fake model")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model base latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=200, help="Fake model output tokens per second")
+    parser.add_argument("--languages", nargs="+", default=["Tamil", "Hindi"], help="Target languages")
+    parser.add_argument("--model-concurrency", type=int, default=8, help="Concurrent model calls per model ID")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    set_model_factory(fake_model_factory(latency=args.latency, token_rate=args.token_rate))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=args.model_concurrency, max_queue_depth=100000)
+    report = {}
+    for name in CORPORA:
+        lines = load_corpus(name)
+        report[name] = {
+            "lines": len(lines),
+            "results": [asyncio.run(run(lines, args.languages, enabled)) for enabled in (True, False)],
+        }
+    MODEL_EXECUTOR.shutdown()
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Live feed ingestion benchmark and regression check.
+
+Writes a ball-by-ball feed for several interleaved matches to a JSONL file and
+runs it through FeedPipeline against a fake model whose latency varies, so
+events finish out of order. The feed is translated once with one event in
+flight at a time and once with --max-in-flight events, then the concurrent
+run is restarted from its checkpoint after more events are appended, and
+once more with the checkpoint offset rewound to the start of the file.
+
+Reports events per second and latency for both runs. Exits non-zero if any
+match's events come out of order or with gaps, or if a restarted run
+translates events again.
+
+Usage:
+    python bench_feed.py --events 100 --matches 4 --max-in-flight 32 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import set_model_factory, METRICS, MODEL_EXECUTOR, TRANSLATION_CACHE
+from common.feed_ingestion import run_feed
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+LANGUAGES = ["Tamil", "Hindi", "Telugu"]
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+
+
+def write_feed(path: str, events: int, matches: int, start: int = 0) -> None:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(start, start + events):
+            # Numbers make every line unique, so nothing is served from the cache
+            f.write(json.dumps({"match_id": f"match-{i % matches}", "text": f"{corpus[i % len(corpus)]} ({i})"}) + "\n")
+
+
+def model_calls() -> float:
+    return sum(value for key, value in METRICS.snapshot()["counters"].items() if key.startswith("model_calls"))
+
+
+def check_order(records: list) -> list:
+    problems = []
+    last: dict = {}
+    for record in records:
+        expected = last.get(record["match_id"], 0) + 1
+        if record["seq"] != expected:
+            problems.append(f"{record['match_id']} seq {record['seq']} written after {expected - 1}")
+        last[record["match_id"]] = record["seq"]
+    return problems
+
+
+async def run(path: str, checkpoint: str, max_in_flight: int) -> dict:
+    output = io.StringIO()
+    calls = model_calls()
+    started = time.perf_counter()
+    counts = await run_feed(path, LANGUAGES, MODEL_ID, output, checkpoint_path=checkpoint, max_in_flight=max_in_flight)
+    elapsed = time.perf_counter() - started
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    latencies = [record["latency_ms"] for record in records] or [0]
+    return {
+        "max_in_flight": max_in_flight,
+        "counts": counts,
+        "model_calls": model_calls() - calls,
+        "elapsed_s": round(elapsed, 3),
+        "events_per_s": round(len(records) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {"p50": round(statistics.median(latencies), 2), "max": round(max(latencies), 2)},
+        "records": records,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Feed ingestion benchmark with a fake model")
+    parser.add_argument("--events", type=int, default=100, help="Events in the feed")
+    parser.add_argument("--matches", type=int, default=4, help="Matches interleaved in the feed")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="Events in flight in the concurrent run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency in seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # A quarter of calls take three times as long, so events finish out of order
+    set_model_factory(fake_model_factory(latency=args.latency, slow_rate=0.25, slow_latency=args.latency * 2))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=64, max_queue_depth=100000)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed = os.path.join(workdir, "feed.jsonl")
+        write_feed(feed, args.events, args.matches)
+        sequential = asyncio.run(run(feed, os.path.join(workdir, "sequential.json"), 1))
+        TRANSLATION_CACHE.clear()
+        checkpoint = os.path.join(workdir, "concurrent.json")
+        concurrent = asyncio.run(run(feed, checkpoint, args.max_in_flight))
+        extra = max(1, args.events // 10)
+        write_feed(feed, extra, args.matches, start=args.events)
+        resumed = asyncio.run(run(feed, checkpoint, args.max_in_flight))
+        # Re-reading the whole file must skip every event by its seq
+        with open(checkpoint, encoding="utf-8") as f:
+            state = json.load(f)
+        state.update(offset=0, watermark={})
+        with open(checkpoint, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        replayed = asyncio.run(run(feed, checkpoint, args.max_in_flight))
+    MODEL_EXECUTOR.shutdown()
+
+    problems = check_order(sequential["records"]) + check_order(concurrent["records"] + resumed["records"])
+    if resumed["counts"]["events"] != extra:
+        problems.append(f"restart translated {resumed['counts']['events']} events, expected only the {extra} new ones")
+    if replayed["counts"]["events"] or replayed["model_calls"]:
+        problems.append(f"replay from the start translated {replayed['counts']['events']} events again")
+    results = [sequential, concurrent, resumed, replayed]
+    for result in results:
+        del result["records"]
+    print(json.dumps({
+        "events": args.events,
+        "matches": args.matches,
+        "languages": len(LANGUAGES),
+        "results": results,
+        "speedup": round(concurrent["events_per_s"] / sequential["events_per_s"], 2),
+    }, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Glossary engine microbenchmark.
+
+Times the per-ball glossary work on the commentary corpus: masking numbers,
+scores and names, restoring them, and checking glossary terms in the output.
+The single Aho-Corasick scan is also compared with a naive scan that runs one
+regular expression per surface form.
+
+Usage:
+    python bench_glossary.py --iterations 2000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import CRICKET_TERMS, EXAMPLE_TRANSLATIONS
+from common.glossary import GlossaryEngine, TERM_SURFACE_FORMS
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+
+
+def per_line_us(func, lines, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for line in lines:
+            func(line)
+    return round((time.perf_counter() - started) / (iterations * len(lines)) * 1e6, 2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Glossary engine microbenchmark")
+    parser.add_argument("--iterations", type=int, default=2000, help="Passes over the corpus")
+    parser.add_argument("--language", default="Tamil", help="Language used for verification")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    engine = GlossaryEngine(CRICKET_TERMS, ["Rohit Sharma", "Kohli", "Gill"])
+    translated = EXAMPLE_TRANSLATIONS[args.language]
+    naive = [re.compile(rf"\b{re.escape(form)}\b", re.IGNORECASE)
+             for forms in TERM_SURFACE_FORMS.values() for form in forms]
+
+    def full_pass(line):
+        masked = engine.mask(line)
+        restored, _ = masked.restore(masked.text)
+        engine.enforce(line, translated, args.language)
+
+    print(json.dumps({
+        "lines": len(lines),
+        "mask_us": per_line_us(engine.mask, lines, args.iterations),
+        "term_scan_aho_corasick_us": per_line_us(engine.source_terms, lines, args.iterations),
+        "term_scan_naive_regex_us": per_line_us(lambda line: [p.search(line) for p in naive], lines, args.iterations),
+        "mask_restore_enforce_us": per_line_us(full_pass, lines, args.iterations),
+    }, indent=2))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Multi-language fan-out benchmark.
+
+Translates each commentary line into several languages twice against the fake
+Bedrock model: once with one translate_cricket_text call per language and once
+with translate_cricket_multilingual, which asks for every language in one
+request. Reports model calls, input tokens (billed and served from the prompt
+cache), output tokens and per-line latency for each path.
+
+Usage:
+    python bench_multilingual.py --latency 0.3 --token-rate 50 --lines 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    METRICS,
+    MODEL_EXECUTOR
+)
+from common.multilingual_translation import translate_cricket_multilingual
+from benchmark.fake_bedrock import fake_bedrock_factory
+
+MODEL_ID = "fake-model"
+LANGUAGES = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+
+
+def load_corpus(lines: int) -> list:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    return (corpus * (lines // len(corpus) + 1))[:lines]
+
+
+def usage() -> dict:
+    snapshot = METRICS.snapshot()
+    summaries = snapshot["summaries"]
+    calls = sum(v for k, v in snapshot["counters"].items() if k.startswith("model_calls"))
+    return {
+        "model_calls": calls,
+        "input_tokens": summaries.get("prompt_tokens", {}).get("sum", 0),
+        "cache_read_tokens": summaries.get("prompt_cache_read_tokens", {}).get("sum", 0),
+        "output_tokens": summaries.get("completion_tokens", {}).get("sum", 0),
+    }
+
+
+async def run_path(name: str, texts: list, languages: list, translate_line) -> dict:
+    # Lines go one after another, like a live feed; languages within a line run concurrently
+    before = usage()
+    latencies = []
+    started = time.perf_counter()
+    for text in texts:
+        line_started = time.perf_counter()
+        await translate_line(text, languages)
+        latencies.append((time.perf_counter() - line_started) * 1000)
+    after = usage()
+    result = {"path": name, "elapsed_s": round(time.perf_counter() - started, 3)}
+    result.update({key: after[key] - before[key] for key in after})
+    result["latency_ms_per_line"] = {
+        "p50": round(statistics.median(latencies), 2),
+        "max": round(max(latencies), 2),
+    }
+    return result
+
+
+async def per_language(text: str, languages: list) -> None:
+    await asyncio.gather(*(translate_cricket_text(text, language, MODEL_ID, use_cache=False) for language in languages))
+
+
+async def fan_out(text: str, languages: list) -> None:
+    await translate_cricket_multilingual(text, languages, MODEL_ID, use_cache=False)
+
+
+def saving(before: float, after: float) -> float:
+    return round(1 - after / before, 3) if before else 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-language vs multi-language translation benchmark with a fake model")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model base latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=50, help="Fake model output tokens per second")
+    parser.add_argument("--lines", type=int, default=16, help="Number of commentary lines to translate")
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES, help="Target languages")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    set_model_factory(fake_bedrock_factory(latency=args.latency, token_rate=args.token_rate))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=len(args.languages), max_queue_depth=1000)
+    texts = load_corpus(args.lines)
+    single = asyncio.run(run_path("per-language", texts, args.languages, per_language))
+    multi = asyncio.run(run_path("multi-language", texts, args.languages, fan_out))
+    MODEL_EXECUTOR.shutdown()
+    single_input = single["input_tokens"] + single["cache_read_tokens"]
+    multi_input = multi["input_tokens"] + multi["cache_read_tokens"]
+    print(json.dumps({
+        "lines": len(texts),
+        "languages": len(args.languages),
+        "results": [single, multi],
+        "input_token_saving": saving(single_input, multi_input),
+        "billed_input_token_saving": saving(single["input_tokens"], multi["input_tokens"]),
+        "call_reduction": round(single["model_calls"] / max(multi["model_calls"], 1), 2),
+        "latency_ratio": round(multi["latency_ms_per_line"]["p50"] / single["latency_ms_per_line"]["p50"], 2),
+    }, indent=2))
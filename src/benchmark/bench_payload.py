@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Response payload benchmark and regression check.
+
+Compares how tool responses used to be written, json.dumps(indent=2) with
+the rendered prompt echoed as prompt_used, with the response formats the
+server has now:
+
+- compact_json: one line of JSON from the standard library
+- compact_orjson: the same with orjson (skipped when it is not installed)
+- pretty: indented JSON without the prompt echo (--response-format pretty)
+- structured: MCP structured content with a compact text copy (--response-format structured)
+
+It does this for a single translation, the translate_cricket tool, a batch
+of commentary lines in three languages and the stats tool, served from a
+warm cache with the fake model. For each it reports bytes on the wire, i.e.
+the JSON-RPC response the transport sends, and the serialization time per
+request: rendering the prompt for the echo, encoding the tool's JSON, and
+encoding the JSON-RPC message around it.
+
+Exits non-zero if a format carries different data than the old response
+(apart from prompt_used), if a result carries prompt_used without
+--debug-prompts, if compact responses are not smaller than the old ones,
+or if the translate_cricket tool answers differently through FastMCP's
+call_tool in each response format.
+
+Usage:
+    python bench_payload.py --iterations 2000 --batch-lines 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Union
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp"))
+import crick_translate_server as server
+import common.cricket_translation as cricket_translation
+import common.serialization as serialization
+from common.batch_translation import translate_cricket_batch
+from common.cricket_translation import TERMINOLOGY, get_translation_stats_data, set_model_factory, translate_cricket_text
+from benchmark.fake_model import fake_model_factory
+from benchmark.load_test import CORPUS_PATH
+from mcp.types import CallToolResult, JSONRPCMessage, JSONRPCResponse, ServerResult, TextContent
+
+MODEL_ID = "fake-model"
+LANGUAGE = "Tamil"
+BATCH_LANGUAGES = ["Tamil", "Hindi", "Bengali"]
+# A realistic answer in the target script, so byte counts reflect UTF-8 text rather than ASCII
+FAKE_RESPONSE = "கோலி கவர் திசையில் அழகாக அடித்து நான்கு ரன்கள் எடுத்தார், இந்தியா 3 விக்கெட் இழப்புக்கு 187 ரன்கள்"
+
+
+def legacy_encode(body: Dict[str, Any]) -> str:
+    return json.dumps(body, indent=2, ensure_ascii=False)
+
+
+def stdlib_compact(body: Dict[str, Any]) -> str:
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+
+
+def wire(result: Union[str, CallToolResult]) -> str:
+    """The JSON-RPC response a transport sends for a tool result, encoded the way the MCP session does it."""
+    if isinstance(result, str):
+        result = CallToolResult(content=[TextContent(type="text", text=result)])
+    response = JSONRPCResponse(
+        jsonrpc="2.0", id=1, result=ServerResult(result).model_dump(by_alias=True, mode="json", exclude_none=True)
+    )
+    return JSONRPCMessage(response).model_dump_json(by_alias=True, exclude_none=True)
+
+
+def formats() -> Dict[str, Callable[[Dict[str, Any]], Union[str, CallToolResult]]]:
+    encoders = {"compact_json": stdlib_compact}
+    if serialization.orjson is not None:
+        encoders["compact_orjson"] = serialization.encode_json
+    encoders["pretty"] = lambda body: serialization.encode_json(body, pretty=True)
+    encoders["structured"] = lambda body: CallToolResult(
+        content=[TextContent(type="text", text=serialization.encode_json(body))], structuredContent=body
+    )
+    return encoders
+
+
+def payload_data(result: Union[str, CallToolResult]) -> Dict[str, Any]:
+    if isinstance(result, CallToolResult):
+        return result.structuredContent
+    return json.loads(result)
+
+
+def per_request_us(call: Callable[[], Any], iterations: int) -> float:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return round((time.perf_counter() - started) / iterations * 1e6, 2)
+
+
+def measure(name: str, body: Dict[str, Any], render: Callable[[], Any], iterations: int, problems: list) -> Dict[str, Any]:
+    """Time and size the old response, which renders the prompt for prompt_used, against each format."""
+    legacy_body = dict(body)
+    if render is not None:
+        legacy_body["prompt_used"] = render()
+    legacy = legacy_encode(legacy_body)
+    legacy_wire = len(wire(legacy).encode("utf-8"))
+    results = {
+        "legacy": {
+            "tool_bytes": len(legacy.encode("utf-8")),
+            "wire_bytes": legacy_wire,
+            "serialize_us": per_request_us(lambda: wire(legacy_encode({**body, "prompt_used": render()} if render else body)), iterations),
+        }
+    }
+    expected = {key: value for key, value in json.loads(legacy).items() if key != "prompt_used"}
+    for format_name, encode in formats().items():
+        encoded = encode(body)
+        if payload_data(encoded) != expected:
+            problems.append(f"{name}: {format_name} response differs from the old one")
+        results[format_name] = {
+            "tool_bytes": len(encoded.encode("utf-8")) if isinstance(encoded, str) else 0,
+            "wire_bytes": len(wire(encoded).encode("utf-8")),
+            "serialize_us": per_request_us(lambda: wire(encode(body)), iterations),
+        }
+        results[format_name]["bytes_saved"] = f"{100 - results[format_name]['wire_bytes'] * 100 // legacy_wire}%"
+    if results["compact_json"]["wire_bytes"] >= legacy_wire:
+        problems.append(f"{name}: compact response is {results['compact_json']['wire_bytes']} bytes, not smaller than the old {legacy_wire}")
+    return results
+
+
+async def tool_through_mcp(text: str) -> Dict[str, Any]:
+    """Call translate_cricket through FastMCP in each response format and collect what a client reads back."""
+    answers = {}
+    for format_name in serialization.RESPONSE_FORMATS:
+        serialization.RESPONSE_FORMAT = format_name
+        result = await server.mcp.call_tool("translate_cricket", {"input_text": text, "target_language": LANGUAGE, "model_id": MODEL_ID})
+        if isinstance(result, CallToolResult):
+            answers[format_name] = result.structuredContent
+            # Clients that only read content must get the same answer
+            answers[f"{format_name}_text"] = json.loads(result.content[0].text) if result.content else None
+        else:
+            answers[format_name] = json.loads(result[0].text)
+    serialization.RESPONSE_FORMAT = "compact"
+    return answers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bytes on the wire and serialization time of tool responses")
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests timed per case and format")
+    parser.add_argument("--batch-lines", type=int, default=20, help="Commentary lines in the batch case")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    set_model_factory(fake_model_factory(latency=0, response=FAKE_RESPONSE))
+    text = corpus[0]
+    template = TERMINOLOGY.current.template(LANGUAGE)
+    problems = []
+
+    # Warm the cache, so every later request measures the response, not the model
+    translation = asyncio.run(translate_cricket_text(text, LANGUAGE, MODEL_ID))
+    batch = asyncio.run(translate_cricket_batch(corpus[:args.batch_lines], BATCH_LANGUAGES, MODEL_ID))
+    translation = asyncio.run(translate_cricket_text(text, LANGUAGE, MODEL_ID))
+    if "prompt_used" in translation:
+        problems.append("translate_cricket_text returned prompt_used without --debug-prompts")
+    cricket_translation.DEBUG_PROMPTS = True
+    debug = asyncio.run(translate_cricket_text(text, LANGUAGE, MODEL_ID))
+    cricket_translation.DEBUG_PROMPTS = False
+    if debug.get("prompt_used") != template.render(text):
+        problems.append("translate_cricket_text left out prompt_used with --debug-prompts")
+    tool_body = {key: translation[key] for key in ("translated_text", "source_language", "target_language")}
+
+    cases = {
+        "translate_result": measure("translate_result", translation, lambda: template.render(text), args.iterations, problems),
+        "translate_tool": measure("translate_tool", tool_body, None, args.iterations, problems),
+        "batch": measure("batch", batch, None, max(1, args.iterations // 10), problems),
+        "stats": measure("stats", get_translation_stats_data(), None, max(1, args.iterations // 10), problems),
+    }
+    answers = asyncio.run(tool_through_mcp(text))
+    for format_name, answer in answers.items():
+        if answer != tool_body:
+            problems.append(f"translate_cricket answered {answer} through call_tool with --response-format {format_name}")
+
+    print(json.dumps({
+        "encoder": serialization.encoder_name(),
+        "batch": {"lines": args.batch_lines, "languages": len(BATCH_LANGUAGES)},
+        "prompt_render_us": per_request_us(lambda: template.render(text), args.iterations),
+        "cases": cases,
+    }, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Prompt template benchmark and regression check.
+
+Compares the precompiled per-language templates with the legacy prompt that
+was rebuilt on every request: build time per request and estimated input
+tokens for short commentary lines and a long match report. It also checks
+that every template still carries all of the legacy prompt's guidelines and
+the source text exactly once, and exits non-zero if one does not.
+
+Usage:
+    python bench_prompt.py --iterations 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import CRICKET_TERMS, PROMPT_TEMPLATES, generate_translation_prompt
+from common.prompt_templates import estimate_tokens, render_legacy_prompt, verify_template
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARTICLE_PATH = os.path.join(REPO_ROOT, "cricket_translations.md")
+
+
+def load_samples() -> dict:
+    with open(os.path.join(DATA_DIR, "commentary.txt"), encoding="utf-8") as f:
+        line = next(l.strip() for l in f if l.strip())
+    article = line
+    if os.path.exists(ARTICLE_PATH):
+        with open(ARTICLE_PATH, encoding="utf-8") as f:
+            # The original English report is the first fenced block
+            article = f.read().split("```")[1].strip()
+    return {"commentary_line": line, "match_report": article}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Prompt template benchmark and regression check")
+    parser.add_argument("--iterations", type=int, default=20000, help="Prompt builds per timing run")
+    parser.add_argument("--language", default="Tamil", help="Language to time")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    problems = [p for language, template in PROMPT_TEMPLATES.items()
+                for p in verify_template(template, CRICKET_TERMS[language])]
+
+    terms = CRICKET_TERMS[args.language]
+    template = PROMPT_TEMPLATES[args.language]
+    report = {"language": args.language, "prefix_tokens": template.prefix_tokens, "samples": {}}
+    for name, text in load_samples().items():
+        legacy_us = timeit.timeit(lambda: render_legacy_prompt(text, args.language, terms), number=args.iterations)
+        template_us = timeit.timeit(lambda: generate_translation_prompt(text, args.language), number=args.iterations)
+        legacy_tokens = estimate_tokens(render_legacy_prompt(text, args.language, terms))
+        template_tokens = estimate_tokens(template.render(text))
+        report["samples"][name] = {
+            "source_chars": len(text),
+            "legacy_build_us": round(legacy_us / args.iterations * 1e6, 2),
+            "template_build_us": round(template_us / args.iterations * 1e6, 2),
+            "legacy_prompt_tokens": legacy_tokens,
+            "template_prompt_tokens": template_tokens,
+            "tokens_saved": template.tokens_saved(text),
+            "cacheable_prefix_tokens": template.prefix_tokens,
+        }
+    report["regression_problems"] = problems
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Translation quality regression check, with latency and token cost alongside.
+
+Runs the golden corpus (data/golden.jsonl) through each way the pipeline can
+produce a translation and scores every result with common.evaluation:
+
+- single: one translate_cricket_text call per line and language, no cache
+- cached: the same, answered from a warm translation cache
+- batch: translate_cricket_batch, many lines per model call
+- multilingual: translate_cricket_multilingual, every language in one call
+- document: the corpus as one article, through translate_cricket_document
+- routed: model_id "auto" with a small model tier for short lines
+- memory: the near-duplicate lines (variant_of), with the translation memory
+  loaded with the other lines' reference translations
+
+The model is an offline oracle: it answers every line of the corpus with its
+reference translation, so a correct pipeline scores 100 and anything lost in
+masking, segment parsing, chunking or reuse shows up as a lower score. Set
+--error-rate (and --small-model-error-rate for the routed small tier) to have
+it drop a glossary term, change a number or answer in English on that share
+of lines, picked deterministically per model, language and line.
+
+For each configuration the report gives latency, model calls, input and
+output tokens with their cost, how the translations were served, and the
+quality summary (pass rate, chrF, glossary, numbers and script scores).
+
+Exits non-zero if a reference translation fails its own checks, if cached
+answers score differently from single ones, if another configuration's pass
+rate is more than --max-quality-drop below single, if the translation memory
+reuses a line it should not (or misses one it should), or if single does not
+score a full pass rate with --error-rate 0.
+
+Usage:
+    python bench_quality.py --latency 0.02 --error-rate 0 --small-model-error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.batch_translation import translate_cricket_batch
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    AUTO_MODEL,
+    METRICS,
+    MODEL_ROUTER,
+    TERMINOLOGY,
+    TRANSLATION_CACHE,
+    TRANSLATION_MEMORY
+)
+from common.document_translation import translate_cricket_document
+from common.evaluation import GoldenExample, evaluate_translation, load_golden_corpus, summarize
+from common.glossary import _NUMBER_PATTERN
+from common.multilingual_translation import translate_cricket_multilingual
+from common.prompt_templates import SOURCE_TEXT_HEADING
+from common.translation_memory import FILLER_WORDS, source_shape
+from benchmark.fake_model import FakeTranslationModel
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "golden.jsonl")
+LARGE_MODEL = "oracle-large"
+SMALL_MODEL = "oracle-small"
+
+_SEGMENT_PATTERN = re.compile(r"<<<\s*(\d+)\s*>>>")
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*\d+\s*\}\}")
+_TARGET_LANGUAGE_PATTERN = re.compile(r"\*\*Target Language:\*\* (\w+)")
+_LANGUAGE_KEYS_PATTERN = re.compile(r"\*\*Answer with a JSON object with exactly these keys:\*\* (.+)")
+# Paragraph breaks and sentence ends, kept so a chunk is answered with the same layout
+_PARAGRAPH_PATTERN = re.compile(r"(\s*\n\s*)")
+_SENTENCE_PATTERN = re.compile(r"((?<=[.!?])\s+)")
+
+
+class OracleResult:
+    """A model answer with token usage, shaped like the AgentResult the pipeline reads."""
+
+    def __init__(self, text: str, input_tokens: int, output_tokens: int):
+        self.text = text
+        self.metrics = type("Metrics", (), {})()
+        self.metrics.accumulated_usage = {"inputTokens": input_tokens, "outputTokens": output_tokens}
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class OracleModel(FakeTranslationModel):
+    """
+    A fake model that answers golden corpus lines with their reference translations.
+
+    Lines are matched on their masked shape, so placeholders and numbers in the
+    prompt are carried into the answer in their place. Lines it does not know
+    are echoed in English. An error_rate share of lines is answered wrongly.
+    """
+
+    def __init__(self, model_id: str, examples: List[GoldenExample], error_rate: float = 0, **kwargs):
+        super().__init__(model_id, **kwargs)
+        self.error_rate = error_rate
+        self.errors = 0
+        self._system = threading.local()
+        glossary = TERMINOLOGY.current.glossary
+        self._answers: Dict[str, Tuple[List[str], Dict[str, str]]] = {}
+        for example in examples:
+            masked = glossary.mask(example.source)
+            key = self._shape(masked.text)
+            if key not in self._answers:
+                values = [masked.placeholders[int(p.strip("{} "))] for p in _PLACEHOLDER_PATTERN.findall(masked.text)]
+                self._answers[key] = (values, example.references)
+
+    @staticmethod
+    def _shape(text: str) -> str:
+        return " ".join(_PLACEHOLDER_PATTERN.sub("{{}}", text).split())
+
+    def _numbers(self, line: str) -> Tuple[str, List[str]]:
+        """The line's shape and its numbers, as placeholders when the pipeline masked them."""
+        if _PLACEHOLDER_PATTERN.search(line):
+            return self._shape(line), _PLACEHOLDER_PATTERN.findall(line)
+        masked = TERMINOLOGY.current.glossary.mask(line)
+        return self._shape(masked.text), [masked.placeholders[int(p.strip("{} "))]
+                                          for p in _PLACEHOLDER_PATTERN.findall(masked.text)]
+
+    def _roll(self, *parts: str) -> float:
+        digest = hashlib.sha256("\x00".join((self.model_id,) + parts).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def translate_line(self, line: str, language: str) -> str:
+        key, numbers = self._numbers(line)
+        answer = self._answers.get(key)
+        if answer is None or language not in answer[1]:
+            return line
+        values, references = answer
+        mapping = dict(zip(values, numbers))
+        text = _NUMBER_PATTERN.sub(lambda match: mapping.get(match.group(0), match.group(0)), references[language])
+        roll = self._roll(language, key)
+        if self.error_rate <= 0 or roll >= self.error_rate:
+            return text
+        with self._lock:
+            self.errors += 1
+        # Which mistake: the first third drops a term, the second changes a number, the last answers in English
+        kind = roll / self.error_rate
+        terms = TERMINOLOGY.current.terms.get(language, {})
+        if kind < 1 / 3:
+            for term_key in TERMINOLOGY.current.glossary.source_terms(line):
+                for alternative in terms.get(term_key, "").split("/"):
+                    if alternative and alternative in text:
+                        return text.replace(alternative, term_key.replace("_", " "))
+        if kind < 2 / 3 and numbers:
+            return text.replace(numbers[0], "99" if numbers[0] != "99" else "98", 1)
+        return line
+
+    def translate(self, text: str, language: str) -> str:
+        """Answer a source text paragraph by paragraph, a whole paragraph if it is known, otherwise sentence by sentence."""
+        paragraphs = []
+        for paragraph in _PARAGRAPH_PATTERN.split(text.strip()):
+            if not paragraph.strip() or self._numbers(paragraph)[0] in self._answers:
+                paragraphs.append(paragraph if not paragraph.strip() else self.translate_line(paragraph, language))
+            else:
+                paragraphs.append("".join(part if not part.strip() else self.translate_line(part, language)
+                                          for part in _SENTENCE_PATTERN.split(paragraph)))
+        return "".join(paragraphs)
+
+    def respond(self, prompt: str) -> str:
+        system = "\n".join(block.get("text", "") for block in getattr(self._system, "value", None) or [])
+        keys = _LANGUAGE_KEYS_PATTERN.search(prompt)
+        source = prompt.rsplit(SOURCE_TEXT_HEADING, 1)[-1].strip()
+        if keys:
+            languages = [language.strip() for language in keys.group(1).split(",")]
+            return json.dumps({language: self.translate(source, language) for language in languages}, ensure_ascii=False)
+        target = _TARGET_LANGUAGE_PATTERN.search(system) or _TARGET_LANGUAGE_PATTERN.search(prompt)
+        language = target.group(1) if target else ""
+        if "**Segments:**" in prompt:
+            parts = _SEGMENT_PATTERN.split(prompt.split("**Segments:**", 1)[1])[1:]
+            return "\n".join(f"<<<{number}>>> {self.translate(text.strip(), language)}"
+                             for number, text in zip(parts[::2], parts[1::2]))
+        return self.translate(source, language)
+
+    def __call__(self, prompt: str, on_chunk: Optional[Callable[[str], None]] = None,
+                 system_prompt: Optional[List[Dict[str, Any]]] = None) -> OracleResult:
+        self._system.value = system_prompt
+        text = super().__call__(prompt, on_chunk=on_chunk)
+        prompt_chars = len(prompt) + sum(len(block.get("text", "")) for block in system_prompt or [])
+        return OracleResult(text, max(1, prompt_chars // 4), max(1, len(text) // 4))
+
+
+def oracle_factory(examples: List[GoldenExample], error_rates: Dict[str, float], latency: float,
+                   token_rate: float) -> Callable[[str], OracleModel]:
+    def factory(model_id: str) -> OracleModel:
+        return OracleModel(model_id, examples, error_rate=error_rates.get(model_id, 0), latency=latency,
+                           token_rate=token_rate)
+    return factory
+
+
+def percentiles(latencies: list) -> dict:
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    return {"p50": round(statistics.median(ordered), 2), "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 2)}
+
+
+def usage_by_model() -> Dict[str, Dict[str, float]]:
+    usage: Dict[str, Dict[str, float]] = {}
+    for name, value in METRICS.snapshot()["counters"].items():
+        metric = name.split("{", 1)[0]
+        if metric in ("model_calls", "input_tokens", "output_tokens") and 'model="' in name:
+            model = name.split('model="', 1)[1].split('"', 1)[0]
+            per_model = usage.setdefault(model, {})
+            per_model[metric] = per_model.get(metric, 0) + value
+    return usage
+
+
+def served_by(result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return "error"
+    for kind in ("fast_path", "translation_memory", "cached"):
+        if result.get(kind):
+            return kind
+    return "model"
+
+
+class Run:
+    """Collects the translations, latencies and model usage of one configuration."""
+
+    def __init__(self, name: str, args):
+        self.name = name
+        self.args = args
+        self.evaluations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.served: Dict[str, int] = {}
+        self.latencies: List[float] = []
+        self._usage = usage_by_model()
+        self._started = time.perf_counter()
+        self._elapsed = 0.0
+        self._usage_after: Dict[str, Dict[str, float]] = {}
+
+    async def timed(self, call):
+        started = time.perf_counter()
+        result = await call
+        self.latencies.append((time.perf_counter() - started) * 1000)
+        return result
+
+    def record(self, example: GoldenExample, language: str, result: Dict[str, Any]) -> None:
+        kind = served_by(result)
+        self.served[kind] = self.served.get(kind, 0) + 1
+        self.evaluations[(example.id, language)] = evaluate_translation(
+            example.source, result.get("translated_text", ""), language, TERMINOLOGY.current,
+            reference=example.references.get(language)
+        )
+        self.evaluations[(example.id, language)]["served"] = kind
+
+    def finish(self) -> "Run":
+        self._elapsed = (time.perf_counter() - self._started) * 1000
+        self._usage_after = usage_by_model()
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = self._elapsed
+        calls = input_tokens = output_tokens = 0
+        cost = 0.0
+        for model, usage in self._usage_after.items():
+            before = self._usage.get(model, {})
+            delta = {metric: usage.get(metric, 0) - before.get(metric, 0) for metric in usage}
+            ratio = self.args.small_model_price_ratio if model == SMALL_MODEL else 1.0
+            calls += delta.get("model_calls", 0)
+            input_tokens += delta.get("input_tokens", 0)
+            output_tokens += delta.get("output_tokens", 0)
+            cost += ratio * (delta.get("input_tokens", 0) * self.args.input_price
+                             + delta.get("output_tokens", 0) * self.args.output_price) / 1000
+        translations = len(self.evaluations)
+        return {
+            "translations": translations,
+            "requests": len(self.latencies),
+            "elapsed_ms": round(elapsed, 2),
+            "ms_per_translation": round(elapsed / translations, 2) if translations else None,
+            "latency_ms": percentiles(self.latencies),
+            "model_calls": int(calls),
+            "input_tokens": int(input_tokens),
+            "output_tokens": int(output_tokens),
+            "cost": round(cost, 6),
+            "served": self.served,
+            "quality": summarize(self.evaluations.values()),
+        }
+
+
+async def run_single(name: str, examples: List[GoldenExample], languages: List[str], model_id: str,
+                     use_cache: bool, args) -> Run:
+    run = Run(name, args)
+    for example in examples:
+        for language in languages:
+            result = await run.timed(translate_cricket_text(example.source, language, model_id, use_cache=use_cache))
+            run.record(example, language, result)
+    return run.finish()
+
+
+async def run_batch(examples: List[GoldenExample], languages: List[str], args) -> Run:
+    run = Run("batch", args)
+    batch = await run.timed(translate_cricket_batch([e.source for e in examples], languages, LARGE_MODEL,
+                                                    segments_per_request=args.segments, use_cache=False))
+    for example, result in zip(examples, batch["results"]):
+        for language in languages:
+            run.record(example, language, result["translations"][language])
+    return run.finish()
+
+
+async def run_multilingual(examples: List[GoldenExample], languages: List[str], args) -> Run:
+    run = Run("multilingual", args)
+    for example in examples:
+        result = await run.timed(translate_cricket_multilingual(example.source, languages, LARGE_MODEL, use_cache=False))
+        for language in languages:
+            run.record(example, language, result["translations"][language])
+    return run.finish()
+
+
+async def run_document(examples: List[GoldenExample], languages: List[str], args) -> Run:
+    run = Run("document", args)
+    document = "\n\n".join(example.source for example in examples)
+    for language in languages:
+        result = await run.timed(translate_cricket_document(document, language, LARGE_MODEL,
+                                                            max_chunk_tokens=args.chunk_tokens, use_cache=False))
+        paragraphs = result["translated_text"].split("\n\n")
+        if len(paragraphs) != len(examples):
+            paragraphs = [""] * len(examples)
+        for example, paragraph in zip(examples, paragraphs):
+            run.record(example, language, {"translated_text": paragraph})
+    return run.finish()
+
+
+def should_reuse(example: GoldenExample, by_id: Dict[str, GoldenExample]) -> bool:
+    """Whether a variant differs from its original in numbers and filler words only."""
+    original = by_id[example.variant_of]
+    return set(source_shape(example.source).split()) ^ set(source_shape(original.source).split()) <= FILLER_WORDS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Translation quality, latency and token cost of each pipeline configuration")
+    parser.add_argument("--golden", default=GOLDEN_PATH, help="Golden corpus JSONL file")
+    parser.add_argument("--languages", default=None, help="Comma-separated languages (default: every language of the corpus)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds each fake model call takes")
+    parser.add_argument("--token-rate", type=float, default=0, help="Simulated output tokens per second, 0 for no output cost")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of lines the large model answers wrongly")
+    parser.add_argument("--small-model-error-rate", type=float, default=0.05, help="Share of lines the small routed model answers wrongly")
+    parser.add_argument("--small-model-tokens", type=int, default=60, help="Lines up to this many tokens are routed to the small model")
+    parser.add_argument("--input-price", type=float, default=0.003, help="Price per 1K input tokens of the large model")
+    parser.add_argument("--output-price", type=float, default=0.015, help="Price per 1K output tokens of the large model")
+    parser.add_argument("--small-model-price-ratio", type=float, default=0.1, help="Price of the small model relative to the large one")
+    parser.add_argument("--segments", type=int, default=10, help="Lines per batched model call")
+    parser.add_argument("--chunk-tokens", type=int, default=120, help="Token budget per document chunk")
+    parser.add_argument("--max-quality-drop", type=float, default=0.1, help="Largest pass rate drop allowed against single")
+    return parser.parse_args()
+
+
+async def main(args) -> int:
+    examples = load_golden_corpus(args.golden)
+    languages = args.languages.split(",") if args.languages else list(dict.fromkeys(
+        language for example in examples for language in example.references))
+    originals = [example for example in examples if not example.variant_of]
+    variants = [example for example in examples if example.variant_of]
+    by_id = {example.id: example for example in examples}
+    set_model_factory(oracle_factory(examples, {LARGE_MODEL: args.error_rate, SMALL_MODEL: args.small_model_error_rate},
+                                     args.latency, args.token_rate))
+    TRANSLATION_MEMORY.clear()
+    TRANSLATION_CACHE.clear()
+    problems = []
+
+    references = []
+    for example in examples:
+        for language, reference in example.references.items():
+            evaluation = evaluate_translation(example.source, reference, language, TERMINOLOGY.current)
+            if not evaluation["passed"]:
+                problems.append(f"reference {example.id} {language} fails its own checks: {evaluation}")
+            references.append(evaluation)
+
+    runs: Dict[str, Run] = {}
+    runs["single"] = await run_single("single", examples, languages, LARGE_MODEL, False, args)
+    await run_single("prime", examples, languages, LARGE_MODEL, True, args)
+    runs["cached"] = await run_single("cached", examples, languages, LARGE_MODEL, True, args)
+    runs["batch"] = await run_batch(examples, languages, args)
+    runs["multilingual"] = await run_multilingual(examples, languages, args)
+    runs["document"] = await run_document(examples, languages, args)
+    MODEL_ROUTER.configure(tiers=f"{args.small_model_tokens}={SMALL_MODEL},{LARGE_MODEL}")
+    runs["routed"] = await run_single("routed", examples, languages, AUTO_MODEL, False, args)
+    MODEL_ROUTER.configure(tiers="")
+
+    # The memory holds the originals' reference translations; the variants are what it is asked for
+    TRANSLATION_CACHE.clear()
+    for example in originals:
+        for language, reference in example.references.items():
+            TRANSLATION_MEMORY.add(example.source, language, reference)
+    runs["memory"] = await run_single("memory", variants, languages, LARGE_MODEL, True, args)
+    for example in variants:
+        expected = "translation_memory" if should_reuse(example, by_id) else "model"
+        for language in languages:
+            served = runs["memory"].evaluations[(example.id, language)]["served"]
+            if served != expected:
+                problems.append(f"memory: {example.id} {language} served by {served}, expected {expected}")
+
+    single = runs["single"]
+    baseline = summarize(single.evaluations.values())
+    variant_baseline = summarize(single.evaluations[(e.id, language)] for e in variants for language in languages)
+    if args.error_rate == 0 and baseline["pass_rate"] != 1.0:
+        problems.append(f"single: pass rate {baseline['pass_rate']} with a model that makes no mistakes")
+    for name, run in runs.items():
+        quality = summarize(run.evaluations.values())
+        expected = variant_baseline if name == "memory" else baseline
+        if name == "cached" and quality != baseline:
+            problems.append(f"cached: quality {quality} differs from single {baseline}")
+        elif expected["pass_rate"] - quality["pass_rate"] > args.max_quality_drop:
+            problems.append(f"{name}: pass rate {quality['pass_rate']} is more than {args.max_quality_drop} below single {expected['pass_rate']}")
+
+    print(json.dumps({
+        "corpus": {"examples": len(examples), "variants": len(variants), "languages": languages},
+        "references": summarize(references),
+        "model": {"latency_s": args.latency, "error_rate": args.error_rate,
+                  "small_model_error_rate": args.small_model_error_rate},
+        "configurations": {name: run.report() for name, run in runs.items()},
+        "translation_memory": TRANSLATION_MEMORY.stats(),
+    }, indent=2, ensure_ascii=False))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
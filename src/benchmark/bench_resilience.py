@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Resilience benchmark and regression check.
+
+Runs a burst of translations against fake models that misbehave like Bedrock:
+
+- throttling: the fake model accepts only --max-rps calls per second and
+  raises ModelThrottledException beyond that. The burst is sent once with
+  rate limiting and retries off, and once with the adaptive rate limiter and
+  jittered retries on.
+- outage: every fake call fails. The circuit breaker should open after a few
+  failures and reject the rest without calling the model.
+
+Exits non-zero if any request comes back with a canned example translation
+instead of an explicit error, or if the circuit breaker never opens.
+
+Usage:
+    python bench_resilience.py --requests 100 --max-rps 10 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    CLIENT_POOL,
+    EXAMPLE_TRANSLATIONS,
+    MODEL_EXECUTOR
+)
+from benchmark.fake_model import fake_model_factory
+
+LANGUAGE = "Tamil"
+
+
+async def burst(model_id: str, requests: int) -> dict:
+    async def one(i: int):
+        try:
+            result = await translate_cricket_text(f"Kohli drives delivery {i} through the covers", LANGUAGE,
+                                                  model_id, use_cache=False)
+            return "canned" if result["translated_text"] in EXAMPLE_TRANSLATIONS.values() else "ok"
+        except Exception as e:
+            return type(e).__name__
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    model = CLIENT_POOL.get(model_id)
+    stats = MODEL_EXECUTOR.stats()[model_id]
+    return {
+        "model": model_id,
+        "outcomes": dict(Counter(outcomes)),
+        "success_rate": round(outcomes.count("ok") / requests, 3),
+        "elapsed_s": round(elapsed, 3),
+        "model_calls": model.calls,
+        "throttled_by_model": model.throttled,
+        "rate_limit": stats["rate_limiter"],
+        "circuit_breaker": stats["circuit_breaker"],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rate limiting, retry and circuit breaker benchmark with fake models")
+    parser.add_argument("--requests", type=int, default=100, help="Requests in each burst")
+    parser.add_argument("--max-rps", type=float, default=10, help="Calls per second the throttling fake model accepts")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency in seconds")
+    parser.add_argument("--rate", type=float, default=0, help="Rate limit cap per model in calls per second, 0 to learn it from the first throttle")
+    parser.add_argument("--retries", type=int, default=5, help="Retries per call when resilience is on")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    failing = {"fake-outage"}
+
+    def factory(model_id: str):
+        failure_rate = 1.0 if model_id in failing else 0
+        max_rps = 0 if model_id in failing else args.max_rps
+        return fake_model_factory(latency=args.latency, failure_rate=failure_rate, max_rps=max_rps)(model_id)
+
+    set_model_factory(factory)
+    MODEL_EXECUTOR.configure(max_concurrency=16, max_queue_depth=100000)
+
+    # Without resilience: no pacing and no retries
+    MODEL_EXECUTOR.configure("fake-unprotected", max_rate=-1)
+    MODEL_EXECUTOR.retry_policy.retries = 0
+    unprotected = asyncio.run(burst("fake-unprotected", args.requests))
+
+    MODEL_EXECUTOR.configure("fake-protected", max_rate=args.rate)
+    MODEL_EXECUTOR.retry_policy.retries = args.retries
+    protected = asyncio.run(burst("fake-protected", args.requests))
+
+    outage = asyncio.run(burst("fake-outage", args.requests))
+    MODEL_EXECUTOR.shutdown()
+
+    results = [unprotected, protected, outage]
+    print(json.dumps({"requests": args.requests, "max_rps": args.max_rps, "results": results}, indent=2))
+
+    problems = []
+    if any(result["outcomes"].get("canned") for result in results):
+        problems.append("a canned example translation was returned instead of an error")
+    if outage["circuit_breaker"]["opened"] == 0:
+        problems.append("the circuit breaker never opened during the outage")
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
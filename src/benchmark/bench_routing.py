@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Model tiering and hedging benchmark.
+
+Tiering: translates the commentary corpus and a few long articles with
+model_id "auto" and reports how many calls went to the fast and the strong
+fake model, and how long each kind of text took.
+
+Hedging: sends a stream of translations to a fake primary model that stalls
+on a --slow-rate share of calls, once without hedging and once hedged to a
+backup fake model after the primary's p95 latency. Reports latency
+percentiles and the extra model calls hedging cost. A last run stalls every
+primary call, to show the hedge budget keeping a brownout from doubling the
+calls.
+
+Exits non-zero if any model ran more calls at once than its concurrency
+limit, which hedge losers still running in the background could cause, or
+if more calls were hedged at once than the hedge budget allows.
+
+Usage:
+    python bench_routing.py --requests 400 --clients 8 --slow-rate 0.02 --slow-latency 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    AUTO_MODEL,
+    CLIENT_POOL,
+    METRICS,
+    MODEL_EXECUTOR,
+    MODEL_ROUTER
+)
+from common.document_translation import translate_cricket_document
+from benchmark.fake_model import fake_model_factory
+
+LANGUAGE = "Tamil"
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+
+
+def percentiles(latencies: list) -> dict:
+    ordered = sorted(latencies)
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+    return {"p50": round(statistics.median(ordered), 2), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 2)}
+
+
+def calls_by_model() -> dict:
+    counters = METRICS.snapshot()["counters"]
+    calls: dict = {}
+    for name, value in counters.items():
+        if name.startswith("model_calls{"):
+            model = name.split('model="', 1)[1].split('"', 1)[0]
+            calls[model] = calls.get(model, 0) + value
+    return calls
+
+
+async def tiering(articles: int) -> dict:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    article = "\n\n".join(" ".join(lines[i:i + 6]) for i in range(0, len(lines), 6))
+    before = calls_by_model()
+    line_latencies, article_latencies = [], []
+    for line in lines:
+        started = time.perf_counter()
+        await translate_cricket_text(line, LANGUAGE, AUTO_MODEL, use_cache=False)
+        line_latencies.append((time.perf_counter() - started) * 1000)
+    for _ in range(articles):
+        started = time.perf_counter()
+        await translate_cricket_document(article, LANGUAGE, AUTO_MODEL, use_cache=False)
+        article_latencies.append((time.perf_counter() - started) * 1000)
+    after = calls_by_model()
+    return {
+        "lines": len(lines),
+        "articles": articles,
+        "article_chars": len(article),
+        "model_calls": {model: after[model] - before.get(model, 0) for model in after if after[model] != before.get(model, 0)},
+        "line_latency_ms": percentiles(line_latencies),
+        "article_latency_ms": percentiles(article_latencies),
+    }
+
+
+async def hedging(name: str, requests: int, clients: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+    peak_running: dict = {}
+    peak_hedges = 0
+
+    async def client():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await translate_cricket_text(f"Kohli drives delivery {i} through the covers", LANGUAGE,
+                                             "fake-primary", use_cache=False)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def sample_running():
+        nonlocal peak_hedges
+        while True:
+            peak_hedges = max(peak_hedges, MODEL_ROUTER.hedges_in_flight)
+            for model, model_stats in MODEL_EXECUTOR.stats().items():
+                peak_running[model] = max(peak_running.get(model, 0), model_stats["running"])
+            await asyncio.sleep(0.005)
+
+    sampler = asyncio.create_task(sample_running())
+    before = calls_by_model()
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    # Let hedge losers still holding a slot finish, so the next run starts clean
+    while any(model_stats["running"] for model_stats in MODEL_EXECUTOR.stats().values()):
+        await asyncio.sleep(0.05)
+    sampler.cancel()
+    after = calls_by_model()
+    calls = sum(after.values()) - sum(before.values())
+    return {
+        "path": name,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "latency_ms": percentiles(latencies),
+        "model_calls": calls,
+        "extra_calls": round(calls / requests - 1, 3),
+        "peak_running": {model: peak for model, peak in peak_running.items() if model in ("fake-primary", "fake-backup")},
+        "peak_hedges_in_flight": peak_hedges,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Model tiering and hedged request benchmark with fake models")
+    parser.add_argument("--requests", type=int, default=400, help="Translations sent in each hedging run")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients in each hedging run")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake primary model latency in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.02, help="Share of primary calls that stall")
+    parser.add_argument("--slow-latency", type=float, default=3.0, help="Extra seconds a stalled call takes")
+    parser.add_argument("--articles", type=int, default=2, help="Long articles translated in the tiering run")
+    parser.add_argument("--brownout-requests", type=int, default=32, help="Translations sent while every primary call stalls")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    latencies = {"fake-fast": 0.1, "fake-strong": 0.4, "fake-primary": args.latency, "fake-backup": args.latency * 1.25}
+
+    def factory(model_id: str):
+        slow_rate = args.slow_rate if model_id == "fake-primary" else 0
+        return fake_model_factory(latency=latencies.get(model_id, args.latency), slow_rate=slow_rate,
+                                  slow_latency=args.slow_latency)(model_id)
+
+    set_model_factory(factory)
+    MODEL_EXECUTOR.configure(max_concurrency=args.clients * 2, max_queue_depth=100000)
+
+    MODEL_ROUTER.configure(tiers="60=fake-fast,fake-strong")
+    tiered = asyncio.run(tiering(args.articles))
+
+    MODEL_ROUTER.configure(hedge_model="")
+    unhedged = asyncio.run(hedging("unhedged", args.requests, args.clients))
+    MODEL_ROUTER.configure(hedge_model="fake-backup")
+    hedged = asyncio.run(hedging("hedged", args.requests, args.clients))
+    slow_calls = CLIENT_POOL.get("fake-primary").slow_calls
+    CLIENT_POOL.get("fake-primary").slow_rate = 1.0
+    brownout = asyncio.run(hedging("brownout", args.brownout_requests, args.clients))
+    MODEL_EXECUTOR.shutdown()
+
+    problems = []
+    max_concurrency = args.clients * 2
+    for run in (unhedged, hedged, brownout):
+        for model, peak in run["peak_running"].items():
+            if peak > max_concurrency:
+                problems.append(f"{run['path']} ran {peak} calls at once on {model}, over the limit of {max_concurrency}")
+    max_hedges = max(1, int(MODEL_ROUTER.hedge_budget * args.clients))
+    for run in (hedged, brownout):
+        if run["peak_hedges_in_flight"] > max_hedges:
+            problems.append(f"{run['path']} hedged {run['peak_hedges_in_flight']} calls at once, over the budget of {max_hedges}")
+
+    print(json.dumps({
+        "tiering": tiered,
+        "hedging": [unhedged, hedged, brownout],
+        "primary_slow_calls": slow_calls,
+        "p99_reduction": round(1 - hedged["latency_ms"]["p99"] / unhedged["latency_ms"]["p99"], 3),
+        "router": MODEL_ROUTER.stats(),
+    }, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
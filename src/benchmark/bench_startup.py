@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+MCP server startup benchmark and regression check.
+
+Q CLI starts crick_translate_server.py as a fresh process for every stdio
+session, so the server's import time and its time to answer initialize and
+list_tools are paid before the first tool call. This measures:
+
+- Import time of the server module, in a fresh interpreter each run, as it is
+  and with the model SDK (strands, boto) imported up front like it used to be.
+- Time from process start to the initialize and list_tools responses over
+  stdio, with and without --warm-up, and how long the warm-up takes to
+  build the model clients in the background after the handshake.
+
+Exits non-zero if importing the server loads the model SDK, or if list_tools
+does not list the translation tools.
+
+Usage:
+    python bench_startup.py --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp.types import LATEST_PROTOCOL_VERSION
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp")
+SERVER_PATH = os.path.join(SERVER_DIR, "crick_translate_server.py")
+SDK_MODULES = ["strands", "boto3", "botocore"]
+EXPECTED_TOOLS = {"translate_cricket", "translate_cricket_batch", "get_cricket_terminology"}
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+{preload}
+sys.path.insert(0, {server_dir!r})
+import crick_translate_server
+print(json.dumps({{"import_ms": (time.perf_counter() - started) * 1000,
+                  "sdk_loaded": [m for m in {sdk_modules!r} if m in sys.modules]}}))
+"""
+
+
+def import_time(eager: bool) -> dict:
+    preload = "import strands, strands.models" if eager else ""
+    script = IMPORT_SCRIPT.format(preload=preload, server_dir=SERVER_DIR, sdk_modules=SDK_MODULES)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+async def handshake(warm_up: bool, warm_up_timeout: float) -> dict:
+    """Start the stdio server, run initialize and list_tools, and time each answer from process start."""
+    args = [sys.executable, SERVER_PATH, "--mode", "mcp", "--mode-type", "stdio"]
+    if warm_up:
+        args.append("--warm-up")
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(*args, stdin=asyncio.subprocess.PIPE,
+                                                   stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    warmed = asyncio.get_running_loop().create_future()
+
+    async def watch_log():
+        async for line in process.stderr:
+            if b"Warmed up" in line and not warmed.done():
+                warmed.set_result((time.perf_counter() - started) * 1000)
+
+    log_task = asyncio.create_task(watch_log())
+
+    async def send(message: dict) -> None:
+        process.stdin.write((json.dumps(message) + "\n").encode())
+        await process.stdin.drain()
+
+    async def receive(request_id: int) -> dict:
+        while True:
+            message = json.loads(await process.stdout.readline())
+            if message.get("id") == request_id:
+                return message
+
+    try:
+        await send({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": LATEST_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bench-startup", "version": "0"},
+        }})
+        await receive(1)
+        initialize_ms = (time.perf_counter() - started) * 1000
+        await send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        await send({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = await receive(2)
+        list_tools_ms = (time.perf_counter() - started) * 1000
+        warm_up_ms = None
+        if warm_up:
+            try:
+                warm_up_ms = await asyncio.wait_for(asyncio.shield(warmed), warm_up_timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        log_task.cancel()
+    return {
+        "initialize_ms": initialize_ms,
+        "list_tools_ms": list_tools_ms,
+        "warm_up_done_ms": warm_up_ms,
+        "tools": sorted(tool["name"] for tool in tools["result"]["tools"]),
+    }
+
+
+def summarize(runs: list, keys: list) -> dict:
+    summary = {}
+    for key in keys:
+        values = [run[key] for run in runs if run[key] is not None]
+        if values:
+            summary[key] = {"p50": round(statistics.median(values), 1), "max": round(max(values), 1)}
+    return summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="MCP server import and handshake time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes started per measurement")
+    parser.add_argument("--warm-up-timeout", type=float, default=30, help="Seconds to wait for the background warm-up")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    lazy = [import_time(eager=False) for _ in range(args.runs)]
+    eager = [import_time(eager=True) for _ in range(args.runs)]
+    cold = [asyncio.run(handshake(False, args.warm_up_timeout)) for _ in range(args.runs)]
+    warm = [asyncio.run(handshake(True, args.warm_up_timeout)) for _ in range(args.runs)]
+
+    problems = []
+    loaded = sorted({module for run in lazy for module in run["sdk_loaded"]})
+    if loaded:
+        problems.append(f"importing the server loads {', '.join(loaded)}")
+    for run in cold + warm:
+        missing = EXPECTED_TOOLS - set(run["tools"])
+        if missing:
+            problems.append(f"list_tools is missing {', '.join(sorted(missing))}")
+            break
+
+    lazy_ms = statistics.median(run["import_ms"] for run in lazy)
+    eager_ms = statistics.median(run["import_ms"] for run in eager)
+    print(json.dumps({
+        "runs": args.runs,
+        "import": {
+            "lazy": summarize(lazy, ["import_ms", "process_ms"]),
+            "sdk_imported_up_front": summarize(eager, ["import_ms", "process_ms"]),
+            "saved_ms": round(eager_ms - lazy_ms, 1),
+        },
+        "stdio_handshake": {
+            "cold": summarize(cold, ["initialize_ms", "list_tools_ms"]),
+            "warm_up": summarize(warm, ["initialize_ms", "list_tools_ms", "warm_up_done_ms"]),
+        },
+        "tools": cold[0]["tools"],
+    }, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Terminology store benchmark and hot reload regression check.
+
+Measures language validation against the old list scan and the cost of
+loading the terminology file. Then it translates under load with a fake
+model while the terminology file is edited twice. The first edit is valid:
+it changes a Tamil term and adds a language. The second leaves the file
+broken. It checks the following:
+
+- no request fails while the file changes;
+- the valid edit is picked up within a few reload intervals;
+- the added language is rejected before the edit and accepted after it;
+- prompts and cache keys use the new terms after the edit;
+- the broken file is skipped and the last good terminology stays in use.
+
+Exits non-zero if any of these does not hold.
+
+Usage:
+    python bench_terminology.py --clients 16 --duration 3 --reload-interval 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import common.cricket_translation as cricket_translation
+from common.cricket_translation import (
+    translate_cricket_text,
+    set_model_factory,
+    validate_language,
+    MODEL_EXECUTOR,
+    TERMINOLOGY
+)
+from common.batch_translation import generate_batch_translation_prompt
+from common.terminology import DEFAULT_TERMS_PATH, load_terminology
+from benchmark.fake_model import fake_model_factory
+
+MODEL_ID = "fake-model"
+NEW_LANGUAGE = "Odia"
+NEW_OVER = "ஓவர் (புதியது)"
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "commentary.txt")
+LEGACY_LANGUAGES = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+
+
+def legacy_validate_language(target_language: str) -> (bool, str):
+    """validate_language as it was, building and scanning the list on every call."""
+    supported_languages = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+    if target_language not in supported_languages:
+        return False, f"Error: Target language must be one of: {', '.join(supported_languages)}. Got: {target_language}"
+    return True, ""
+
+
+def per_call_us(fn, *args, number: int) -> float:
+    return round(timeit.timeit(lambda: fn(*args), number=number) / number * 1e6, 3)
+
+
+def write_edited(path: str) -> None:
+    with open(DEFAULT_TERMS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data["languages"]["Tamil"]["terms"]["over"] = NEW_OVER
+    data["languages"][NEW_LANGUAGE] = {
+        "script": "0B00-0B7F",
+        "example": "କୋହଲି ଲଙ୍ଗ-ଅନ ଉପରେ ଏକ ଚମତ୍କାର ଛକା ମାରିଲେ।",
+        "terms": {"over": "ଓଭର", "wicket": "ୱିକେଟ", "ball": "ବଲ", "batsman": "ବ୍ୟାଟ୍ସମ୍ୟାନ", "bowler": "ବୋଲର"},
+    }
+    # Written next to the file and renamed over it, like a deploy would
+    staging = path + ".tmp"
+    with open(staging, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(staging, path)
+
+
+async def wait_for(condition, timeout: float) -> float:
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            return -1
+        await asyncio.sleep(0.01)
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def under_load(path: str, clients: int, duration: float, reload_interval: float) -> dict:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    outcomes = {"translated": 0, "rejected_before": 0, "accepted_after": 0, "errors": 0}
+    edited = asyncio.Event()
+    stop = time.perf_counter() + duration
+
+    async def client(offset: int):
+        i = offset
+        while time.perf_counter() < stop:
+            language = ("Tamil", "Hindi", NEW_LANGUAGE)[i % 3]
+            i += clients
+            is_valid, _ = validate_language(language)
+            if language == NEW_LANGUAGE:
+                if not is_valid:
+                    outcomes["rejected_before" if not edited.is_set() else "errors"] += 1
+                    continue
+                outcomes["accepted_after"] += 1
+            try:
+                await translate_cricket_text(f"{lines[i % len(lines)]} ({i})", language, MODEL_ID)
+                outcomes["translated"] += 1
+            except Exception:
+                outcomes["errors"] += 1
+
+    async def editor():
+        await asyncio.sleep(duration / 3)
+        before = TERMINOLOGY.current.version
+        write_edited(path)
+        picked_up_ms = await wait_for(lambda: TERMINOLOGY.current.version != before, reload_interval * 4 + 1)
+        edited.set()
+        await asyncio.sleep(duration / 3)
+        good = TERMINOLOGY.current.version
+        errors = TERMINOLOGY.reload_errors
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"languages": {"Tamil": {"terms": ')
+        await wait_for(lambda: TERMINOLOGY.reload_errors > errors, reload_interval * 4 + 1)
+        return picked_up_ms, good
+
+    results = await asyncio.gather(editor(), *(client(n) for n in range(clients)))
+    picked_up_ms, good_version = results[0]
+    outcomes["reload_picked_up_ms"] = picked_up_ms
+    outcomes["kept_last_good_version"] = TERMINOLOGY.current.version == good_version
+    return outcomes
+
+
+async def cache_keys_follow(path: str) -> dict:
+    """Translate one line, cache it, then check an edit of the file makes it a cache miss."""
+    text = "Starc bowls a full delivery outside off, Gill leaves it alone"
+    await translate_cricket_text(text, "Tamil", MODEL_ID)
+    cached_before = (await translate_cricket_text(text, "Tamil", MODEL_ID))["cached"]
+    version = TERMINOLOGY.current.prompt_version
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["languages"]["Tamil"]["terms"]["partnership"] = "இணை"
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    TERMINOLOGY.reload()
+    cached_after = (await translate_cricket_text(text, "Tamil", MODEL_ID))["cached"]
+    return {"cached_before_edit": cached_before, "cached_after_edit": cached_after,
+            "prompt_version_changed": TERMINOLOGY.current.prompt_version != version}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Terminology store and hot reload benchmark with a fake model")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients translating during the reloads")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of load")
+    parser.add_argument("--reload-interval", type=float, default=0.1, help="Seconds between checks of the terminology file")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake model latency in seconds")
+    parser.add_argument("--iterations", type=int, default=200000, help="Iterations per validation timing")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    validation = {
+        "legacy_valid_us": per_call_us(legacy_validate_language, "Marathi", number=args.iterations),
+        "indexed_valid_us": per_call_us(validate_language, "Marathi", number=args.iterations),
+        "legacy_invalid_us": per_call_us(legacy_validate_language, "Urdu", number=args.iterations),
+        "indexed_invalid_us": per_call_us(validate_language, "Urdu", number=args.iterations),
+    }
+    load_ms = round(timeit.timeit(lambda: load_terminology(DEFAULT_TERMS_PATH), number=20) / 20 * 1000, 2)
+
+    set_model_factory(fake_model_factory(latency=args.latency))
+    MODEL_EXECUTOR.configure(MODEL_ID, max_concurrency=args.clients, max_queue_depth=100000)
+    problems = []
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "terminology.json")
+        shutil.copyfile(DEFAULT_TERMS_PATH, path)
+        TERMINOLOGY.configure(path=path)
+        TERMINOLOGY.watch(args.reload_interval)
+        load = asyncio.run(under_load(path, args.clients, args.duration, args.reload_interval))
+        template = TERMINOLOGY.current.template("Tamil")
+        prompts = {
+            "template_has_new_term": NEW_OVER in template.prefix,
+            "batch_prompt_has_new_term": NEW_OVER in generate_batch_translation_prompt(["x"], "Tamil"),
+            "module_names_follow": cricket_translation.CRICKET_TERMS["Tamil"]["over"] == NEW_OVER,
+        }
+        # The broken file is still in place; put a good one back for the cache check
+        write_edited(path)
+        TERMINOLOGY.reload()
+        cache = asyncio.run(cache_keys_follow(path))
+    MODEL_EXECUTOR.shutdown()
+
+    if load["errors"]:
+        problems.append(f"{load['errors']} requests failed while the terminology file changed")
+    if load["reload_picked_up_ms"] < 0:
+        problems.append("the edited terminology file was never reloaded")
+    if not load["rejected_before"] or not load["accepted_after"]:
+        problems.append(f"{NEW_LANGUAGE} was not rejected before the edit and accepted after it")
+    if not load["kept_last_good_version"]:
+        problems.append("a broken terminology file replaced the last good one")
+    problems.extend(f"{name} is false after the edit" for name, ok in prompts.items() if not ok)
+    if not cache["cached_before_edit"] or cache["cached_after_edit"] or not cache["prompt_version_changed"]:
+        problems.append(f"translation cache did not follow the terminology version: {cache}")
+
+    print(json.dumps({
+        "validation": validation,
+        "load_terminology_ms": load_ms,
+        "hot_reload": load,
+        "prompts": prompts,
+        "cache": cache,
+        "terminology": TERMINOLOGY.stats(),
+    }, indent=2, ensure_ascii=False))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tool-call overhead microbenchmark for get_cricket_terminology.
+
+Compares the old implementation, which validated the language, rebuilt the
+response dict and ran json.dumps(indent=2) on every call, with the
+precomputed responses. It covers one language, every language (one "all"
+call against seven calls), a term subset, and a revalidation with a
+matching etag. Each case is timed calling the tool function directly and
+through FastMCP's call_tool, which adds argument validation and result
+wrapping. It reports microseconds per call and response bytes.
+
+Exits non-zero if a precomputed response differs from the old one apart
+from the added etag.
+
+Usage:
+    python bench_tool_overhead.py --iterations 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp"))
+import crick_translate_server as server
+from common.cricket_translation import CRICKET_TERMS
+
+LANGUAGE = "Tamil"
+# Plain dicts, like the literal the old implementation read from
+LEGACY_TERMS = {language: dict(terms) for language, terms in CRICKET_TERMS.items()}
+
+
+async def legacy_get_cricket_terminology(target_language):
+    """get_cricket_terminology as it was: validate, rebuild the dict and serialize on every call."""
+    supported_languages = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+    if target_language not in supported_languages:
+        return f"Error: Target language must be one of: {', '.join(supported_languages)}. Got: {target_language}"
+    result = {"language": target_language, "terminology": LEGACY_TERMS.get(target_language, {})}
+    return json.dumps(result, indent=2, ensure_ascii=False)
+
+
+async def per_call_us(call, iterations: int) -> float:
+    await call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    return round((time.perf_counter() - started) / iterations * 1e6, 2)
+
+
+async def run(iterations: int) -> dict:
+    server.mcp.tool(name="legacy_get_cricket_terminology")(legacy_get_cricket_terminology)
+    etag = json.loads(await server.get_cricket_terminology(LANGUAGE))["etag"]
+    languages = list(CRICKET_TERMS)
+
+    async def legacy_all():
+        for language in languages:
+            await legacy_get_cricket_terminology(language)
+
+    async def legacy_all_mcp():
+        for language in languages:
+            await server.mcp.call_tool("legacy_get_cricket_terminology", {"target_language": language})
+
+    cases = {
+        "one_language": (
+            lambda: legacy_get_cricket_terminology(LANGUAGE),
+            lambda: server.get_cricket_terminology(LANGUAGE),
+            lambda: server.mcp.call_tool("legacy_get_cricket_terminology", {"target_language": LANGUAGE}),
+            lambda: server.mcp.call_tool("get_cricket_terminology", {"target_language": LANGUAGE}),
+        ),
+        "all_languages": (
+            legacy_all,
+            lambda: server.get_cricket_terminology("all"),
+            legacy_all_mcp,
+            lambda: server.mcp.call_tool("get_cricket_terminology", {"target_language": "all"}),
+        ),
+        "term_subset": (
+            lambda: legacy_get_cricket_terminology(LANGUAGE),
+            lambda: server.get_cricket_terminology(LANGUAGE, ["over", "wicket"]),
+            lambda: server.mcp.call_tool("legacy_get_cricket_terminology", {"target_language": LANGUAGE}),
+            lambda: server.mcp.call_tool("get_cricket_terminology",
+                                         {"target_language": LANGUAGE, "terms": ["over", "wicket"]}),
+        ),
+        "not_modified": (
+            lambda: legacy_get_cricket_terminology(LANGUAGE),
+            lambda: server.get_cricket_terminology(LANGUAGE, None, etag),
+            lambda: server.mcp.call_tool("legacy_get_cricket_terminology", {"target_language": LANGUAGE}),
+            lambda: server.mcp.call_tool("get_cricket_terminology",
+                                         {"target_language": LANGUAGE, "if_none_match": etag}),
+        ),
+    }
+    results = {}
+    for name, (legacy, current, legacy_mcp, current_mcp) in cases.items():
+        legacy_languages = languages if name == "all_languages" else [LANGUAGE]
+        legacy_bytes = 0
+        for language in legacy_languages:
+            legacy_bytes += len((await legacy_get_cricket_terminology(language)).encode("utf-8"))
+        results[name] = {
+            "legacy_us": await per_call_us(legacy, iterations),
+            "precomputed_us": await per_call_us(current, iterations),
+            "legacy_call_tool_us": await per_call_us(legacy_mcp, iterations // 10),
+            "precomputed_call_tool_us": await per_call_us(current_mcp, iterations // 10),
+            "legacy_bytes": legacy_bytes,
+            "precomputed_bytes": len((await current()).encode("utf-8")),
+        }
+        results[name]["speedup"] = round(results[name]["legacy_us"] / results[name]["precomputed_us"], 1)
+    return results
+
+
+async def check() -> list:
+    problems = []
+    for language in CRICKET_TERMS:
+        legacy = json.loads(await legacy_get_cricket_terminology(language))
+        current = json.loads(await server.get_cricket_terminology(language))
+        current.pop("etag", None)
+        if current != legacy:
+            problems.append(f"{language}: precomputed response differs from the old one")
+    return problems
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="get_cricket_terminology tool-call overhead")
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per direct timing, a tenth of that through call_tool")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    problems = asyncio.run(check())
+    print(json.dumps(asyncio.run(run(args.iterations)), indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Multi-worker server benchmark and regression check.
+
+Starts crick_translate_server.py in streamable-HTTP mode with the fake
+Bedrock model and --workers 1, 2, 4 (or --workers), and drives it with
+concurrent MCP clients sending distinct commentary lines. It reports
+throughput and latency per worker count, then checks with the most workers:
+
+- the shared cache: the same lines sent again from new sessions, which land
+  on any worker, are answered from the cache, not the model;
+- the shared rate budget: with --model-rate set, all workers together start
+  model calls no faster than that rate, not that rate per worker.
+
+The defaults make the fake model the bottleneck: each worker has its own
+model concurrency limit, so throughput grows with the worker count even on
+a single core. With a fast fake model (--latency 0.01 --model-concurrency 64)
+the server's own CPU time is the bottleneck instead, and throughput grows
+only up to the number of cores (cpu_count is reported).
+
+Exits non-zero if the most workers are not at least --min-speedup times
+faster than one, if repeated lines miss the shared cache, or if the workers
+together exceed the shared rate budget.
+
+Usage:
+    python bench_workers.py --workers 1 2 4 --clients 16 --requests-per-client 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add the parent directory to the path so we can import common
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark.load_test import CORPUS_PATH, LANGUAGES, SERVER_PATH, fetch_stats, free_port, percentile, wait_for_port
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+
+def start_server(args, port: int, workers: int, model_rate: float = -1, cache_size: int = 10000) -> subprocess.Popen:
+    command = [
+        sys.executable, SERVER_PATH,
+        "--mode-type", "streamable-http",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--fake-model",
+        "--fake-latency", str(args.latency),
+        "--fake-token-rate", "0",
+        "--cache-size", str(cache_size),
+        "--model-concurrency", str(args.model_concurrency),
+        "--model-queue-depth", "1024",
+        "--model-rate", str(model_rate),
+    ]
+    # A burst of one, so the rate check measures the budget rather than the saved-up burst
+    env = dict(os.environ, CRICKET_MODEL_BURST="1")
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, env=env,
+                            stderr=None if args.server_logs else subprocess.DEVNULL)
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def client_session(url: str, texts: List[str], latencies: List[float], errors: List[str]) -> None:
+    async with streamablehttp_client(url, {}, timeout=120) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for i, text in enumerate(texts):
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool("translate_cricket", {
+                        "input_text": text, "target_language": LANGUAGES[i % len(LANGUAGES)],
+                    })
+                    body = result.content[0].text if result.content else ""
+                    if result.isError or body.startswith("Error"):
+                        errors.append(body[:200])
+                    else:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                except Exception as e:
+                    errors.append(str(e)[:200])
+
+
+async def drive(url: str, workload: List[List[str]]) -> Dict[str, Any]:
+    """Run one MCP session per list of texts, all at once."""
+    latencies: List[float] = []
+    errors: List[str] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client_session(url, texts, latencies, errors) for texts in workload))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies) + len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95)},
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:3],
+    }
+
+
+async def cache_counters(url: str, workers: int) -> Dict[str, int]:
+    """Sum the cache counters of every worker, opening new sessions until each worker has answered one."""
+    seen: Dict[int, Dict[str, Any]] = {}
+    for _ in range(workers * 25):
+        stats = await fetch_stats(url)
+        seen[stats["pid"]] = stats["cache"]
+        if len(seen) == workers:
+            break
+    totals = {name: sum(cache[name] for cache in seen.values()) for name in ("hits", "misses", "persistent_hits")}
+    totals["workers_seen"] = len(seen)
+    return totals
+
+
+def make_workload(corpus: List[str], clients: int, per_client: int, tag: str) -> List[List[str]]:
+    # Tagged so every request is a distinct text, and runs never hit each other's cache entries
+    return [[f"{corpus[(c * per_client + i) % len(corpus)]} ({tag}-{c}-{i})" for i in range(per_client)]
+            for c in range(clients)]
+
+
+def run_server(args, workers: int, workload_runs: List[List[List[str]]], **server_options) -> List[Dict[str, Any]]:
+    """Start a server, drive it with each workload in turn, and record every worker's cache counters after each."""
+    port = free_port()
+    server = start_server(args, port, workers, **server_options)
+    try:
+        wait_for_port(port, server)
+        url = f"http://127.0.0.1:{port}/mcp"
+        results = []
+        for workload in workload_runs:
+            result = asyncio.run(drive(url, workload))
+            result["cache"] = asyncio.run(cache_counters(url, workers))
+            results.append(result)
+        return results
+    finally:
+        stop_server(server)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Throughput of the multi-worker server against a fake model")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent MCP client sessions")
+    parser.add_argument("--requests-per-client", type=int, default=4, help="Tool calls made by each session")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake model latency in seconds")
+    parser.add_argument("--model-concurrency", type=int, default=2, help="Concurrent model calls per model ID in each worker")
+    parser.add_argument("--model-rate", type=float, default=10, help="Shared model calls per second for the rate budget check")
+    parser.add_argument("--min-speedup", type=float, default=1.5, help="Required throughput of the most workers over one worker")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="File with one commentary line per line")
+    parser.add_argument("--server-logs", action="store_true", help="Show the servers' log output")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    most = max(args.workers)
+
+    scaling = {}
+    for workers in args.workers:
+        workload = make_workload(corpus, args.clients, args.requests_per_client, f"scale{workers}")
+        scaling[workers] = run_server(args, workers, [workload])[0]
+
+    # Same lines twice, from new sessions each time, so repeats land on other workers than the first answer
+    workload = make_workload(corpus, args.clients, args.requests_per_client, "cache")
+    first, repeated = run_server(args, most, [workload, workload])
+    cache = {
+        "first_pass": first,
+        "repeated": repeated,
+        "repeat_misses": repeated["cache"]["misses"] - first["cache"]["misses"],
+        "repeat_hits_from_other_workers": repeated["cache"]["persistent_hits"] - first["cache"]["persistent_hits"],
+    }
+
+    # Enough requests for a few seconds at the shared rate
+    per_client = max(1, int(args.model_rate * 4 / args.clients) + 1)
+    workload = make_workload(corpus, args.clients, per_client, "rate")
+    budget = run_server(args, most, [workload], model_rate=args.model_rate, cache_size=0)[0]
+    budget["model_rate"] = args.model_rate
+
+    problems = []
+    baseline = scaling[min(args.workers)]["throughput_rps"]
+    speedup = round(scaling[most]["throughput_rps"] / baseline, 2) if baseline else 0
+    if most > min(args.workers) and speedup < args.min_speedup:
+        problems.append(f"{most} workers are only {speedup}x as fast as {min(args.workers)} (need {args.min_speedup}x)")
+    for name, result in list(scaling.items()) + [("cache", first), ("cache repeat", repeated), ("rate budget", budget)]:
+        if result["errors"]:
+            problems.append(f"{result['errors']} requests failed ({name}): {result['error_samples']}")
+    if repeated["cache"]["workers_seen"] < most:
+        problems.append(f"only {repeated['cache']['workers_seen']} of {most} workers answered a stats call")
+    elif cache["repeat_misses"]:
+        problems.append(f"{cache['repeat_misses']} repeated lines missed the shared cache")
+    # The first call of each worker may go out before the bucket is drawn down; allow a second's worth of slack
+    allowed = args.model_rate * (budget["elapsed_s"] + 1) / budget["elapsed_s"] if budget["elapsed_s"] else 0
+    if budget["throughput_rps"] > allowed:
+        problems.append(f"{most} workers made {budget['throughput_rps']} calls/s against a shared budget of {args.model_rate}/s")
+
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "scaling": {str(workers): result for workers, result in scaling.items()},
+        "speedup": speedup,
+        "shared_cache": cache,
+        "shared_rate_budget": budget,
+    }, indent=2, ensure_ascii=False))
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
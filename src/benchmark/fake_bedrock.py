@@ -0,0 +1,127 @@
+"""
+Fake Bedrock model for offline load tests.
+
+FakeTranslationModel (see fake_model.py) replaces the whole translation
+client. FakeBedrockModel instead replaces only the strands BedrockModel, so a
+load test still runs the real per-call Agent, callback handler and usage
+accounting in BedrockTranslationClient. It streams Bedrock ConverseStream
+events with configurable latency, output token rate and failure injection,
+and reports token usage (including prompt cache reads after the first call
+with the same cached prefix) like Bedrock does.
+
+Install it with common.cricket_translation.set_model_factory(fake_bedrock_factory(...)),
+or start the MCP server with --fake-model.
+"""
+
+import asyncio
+import random
+import threading
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from strands.models import Model
+from strands.types.exceptions import ModelThrottledException
+
+from benchmark.fake_model import FakeTranslationModel
+from common.client_pool import BedrockTranslationClient
+
+
+class FakeBedrockModel(Model):
+    """
+    strands Model that answers like Bedrock without calling AWS.
+
+    Each request waits ``latency`` seconds, then streams the answer about one
+    token (four characters) at a time at ``token_rate`` tokens per second (0
+    streams it at once). A ``failure_rate`` share of requests raise
+    RuntimeError after the latency, like a failed Bedrock call, and requests
+    beyond ``max_rps`` per second raise ModelThrottledException at once.
+    """
+
+    def __init__(self, model_id: str, latency: float = 0.5, token_rate: float = 0,
+                 failure_rate: float = 0, response: str = "[fake translation]", max_rps: float = 0):
+        self.config: Dict[str, Any] = {"model_id": model_id}
+        self.latency = latency
+        self.token_rate = token_rate
+        self.failure_rate = failure_rate
+        self.answers = FakeTranslationModel(model_id, latency=0, response=response, max_rps=max_rps)
+        self._random = random.Random()
+        self._cached_prefixes: set = set()
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    async def structured_output(self, output_model: Any, prompt: Any, system_prompt: Optional[str] = None,
+                                **kwargs: Any) -> AsyncGenerator[Dict[str, Any], None]:
+        raise NotImplementedError("FakeBedrockModel does not support structured output")
+        yield {}
+
+    def _usage(self, prompt: str, system_blocks: List[Dict[str, Any]], answer: str) -> Dict[str, int]:
+        # Text up to a cache point is served from the prompt cache after the first request
+        cached_chars = 0
+        prefix = ""
+        for block in system_blocks:
+            if "cachePoint" in block:
+                with self._lock:
+                    if prefix in self._cached_prefixes:
+                        cached_chars = len(prefix)
+                    self._cached_prefixes.add(prefix)
+            prefix += block.get("text", "")
+        input_tokens = max(1, (len(prefix) + len(prompt) - cached_chars) // 4)
+        output_tokens = max(1, len(answer) // 4)
+        usage = {"inputTokens": input_tokens, "outputTokens": output_tokens,
+                 "totalTokens": input_tokens + output_tokens}
+        if cached_chars:
+            usage["cacheReadInputTokens"] = cached_chars // 4
+        return usage
+
+    async def stream(self, messages: List[Dict[str, Any]], tool_specs: Any = None,
+                     system_prompt: Optional[str] = None, *,
+                     system_prompt_content: Optional[List[Dict[str, Any]]] = None,
+                     **kwargs: Any) -> AsyncGenerator[Dict[str, Any], None]:
+        prompt = "".join(
+            block.get("text", "") for block in messages[-1]["content"]
+        ) if messages else ""
+        system_blocks = system_prompt_content or ([{"text": system_prompt}] if system_prompt else [])
+        answer = self.answers.respond(prompt)
+        if not self.answers.admit():
+            raise ModelThrottledException("ThrottlingException: Too many requests, please wait before trying again.")
+
+        await asyncio.sleep(self.latency)
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            raise RuntimeError("fake Bedrock failure")
+
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        step = 4 if self.token_rate > 0 else len(answer) or 1
+        for start in range(0, len(answer), step):
+            if self.token_rate > 0:
+                await asyncio.sleep(1 / self.token_rate)
+            yield {"contentBlockDelta": {"delta": {"text": answer[start:start + step]}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": self._usage(prompt, system_blocks, answer),
+                            "metrics": {"latencyMs": int(self.latency * 1000)}}}
+
+
+def fake_bedrock_factory(latency: float = 0.5, token_rate: float = 0, failure_rate: float = 0,
+                         max_rps: float = 0) -> Callable[[str], BedrockTranslationClient]:
+    """
+    Build a model factory whose clients run the real Agent path against FakeBedrockModel.
+
+    Args:
+        latency: Seconds each fake request waits before answering
+        token_rate: Simulated output tokens per second, 0 for no output cost
+        failure_rate: Share of requests that raise, between 0 and 1
+        max_rps: Requests accepted per second before throttling, 0 for no limit
+
+    Returns:
+        A factory suitable for set_model_factory
+    """
+    def factory(model_id: str) -> BedrockTranslationClient:
+        model = FakeBedrockModel(model_id, latency=latency, token_rate=token_rate, failure_rate=failure_rate,
+                                 max_rps=max_rps)
+        return BedrockTranslationClient(model_id, model=model)
+    return factory
@@ -0,0 +1,161 @@
+"""
+Fake translation model for offline benchmarks.
+
+Stands in for a Bedrock-backed strands Agent: it takes a prompt, blocks for a
+configurable time like a real model call would, and returns a canned response.
+Install it with common.cricket_translation.set_model_factory.
+
+Batched prompts (numbered <<<n>>> segments) get one numbered answer per
+segment, multi-language prompts get a JSON object keyed by language, and glossary placeholders ({{n}}) in the source are echoed back, so
+the parsers see the same shape a real model returns.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from strands.types.exceptions import ModelThrottledException
+
+_SEGMENT_PATTERN = re.compile(r"<<<\s*(\d+)\s*>>>")
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*\d+\s*\}\}")
+_LANGUAGE_KEYS_PATTERN = re.compile(r"\*\*Answer with a JSON object with exactly these keys:\*\* (.+)")
+
+# A word in each language's script, so multi-language answers pass the script check
+_SCRIPT_SAMPLES = {
+    "Tamil": "கிரிக்கெட்",
+    "Hindi": "क्रिकेट",
+    "Telugu": "క్రికెట్",
+    "Kannada": "ಕ್ರಿಕೆಟ್",
+    "Bengali": "ক্রিকেট",
+    "Malayalam": "ക്രിക്കറ്റ്",
+    "Marathi": "क्रिकेट",
+}
+
+
+class FakeTranslationModel:
+    """
+    A blocking prompt -> text callable that sleeps to simulate model latency.
+
+    Each call takes ``latency`` seconds plus the time to "generate" the answer
+    at ``token_rate`` output tokens per second (0 disables the output cost).
+    When on_chunk is given the answer is also emitted token by token.
+    A ``failure_rate`` share of calls raise RuntimeError after the latency,
+    and a ``slow_rate`` share take ``slow_latency`` seconds longer, like an
+    endpoint having a bad moment.
+    Calls beyond ``max_rps`` in any one-second window raise
+    ModelThrottledException at once, like a Bedrock ThrottlingException.
+    """
+
+    def __init__(self, model_id: str, latency: float = 0.5, response: str = "[fake translation]",
+                 token_rate: float = 0, failure_rate: float = 0, max_rps: float = 0,
+                 slow_rate: float = 0, slow_latency: float = 0):
+        self.model_id = model_id
+        self.latency = latency
+        self.response = response
+        self.token_rate = token_rate
+        self.failure_rate = failure_rate
+        self.max_rps = max_rps
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.calls = 0
+        self.failures = 0
+        self.throttled = 0
+        self.slow_calls = 0
+        self._random = random.Random(0)
+        self._recent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """Count a request against the max_rps quota; False means it is throttled."""
+        if self.max_rps <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_rps:
+                self.throttled += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def respond(self, prompt: str) -> str:
+        """Build the answer for a prompt without sleeping. Placeholders in the source are echoed back."""
+        if "**Segments:**" in prompt:
+            segments = prompt.split("**Segments:**", 1)[1]
+            parts = _SEGMENT_PATTERN.split(segments)[1:]
+            return "\n".join(
+                f"<<<{number}>>> {self.response} {number}{self._placeholders(text)}"
+                for number, text in zip(parts[::2], parts[1::2])
+            )
+        source = prompt.rsplit("**Now translate the following cricket text:**", 1)[-1]
+        keys = _LANGUAGE_KEYS_PATTERN.search(prompt)
+        if keys:
+            languages = [language.strip() for language in keys.group(1).split(",")]
+            return json.dumps({
+                language: f"{_SCRIPT_SAMPLES.get(language, '')} {self.response}{self._placeholders(source)}".strip()
+                for language in languages
+            }, ensure_ascii=False)
+        return f"{self.response}{self._placeholders(source)}"
+
+    @staticmethod
+    def _placeholders(text: str) -> str:
+        found = _PLACEHOLDER_PATTERN.findall(text)
+        return (" " + " ".join(found)) if found else ""
+
+    def __call__(self, prompt: str, on_chunk: Optional[Callable[[str], None]] = None,
+                 system_prompt: Optional[List[Dict[str, Any]]] = None) -> str:
+        if not self.admit():
+            raise ModelThrottledException("ThrottlingException: Too many requests, please wait before trying again.")
+        with self._lock:
+            self.calls += 1
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            slow = self.slow_rate > 0 and self._random.random() < self.slow_rate
+            if slow:
+                self.slow_calls += 1
+        text = self.respond(prompt)
+        time.sleep(self.latency + (self.slow_latency if slow else 0))
+        if fail:
+            raise RuntimeError("fake model failure")
+        # Emit roughly one token (four characters) at a time at token_rate
+        per_token = 1 / self.token_rate if self.token_rate > 0 else 0
+        if on_chunk is None:
+            time.sleep(per_token * max(1, len(text) // 4))
+            return text
+        for start in range(0, len(text), 4):
+            if per_token:
+                time.sleep(per_token)
+            on_chunk(text[start:start + 4])
+        return text
+
+
+def fake_model_factory(latency: float = 0.5, response: str = "[fake translation]",
+                       token_rate: float = 0, failure_rate: float = 0,
+                       max_rps: float = 0, slow_rate: float = 0,
+                       slow_latency: float = 0) -> Callable[[str], FakeTranslationModel]:
+    """
+    Build a model factory that hands out FakeTranslationModel instances.
+
+    Args:
+        latency: Seconds each fake model call blocks for before answering
+        response: Text returned by every call
+        token_rate: Simulated output tokens per second, 0 for no output cost
+        failure_rate: Share of calls that raise, between 0 and 1
+        max_rps: Calls accepted per second before throttling, 0 for no limit
+        slow_rate: Share of calls that take slow_latency seconds longer
+        slow_latency: Extra seconds a slow call takes
+
+    Returns:
+        A factory suitable for set_model_factory
+    """
+    def factory(model_id: str) -> FakeTranslationModel:
+        return FakeTranslationModel(model_id, latency=latency, response=response, token_rate=token_rate,
+                                    failure_rate=failure_rate, max_rps=max_rps, slow_rate=slow_rate,
+                                    slow_latency=slow_latency)
+    return factory
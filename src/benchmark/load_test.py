@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the MCP server.
+
+Starts crick_translate_server.py in streamable-HTTP mode backed by the fake
+Bedrock model (--fake-model), opens N concurrent MCP client sessions that
+replay a commentary corpus through a translation tool, and reports
+throughput, p50/p95/p99 latency, error rate and tokens per request as JSON.
+No AWS access is needed, so regressions in the hot path can be caught locally.
+
+Pass --url to drive an already running server instead of starting one.
+
+Usage:
+    python load_test.py --clients 16 --requests-per-client 20 --latency 0.3 --failure-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_PATH = os.path.join(os.path.dirname(BENCHMARK_DIR), "mcp", "crick_translate_server.py")
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, "data", "commentary.txt")
+LANGUAGES = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, port: int) -> subprocess.Popen:
+    command = [
+        sys.executable, SERVER_PATH,
+        "--mode-type", "streamable-http",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--fake-model",
+        "--fake-latency", str(args.latency),
+        "--fake-token-rate", str(args.token_rate),
+        "--fake-failure-rate", str(args.failure_rate),
+        "--fake-max-rps", str(args.max_rps),
+        "--cache-size", str(args.cache_size),
+        "--model-concurrency", str(args.model_concurrency),
+        "--model-queue-depth", str(args.model_queue_depth),
+    ]
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL,
+                            stderr=None if args.server_logs else subprocess.DEVNULL)
+
+
+def wait_for_port(port: int, server: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Server did not listen on port {port} within {timeout}s")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[rank], 2)
+
+
+def counter_total(counters: Dict[str, float], name: str) -> float:
+    """Sum a counter over all of its label combinations."""
+    return sum(v for k, v in counters.items() if k == name or k.startswith(name + "{"))
+
+
+def tool_arguments(tool: str, text: str, language: str) -> Dict[str, Any]:
+    if tool == "translate_cricket_batch":
+        return {"input_texts": [text], "target_languages": [language]}
+    return {"input_text": text, "target_language": language}
+
+
+async def client_session(url: str, client_id: int, corpus: List[str], args,
+                         latencies: List[float], errors: List[str]) -> None:
+    async with streamablehttp_client(url, {}, timeout=120) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            for i in range(args.requests_per_client):
+                # Each client starts at a different point of the corpus and language list
+                position = client_id * args.requests_per_client + i
+                text = corpus[position % len(corpus)]
+                language = args.languages[position % len(args.languages)]
+                started = time.perf_counter()
+                try:
+                    result = await session.call_tool(args.tool, tool_arguments(args.tool, text, language))
+                    body = result.content[0].text if result.content else ""
+                    if result.isError or body.startswith("Error"):
+                        errors.append(body[:200])
+                    else:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                except Exception as e:
+                    errors.append(str(e)[:200])
+
+
+async def fetch_stats(url: str) -> Dict[str, Any]:
+    async with streamablehttp_client(url, {}, timeout=30) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool("get_translation_stats", {})
+            # Prefer the structured copy when a --response-format structured server sends one
+            if result.structuredContent is not None:
+                return result.structuredContent
+            return json.loads(result.content[0].text)
+
+
+async def run(url: str, args) -> Dict[str, Any]:
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client_session(url, client_id, corpus, args, latencies, errors) for client_id in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    stats = await fetch_stats(url)
+    summaries = stats["metrics"]["summaries"]
+    counters = stats["metrics"]["counters"]
+    total = len(latencies) + len(errors)
+    model_calls = counter_total(counters, "model_calls")
+    token_sum = summaries.get("prompt_tokens", {}).get("sum", 0) + summaries.get("completion_tokens", {}).get("sum", 0)
+    return {
+        "tool": args.tool,
+        "clients": args.clients,
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": round(max(latencies), 2) if latencies else None,
+        },
+        "error_rate": round(len(errors) / total, 4) if total else 0,
+        "errors": sorted(set(errors))[:5],
+        "model_calls": model_calls,
+        "translation_failures": counter_total(counters, "translation_failures"),
+        "model_throttled": counter_total(counters, "model_throttled"),
+        "model_retries": counter_total(counters, "model_retries"),
+        "coalesced_requests": counter_total(counters, "coalesced_requests"),
+        "tokens_per_request": round(token_sum / total, 1) if total else 0,
+        "prompt_tokens_per_call": round(summaries.get("prompt_tokens", {}).get("avg", 0), 1),
+        "cache_read_tokens_per_call": round(summaries.get("prompt_cache_read_tokens", {}).get("avg", 0), 1),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline MCP server load test with a fake Bedrock model")
+    parser.add_argument("--url", help="MCP endpoint of a running server; by default a server is started")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent MCP client sessions")
+    parser.add_argument("--requests-per-client", type=int, default=20, help="Tool calls made by each session")
+    parser.add_argument("--tool", choices=["translate_cricket", "translate_cricket_stream", "translate_cricket_batch"],
+                        default="translate_cricket", help="Tool to call")
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES, help="Target languages to cycle through")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="File with one commentary line per line")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=200, help="Fake model output tokens per second")
+    parser.add_argument("--failure-rate", type=float, default=0, help="Share of fake model requests that fail")
+    parser.add_argument("--max-rps", type=float, default=0, help="Fake model requests per second before it throttles, 0 for no limit")
+    parser.add_argument("--cache-size", type=int, default=0, help="Server translation cache size, 0 sends every request to the model")
+    parser.add_argument("--model-concurrency", type=int, default=16, help="Server concurrent model calls per model ID")
+    parser.add_argument("--model-queue-depth", type=int, default=256, help="Server queued model calls per model ID")
+    parser.add_argument("--server-logs", action="store_true", help="Show the server's log output")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = None
+    url = args.url
+    try:
+        if url is None:
+            port = free_port()
+            server = start_server(args, port)
+            wait_for_port(port, server)
+            url = f"http://127.0.0.1:{port}/mcp"
+        print(json.dumps(asyncio.run(run(url, args)), indent=2, ensure_ascii=False))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
@@ -0,0 +1,288 @@
+"""
+Batch translation of many commentary lines into many languages.
+
+Publishing a ball-by-ball feed into all seven languages one line and one
+language at a time costs a separate model call per pair. This module packs
+several lines into each model request using numbered segment markers, parses
+the numbered output back, and fans out across languages concurrently.
+
+Formulaic lines (see common.fast_path), cached lines and near-duplicates of
+approved translations (see common.translation_memory) are served without a
+model call. Segments missing from a batched response are retried one at a
+time, and anything that still fails is reported as a per-item error instead
+of failing the whole batch.
+"""
+
+import asyncio
+import functools
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.cricket_translation import (
+    MODEL_ROUTER,
+    TERMINOLOGY,
+    TRANSLATION_CACHE,
+    _apply_glossary,
+    _call_model,
+    _fast_path,
+    _mask_source,
+    _translation_memory,
+    logger,
+    validate_language,
+)
+from common.metrics import METRICS
+from common.model_executor import ModelBusyError
+from common.resilience import ModelUnavailableError
+from common.prompt_templates import PLACEHOLDER_INSTRUCTION, render_guidelines
+from common.terminology import Terminology
+from common.translation_cache import make_cache_key
+
+DEFAULT_SEGMENTS_PER_REQUEST = int(os.environ.get("CRICKET_BATCH_SEGMENTS", "10"))
+DEFAULT_MAX_BATCH_CHARS = int(os.environ.get("CRICKET_BATCH_MAX_CHARS", "4000"))
+
+# Marker placed in front of every segment, in the prompt and in the expected output
+SEGMENT_MARKER = "<<<{index}>>>"
+SEGMENTS_HEADING = "**Segments:**"
+_SEGMENT_PATTERN = re.compile(r"<<<\s*(\d+)\s*>>>")
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_prompt_prefix(terminology: Terminology, target_language: str) -> str:
+    """Static part of the batch prompt for a language, rendered once per terminology version."""
+    return f"""You are a professional cricket translator specializing in Indian regional languages. Translate each of the cricket text segments given by the user accurately while maintaining proper cricket terminology and cultural context.
+
+**Target Language:** {target_language}
+
+{render_guidelines(target_language, terminology.terms.get(target_language, {}))}
+
+**Output Format:**
+Translate every numbered segment separately into {target_language} script. Start each translation with the same marker as its source segment, for example {SEGMENT_MARKER.format(index=1)}, and keep the segments in order. Do not merge, skip or add segments, and do not add any other text.
+{PLACEHOLDER_INSTRUCTION}"""
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_system_content(terminology: Terminology, target_language: str) -> List[Dict[str, Any]]:
+    """System content blocks for the batch prompt, reusing the template's cache point setting."""
+    blocks: List[Dict[str, Any]] = [{"text": _batch_prompt_prefix(terminology, target_language)}]
+    blocks.extend(block for block in terminology.template(target_language).system_content if "cachePoint" in block)
+    return blocks
+
+
+def _clear_prompt_caches(terminology: Terminology) -> None:
+    # Prompts rendered for an older terminology version are never asked for again
+    _batch_prompt_prefix.cache_clear()
+    _batch_system_content.cache_clear()
+
+
+TERMINOLOGY.on_reload(_clear_prompt_caches)
+
+
+def _batch_user_message(segments: List[str]) -> str:
+    numbered = "\n".join(
+        f"{SEGMENT_MARKER.format(index=i)} {segment}" for i, segment in enumerate(segments, start=1)
+    )
+    return f"{SEGMENTS_HEADING}\n{numbered}\n"
+
+
+def generate_batch_translation_prompt(segments: List[str], target_language: str) -> str:
+    """
+    Generate a prompt that translates several numbered segments in one request.
+
+    Args:
+        segments: The cricket texts to translate, numbered from 1 in the prompt
+        target_language: The target language for translation
+
+    Returns:
+        A prompt string to be sent to an LLM
+    """
+    return f"{_batch_prompt_prefix(TERMINOLOGY.current, target_language)}\n\n{_batch_user_message(segments)}"
+
+
+def parse_batch_translation(response: str, expected: int) -> Dict[int, str]:
+    """
+    Split a batched model response back into its numbered segments.
+
+    Args:
+        response: The raw model output
+        expected: Number of segments that were sent
+
+    Returns:
+        Translations keyed by 1-based segment number. Numbers outside 1..expected,
+        duplicates and empty segments are dropped.
+    """
+    parsed: Dict[int, str] = {}
+    matches = list(_SEGMENT_PATTERN.finditer(response))
+    for position, match in enumerate(matches):
+        index = int(match.group(1))
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(response)
+        text = response[match.end():end].strip()
+        if 1 <= index <= expected and index not in parsed and text:
+            parsed[index] = text
+    return parsed
+
+
+def _pack_segments(items: List[Tuple[int, str]], segments_per_request: int,
+                   max_batch_chars: int) -> List[List[Tuple[int, str]]]:
+    """Group (position, text) items into batches bounded by count and characters."""
+    batches: List[List[Tuple[int, str]]] = []
+    current: List[Tuple[int, str]] = []
+    current_chars = 0
+    for item in items:
+        size = len(item[1])
+        if current and (len(current) >= segments_per_request or current_chars + size > max_batch_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(item)
+        current_chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _translate_single(text: str, target_language: str, model_id: str, terminology: Terminology) -> str:
+    template = terminology.template(target_language)
+    return await _call_model(model_id, template.user_message(text), template.system_content)
+
+
+async def _translate_batch(batch: List[Tuple[int, str]], target_language: str, model_id: str,
+                           results: Dict[int, Dict[str, Any]], terminology: Terminology, use_cache: bool) -> int:
+    """Translate one packed batch into results; returns the number of model calls made."""
+    calls = 0
+    parsed: Dict[int, str] = {}
+    masks = [_mask_source(text) for _, text in batch]
+    if len(batch) > 1:
+        prompt = _batch_user_message([mask.text if mask else text for mask, (_, text) in zip(masks, batch)])
+        try:
+            calls += 1
+            response = await _call_model(model_id, prompt, _batch_system_content(terminology, target_language))
+            parsed = parse_batch_translation(response, len(batch))
+        except (ModelBusyError, ModelUnavailableError) as e:
+            # Backpressure and an open circuit must not turn into one more call per segment
+            for position, _ in batch:
+                results[position] = {"error": str(e)}
+            return calls
+        except Exception as e:
+            logger.error(f"Batch translation to {target_language} failed, retrying segments individually: {str(e)}")
+        if len(parsed) < len(batch):
+            METRICS.increment("batch_segments_retried", len(batch) - len(parsed))
+
+    for number, (position, text) in enumerate(batch, start=1):
+        translated = parsed.get(number)
+        issues: List[str] = []
+        if translated is not None:
+            translated, issues, missing = _apply_glossary(text, translated, target_language, masks[number - 1])
+            if missing:
+                # A segment that lost a score or name is retried on its own, unmasked
+                METRICS.increment("glossary_placeholder_retries")
+                translated = None
+        if translated is None:
+            try:
+                calls += 1
+                translated = await _translate_single(text, target_language, model_id, terminology)
+                translated, issues, _ = _apply_glossary(text, translated, target_language, None)
+            except (ModelBusyError, ModelUnavailableError) as e:
+                results[position] = {"error": str(e)}
+                continue
+            except Exception as e:
+                logger.error(f"Error translating segment {position} to {target_language}: {str(e)}")
+                results[position] = {"error": f"Error translating cricket text: {str(e)}"}
+                continue
+        if use_cache:
+            TRANSLATION_CACHE.set(make_cache_key(text, target_language, model_id, terminology.prompt_version), translated)
+        results[position] = {"translated_text": translated, "cached": False, "glossary_issues": issues}
+    return calls
+
+
+async def _translate_language(texts: List[str], target_language: str, model_id: str,
+                              segments_per_request: int, max_batch_chars: int, use_cache: bool,
+                              terminology: Terminology) -> Tuple[Dict[int, Dict[str, Any]], int]:
+    """Translate every text into one language; returns per-position results and model call count."""
+    results: Dict[int, Dict[str, Any]] = {}
+    pending: List[Tuple[int, str]] = []
+    for position, text in enumerate(texts):
+        if not text:
+            results[position] = {"error": "Error: Input text cannot be empty"}
+            continue
+        fast_text = _fast_path(text, target_language)
+        if fast_text is not None:
+            results[position] = {"translated_text": fast_text, "cached": False, "fast_path": True}
+            continue
+        cached = None
+        if use_cache:
+            cached = TRANSLATION_CACHE.get(make_cache_key(text, target_language, model_id, terminology.prompt_version))
+        if cached is not None:
+            results[position] = {"translated_text": cached, "cached": True}
+            continue
+        remembered = _translation_memory(text, target_language) if use_cache else None
+        if remembered is not None:
+            results[position] = {"translated_text": remembered.translation, "cached": False,
+                                  "translation_memory": {"similarity": remembered.similarity}}
+        else:
+            pending.append((position, text))
+
+    batches = _pack_segments(pending, segments_per_request, max_batch_chars)
+    calls = await asyncio.gather(
+        *(_translate_batch(batch, target_language, model_id, results, terminology, use_cache) for batch in batches)
+    )
+    return results, sum(calls)
+
+
+async def translate_cricket_batch(input_texts: List[str], target_languages: List[str], model_id: str,
+                                  segments_per_request: Optional[int] = None,
+                                  max_batch_chars: Optional[int] = None,
+                                  use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Translate many cricket texts into many Indian regional languages.
+
+    Args:
+        input_texts: The cricket texts to translate
+        target_languages: The target languages for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by the longest text
+        segments_per_request: Maximum texts packed into one model request
+        max_batch_chars: Maximum source characters packed into one model request
+        use_cache: Serve repeated text from the translation cache and near-duplicates from
+            the translation memory
+
+    Returns:
+        A dictionary with one result per input text, in input order. Each result
+        maps every target language to either a translated_text or an error.
+    """
+    segments_per_request = max(1, segments_per_request or DEFAULT_SEGMENTS_PER_REQUEST)
+    model_id = MODEL_ROUTER.route(model_id, max(input_texts, key=len, default=""))
+    max_batch_chars = max_batch_chars or DEFAULT_MAX_BATCH_CHARS
+    terminology = TERMINOLOGY.current
+
+    languages: List[str] = []
+    invalid: Dict[str, str] = {}
+    for language in dict.fromkeys(target_languages):
+        is_valid, error_message = validate_language(language)
+        if is_valid:
+            languages.append(language)
+        else:
+            invalid[language] = error_message
+
+    per_language = await asyncio.gather(
+        *(_translate_language(input_texts, language, model_id, segments_per_request, max_batch_chars, use_cache,
+                              terminology)
+          for language in languages)
+    )
+
+    model_calls = 0
+    results = [{"index": i, "input_text": text, "translations": {}} for i, text in enumerate(input_texts)]
+    for language, (language_results, calls) in zip(languages, per_language):
+        model_calls += calls
+        for position, result in language_results.items():
+            results[position]["translations"][language] = result
+    for language, error_message in invalid.items():
+        for result in results:
+            result["translations"][language] = {"error": error_message}
+
+    METRICS.increment("batch_requests")
+    METRICS.increment("batch_model_calls", model_calls)
+    return {
+        "source_language": "English",
+        "target_languages": list(dict.fromkeys(target_languages)),
+        "results": results,
+        "model_calls": model_calls,
+    }
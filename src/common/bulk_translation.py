@@ -0,0 +1,396 @@
+"""
+Bulk translation of archived commentary and match reports.
+
+Standalone mode translates one text per process, so backfilling an archive
+means a process launch, a model client and a handshake per record.
+BulkTranslator instead streams records from a JSONL or CSV file, translates
+each into the target languages with at most ``concurrency`` records in
+flight, and writes one JSON line per record in input order. Long reports are
+translated in chunks (see common.document_translation), and every text goes
+through the translation cache, so a persistent cache (--cache-path) carries
+over between runs.
+
+A record is a JSON object or a CSV row with a "text" field, an optional "id"
+(the record number when missing) and optional "languages" (a list in JSON,
+comma or semicolon separated in CSV) overriding the run's languages.
+
+Memory does not grow with the input: the file is read as records are
+needed, and only the records in flight are held. A BulkCheckpoint records the
+input offset, the number of records and the output size up to which every
+record was written. A restarted run truncates the output to that size and
+reads on from that offset, so an interrupted run neither repeats nor loses a
+record.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+from common.cricket_translation import TERMINOLOGY, logger
+from common.feed_ingestion import translate_with_retries
+from common.metrics import METRICS
+
+DEFAULT_BULK_CONCURRENCY = int(os.environ.get("CRICKET_BULK_CONCURRENCY", "16"))
+DEFAULT_BULK_RETRIES = int(os.environ.get("CRICKET_BULK_RETRIES", "5"))
+DEFAULT_PROGRESS_INTERVAL = float(os.environ.get("CRICKET_BULK_PROGRESS_INTERVAL", "5"))
+
+# Seconds between checkpoint saves; a crash repeats at most this much work
+CHECKPOINT_INTERVAL = 1.0
+
+_LANGUAGE_SEPARATOR = re.compile(r"[;,]")
+
+
+@dataclass
+class BulkRecord:
+    """
+    One record read from the input file.
+
+    Attributes:
+        number: Position of the record in the file, from 1
+        offset: Byte offset just after the record
+        id: The record's id, or its number when it has none
+        text: The cricket text to translate
+        languages: Target languages for this record, or None for the run's
+        error: Why the record cannot be translated, for records that are written as an error
+        received: When the record was read
+    """
+
+    number: int
+    offset: int
+    id: Any = None
+    text: str = ""
+    languages: Optional[List[str]] = None
+    error: Optional[str] = None
+    received: float = field(default_factory=time.perf_counter)
+
+
+class BulkCheckpoint:
+    """
+    Progress of a bulk run, kept in a JSON file that is replaced atomically on every save.
+
+    Attributes:
+        source: The input file the offsets belong to
+        offset: Input byte offset up to which every record has been written
+        records: Records read up to that offset
+        output_offset: Output size in bytes once those records were written
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.source: Optional[str] = None
+        self.offset = 0
+        self.records = 0
+        self.output_offset = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.source = state.get("source")
+            self.offset = int(state.get("offset", 0))
+            self.records = int(state.get("records", 0))
+            self.output_offset = int(state.get("output_offset", 0))
+
+    def reset(self, source: str) -> None:
+        self.source = source
+        self.offset = self.records = self.output_offset = 0
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "offset": self.offset, "records": self.records,
+                       "output_offset": self.output_offset}, f)
+        os.replace(temporary, self.path)
+
+
+def detect_format(path: str) -> str:
+    """Guess the input format from the file extension: "csv" for .csv and .tsv, otherwise "jsonl"."""
+    return "csv" if path.lower().endswith((".csv", ".tsv")) else "jsonl"
+
+
+def _record_from(values: Dict[str, Any], number: int, offset: int, id_field: str, text_field: str) -> BulkRecord:
+    text = values.get(text_field)
+    record_id = values.get(id_field)
+    record = BulkRecord(number, offset, number if record_id in (None, "") else record_id)
+    if not isinstance(text, str) or not text.strip():
+        record.error = f"Error: a record needs a non-empty \"{text_field}\""
+        return record
+    record.text = text
+    languages = values.get("languages")
+    if isinstance(languages, str):
+        languages = [language.strip() for language in _LANGUAGE_SEPARATOR.split(languages) if language.strip()]
+    record.languages = languages or None
+    return record
+
+
+def _lines(f: BinaryIO) -> Iterator[Tuple[str, int]]:
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        yield line.decode("utf-8-sig" if f.tell() == len(line) else "utf-8"), f.tell()
+
+
+def iter_records(path: str, input_format: str = "jsonl", offset: int = 0, number: int = 0,
+                 id_field: str = "id", text_field: str = "text") -> Iterator[BulkRecord]:
+    """
+    Read records from a JSONL or CSV file one at a time.
+
+    Args:
+        path: The input file
+        input_format: "jsonl" or "csv" (with a header row; .tsv files are tab separated)
+        offset: Byte offset to start reading at, from a checkpoint
+        number: Records before that offset, so record numbers carry on
+        id_field: Field holding the record id
+        text_field: Field holding the text to translate
+
+    Yields:
+        Records in file order; a record that cannot be parsed carries an error
+    """
+    with open(path, "rb") as f:
+        if input_format == "csv":
+            # Match reports can be far longer than the csv module's default field limit
+            csv.field_size_limit(max(csv.field_size_limit(), 1 << 26))
+            delimiter = "\t" if path.lower().endswith(".tsv") else ","
+            header = next(csv.reader(io.StringIO(next(_lines(f), ("", 0))[0]), delimiter=delimiter), [])
+            f.seek(max(offset, f.tell()))
+            last_offset = [f.tell()]
+
+            def tracked() -> Iterator[str]:
+                # Quoted fields may span lines; the offset after the row's last line is where it ends
+                for line, line_offset in _lines(f):
+                    last_offset[0] = line_offset
+                    yield line
+
+            for row in csv.reader(tracked(), delimiter=delimiter):
+                if not any(cell.strip() for cell in row):
+                    continue
+                number += 1
+                yield _record_from(dict(zip(header, row)), number, last_offset[0], id_field, text_field)
+            return
+
+        f.seek(offset)
+        for line, line_offset in _lines(f):
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                values = json.loads(line)
+                if not isinstance(values, dict):
+                    raise ValueError("a record must be a JSON object")
+            except ValueError as e:
+                yield BulkRecord(number, line_offset, number, error=f"Error: invalid record: {str(e)}")
+                continue
+            yield _record_from(values, number, line_offset, id_field, text_field)
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+class _Entry:
+    """A record read from the input, held until it is written."""
+
+    __slots__ = ("record", "task")
+
+    def __init__(self, record: BulkRecord, task: Optional[asyncio.Future]):
+        self.record = record
+        self.task = task
+
+    def done(self) -> bool:
+        return self.task is None or self.task.done()
+
+
+class BulkTranslator:
+    """Translates records concurrently and writes them in input order."""
+
+    def __init__(self, languages: List[str], model_id: str, output: BinaryIO,
+                 checkpoint: Optional[BulkCheckpoint] = None, concurrency: Optional[int] = None,
+                 retries: Optional[int] = None, progress_interval: Optional[float] = None):
+        self.languages = languages
+        self.model_id = model_id
+        self.output = output
+        self.checkpoint = checkpoint or BulkCheckpoint()
+        self.concurrency = max(1, concurrency or DEFAULT_BULK_CONCURRENCY)
+        self.retries = DEFAULT_BULK_RETRIES if retries is None else max(0, retries)
+        self.progress_interval = DEFAULT_PROGRESS_INTERVAL if progress_interval is None else progress_interval
+        self.counters = {"records": 0, "written": 0, "invalid": 0, "failed": 0}
+        self._window: Deque[_Entry] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._started = 0.0
+        self._start_offset = 0
+        self._size = 0
+        self._last_progress = 0.0
+        self._last_save = 0.0
+
+    async def _translate(self, record: BulkRecord) -> Dict[str, Dict[str, Any]]:
+        languages = list(dict.fromkeys(record.languages or self.languages))
+        results = await asyncio.gather(*(
+            translate_with_retries(record.text, language, self.model_id, self.retries, "bulk_retries")
+            for language in languages
+        ))
+        return dict(zip(languages, results))
+
+    def _flush(self) -> None:
+        """Write the finished records at the head of the window, then move the checkpoint on."""
+        written = False
+        while self._window and self._window[0].done():
+            entry = self._window.popleft()
+            if entry.task is not None and entry.task.cancelled():
+                return
+            record = entry.record
+            line: Dict[str, Any] = {"id": record.id}
+            if record.error is not None:
+                line["error"] = record.error
+            else:
+                line["translations"] = entry.task.result()
+                if any("error" in translation for translation in line["translations"].values()):
+                    self.counters["failed"] += 1
+                    METRICS.increment("bulk_failed_records")
+                line["latency_ms"] = round((time.perf_counter() - record.received) * 1000, 2)
+            self.output.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.checkpoint.offset = record.offset
+            self.checkpoint.records = record.number
+            self.counters["written"] += 1
+            written = True
+            self._slots.release()
+        if not written:
+            return
+        now = time.perf_counter()
+        if now - self._last_save >= CHECKPOINT_INTERVAL:
+            self._save()
+        if self.progress_interval > 0 and now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            logger.info(self.progress())
+
+    def _save(self) -> None:
+        # The output must reach the file before the checkpoint says it has
+        self.output.flush()
+        if self.checkpoint.path and self.output.seekable():
+            self.checkpoint.output_offset = self.output.tell()
+        self.checkpoint.save()
+        self._last_save = time.perf_counter()
+
+    def progress(self) -> str:
+        """Describe how far the run has got: records written, share of the input, throughput and ETA."""
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        done_bytes = self.checkpoint.offset - self._start_offset
+        message = (f"Bulk translation: {self.checkpoint.records} records written, "
+                   f"{self.counters['written'] / elapsed:.1f} records/s")
+        if self._size:
+            message += f", {100 * self.checkpoint.offset / self._size:.1f}% of the input"
+            if done_bytes > 0:
+                message += f", ETA {_format_duration((self._size - self.checkpoint.offset) * elapsed / done_bytes)}"
+        return message
+
+    async def run(self, records: Iterator[BulkRecord], source: str, size: int = 0) -> Dict[str, Any]:
+        """
+        Translate every record and write the results.
+
+        Args:
+            records: Records to translate, as returned by iter_records
+            source: The input file, recorded in the checkpoint
+            size: Input size in bytes, for the progress and ETA
+
+        Returns:
+            Counts of records read, written, invalid and failed (a language returned an error),
+            with the elapsed time and records per second
+        """
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self.checkpoint.source = source
+        self._started = self._last_progress = self._last_save = time.perf_counter()
+        self._start_offset = self.checkpoint.offset
+        self._size = size
+        try:
+            for record in records:
+                await self._slots.acquire()
+                self.counters["records"] += 1
+                METRICS.increment("bulk_records")
+                if record.error is not None:
+                    self.counters["invalid"] += 1
+                    METRICS.increment("bulk_invalid_records")
+                    self._window.append(_Entry(record, None))
+                    self._flush()
+                    continue
+                entry = _Entry(record, asyncio.ensure_future(self._translate(record)))
+                self._window.append(entry)
+                entry.task.add_done_callback(lambda _: self._flush())
+            pending = [entry.task for entry in self._window if entry.task is not None]
+            if pending:
+                await asyncio.gather(*pending)
+                # Done callbacks have run by now, but make sure every finished record is out
+                self._flush()
+        finally:
+            for entry in self._window:
+                if entry.task is not None:
+                    entry.task.cancel()
+            self._save()
+        elapsed = time.perf_counter() - self._started
+        return dict(self.counters, elapsed_s=round(elapsed, 3),
+                    records_per_s=round(self.counters["written"] / elapsed, 2) if elapsed else 0)
+
+
+async def run_bulk(input_path: str, languages: Optional[List[str]], model_id: str,
+                   output_path: Optional[str] = None, checkpoint_path: Optional[str] = None,
+                   input_format: Optional[str] = None, id_field: str = "id", text_field: str = "text",
+                   concurrency: Optional[int] = None, progress_interval: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Translate a JSONL or CSV file into a JSONL file, resuming from a checkpoint.
+
+    Args:
+        input_path: The input file
+        languages: Target languages for every record without its own, None for all supported languages
+        model_id: The model ID to use for translation
+        output_path: JSONL file for the results, or None for stdout
+        checkpoint_path: JSON file recording progress; defaults to the output path plus ".checkpoint"
+            for a file output, and to no checkpoint for stdout
+        input_format: "jsonl" or "csv", or None to tell from the file extension
+        id_field: Field holding the record id
+        text_field: Field holding the text to translate
+        concurrency: Records translated at the same time
+        progress_interval: Seconds between progress log lines, 0 to turn them off
+
+    Returns:
+        Counts of records read, written, invalid and failed, with the elapsed time and records per second
+    """
+    if checkpoint_path is None and output_path is not None:
+        checkpoint_path = f"{output_path}.checkpoint"
+    checkpoint = BulkCheckpoint(checkpoint_path)
+    source = os.path.abspath(input_path)
+    if checkpoint.source != source:
+        checkpoint.reset(source)
+    if output_path is not None:
+        existing = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+        if existing < checkpoint.output_offset:
+            logger.warning(f"{output_path} is shorter than its checkpoint says, starting over")
+            checkpoint.reset(source)
+        output = open(output_path, "r+b" if existing else "wb")
+        # Drop anything written after the last checkpoint, so no record is written twice
+        output.truncate(checkpoint.output_offset)
+        output.seek(checkpoint.output_offset)
+    else:
+        output = sys.stdout.buffer
+    if checkpoint.records:
+        logger.info(f"Resuming {input_path} after record {checkpoint.records} (byte {checkpoint.offset})")
+    try:
+        translator = BulkTranslator(languages or list(TERMINOLOGY.current.languages), model_id, output,
+                                    checkpoint, concurrency, progress_interval=progress_interval)
+        records = iter_records(input_path, input_format or detect_format(input_path), checkpoint.offset,
+                               checkpoint.records, id_field, text_field)
+        counts = await translator.run(records, source, os.path.getsize(input_path))
+        logger.info(translator.progress())
+        return counts
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
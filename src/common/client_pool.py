@@ -0,0 +1,199 @@
+"""
+Pooled, stateless translation clients.
+
+A strands Agent keeps the conversation history of every call made through it,
+so reusing one Agent per model ID makes each new prompt resend all earlier
+commentary. This module instead pools the expensive, stateless part (the
+configured BedrockModel and its boto client) and builds a fresh Agent with an
+empty context for every translation.
+
+strands and boto are imported when the first client is built, not when this
+module is imported, so a server can answer the MCP handshake and list its
+tools without loading the model SDK. TranslationClientPool.warm builds
+clients in the background ahead of the first translation.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("cricket-translation")
+
+DEFAULT_POOL_SIZE = int(os.environ.get("CRICKET_CLIENT_POOL_SIZE", "8"))
+DEFAULT_IDLE_TTL = float(os.environ.get("CRICKET_CLIENT_IDLE_TTL", "900"))
+
+
+class BedrockTranslationClient:
+    """
+    Reusable Bedrock model configuration that answers each prompt in a fresh context.
+
+    Calling the client creates a new Agent around the shared BedrockModel, so no
+    message history carries over between translations or between threads.
+    Pass on_chunk to receive text deltas as the model streams them, and
+    system_prompt to send static content blocks (with cache points) ahead of
+    the prompt.
+    """
+
+    def __init__(self, model_id: str, temperature: float = 0.3, top_p: float = 0.8, model: Optional[Any] = None):
+        # Importing strands takes most of a second, so it waits for the first client
+        from strands import Agent
+        from strands.models import BedrockModel
+
+        self.model_id = model_id
+        self._agent_class = Agent
+        # Any strands Model can be passed in, e.g. a fake for offline load tests
+        self.model = model or BedrockModel(
+            model_id=model_id,
+            temperature=temperature,
+            top_p=top_p,
+        )
+
+    def __call__(self, prompt: str, on_chunk: Optional[Callable[[str], None]] = None,
+                 system_prompt: Optional[List[Dict[str, Any]]] = None) -> Any:
+        callback_handler = None
+        if on_chunk is not None:
+            def callback_handler(**kwargs: Any) -> None:
+                # strands reports each streamed text delta as the "data" keyword
+                if kwargs.get("data"):
+                    on_chunk(kwargs["data"])
+        # Retries are left to ModelExecutor, which backs off without holding a worker thread
+        agent = self._agent_class(model=self.model, system_prompt=system_prompt, callback_handler=callback_handler,
+                      retry_strategy=None)
+        return agent(prompt)
+
+
+class TranslationClientPool:
+    """
+    Bounded pool of translation clients keyed by model ID.
+
+    At most ``max_size`` clients are kept; the least recently used one is
+    dropped when the pool is full. Clients unused for ``idle_ttl`` seconds are
+    evicted the next time the pool is accessed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, idle_ttl: float = DEFAULT_IDLE_TTL,
+                 factory: Optional[Callable[[str], Callable[[str], Any]]] = None):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.factory = factory or BedrockTranslationClient
+        self.evictions = 0
+        self._clients: "OrderedDict[str, Callable[[str], Any]]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_id: str) -> Callable[[str], Any]:
+        """
+        Get the client for a model ID, creating it if needed.
+
+        Args:
+            model_id: The model ID to use for translation
+
+        Returns:
+            A callable that takes a prompt and returns the model response
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            client = self._clients.get(model_id)
+            if client is not None:
+                self._clients.move_to_end(model_id)
+                self._last_used[model_id] = now
+                return client
+
+        # Build outside the lock, model construction can be slow
+        logger.info(f"Creating translation client for model: {model_id}")
+        client = self.factory(model_id)
+
+        with self._lock:
+            existing = self._clients.get(model_id)
+            if existing is not None:
+                client = existing
+            else:
+                self._clients[model_id] = client
+                while len(self._clients) > self.max_size:
+                    evicted_id, _ = self._clients.popitem(last=False)
+                    self._last_used.pop(evicted_id, None)
+                    self.evictions += 1
+                    logger.info(f"Evicted translation client for model {evicted_id}: pool full")
+            self._clients.move_to_end(model_id)
+            self._last_used[model_id] = now
+        return client
+
+    def warm(self, model_ids: Iterable[str]) -> threading.Thread:
+        """
+        Build the clients for some model IDs on a background thread.
+
+        The first translation otherwise pays for importing the model SDK and
+        building its client. Failures are logged, the client is then built on
+        first use as usual.
+
+        Args:
+            model_ids: The model IDs to build clients for
+
+        Returns:
+            The started daemon thread
+        """
+        model_ids = list(dict.fromkeys(model_ids))
+
+        def build() -> None:
+            started = time.perf_counter()
+            for model_id in model_ids:
+                try:
+                    self.get(model_id)
+                except Exception as e:
+                    logger.warning(f"Could not warm up translation client for model {model_id}: {str(e)}")
+            logger.info(f"Warmed up {len(model_ids)} translation clients in {time.perf_counter() - started:.2f}s")
+
+        thread = threading.Thread(target=build, name="client-pool-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _evict_idle(self, now: float) -> None:
+        # Caller holds the lock
+        if self.idle_ttl <= 0:
+            return
+        for model_id in [m for m, used in self._last_used.items() if now - used > self.idle_ttl]:
+            self._clients.pop(model_id, None)
+            self._last_used.pop(model_id, None)
+            self.evictions += 1
+            logger.info(f"Evicted idle translation client for model {model_id}")
+
+    def set_factory(self, factory: Optional[Callable[[str], Callable[[str], Any]]]) -> None:
+        """
+        Replace the client factory and drop all pooled clients.
+
+        Args:
+            factory: Callable taking a model ID and returning a client, or None for Bedrock
+        """
+        with self._lock:
+            self.factory = factory or BedrockTranslationClient
+            self._clients.clear()
+            self._last_used.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool size and eviction count.
+
+        Returns:
+            A dictionary of pool statistics
+        """
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "idle_ttl_s": self.idle_ttl,
+                "evictions": self.evictions,
+                "models": list(self._clients.keys()),
+            }
+
+    def clear(self) -> None:
+        """Drop all pooled clients."""
+        with self._lock:
+            self._clients.clear()
+            self._last_used.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -3,118 +3,110 @@ Common functionality for cricket translation services.
 This module contains shared code used by both the MCP server and the agent.
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
-from strands import Agent
-from strands.models import BedrockModel
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from common.client_pool import TranslationClientPool
+from common.fast_path import fast_path_stats
+from common.glossary import MaskedText, StreamingRestorer
+from common.instrumentation import request_context, request_labels, span
+from common.metrics import METRICS
+from common.model_executor import ModelBusyError, ModelExecutor
+from common.model_router import AUTO_MODEL, ModelRouter
+from common.resilience import ModelUnavailableError
+from common.prompt_templates import PromptTemplate, render_guidelines
+from common.single_flight import SingleFlight
+from common.terminology import Terminology, TerminologyResponse, TerminologyStore
+from common.translation_cache import TranslationCache, make_cache_key
+from common.translation_memory import MemoryMatch, TranslationMemory
+
+class TranslationError(RuntimeError):
+    """Raised when the model could not translate the text, after any retries."""
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("CRICKET_LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger("cricket-translation")
 
-# Initialize a global agent dictionary to store agents for different models
-# This ensures we only create one agent per model ID
-AGENTS = {}
-
-# Cricket terminology reference for different languages
-CRICKET_TERMS = {
-    "Tamil": {
-        "over": "ஓவர்",
-        "wicket": "விக்கெட்",
-        "ball": "பந்து",
-        "batsman": "பேட்ஸ்மேன்",
-        "bowler": "பந்துவீச்சாளர்",
-        "run_rate": "ரன் ரேட்",
-        "partnership": "கூட்டணி",
-        "boundary": "எல்லை",
-        "catch": "கேட்ச்",
-        "lbw": "எல்.பி.டபிள்யூ"
-    },
-    "Hindi": {
-        "over": "ओवर",
-        "wicket": "विकेट",
-        "ball": "गेंद",
-        "batsman": "बल्लेबाज",
-        "bowler": "गेंदबाज",
-        "run_rate": "रन रेट",
-        "partnership": "साझेदारी",
-        "boundary": "चौका/छक्का",
-        "catch": "कैच",
-        "lbw": "एलबीडब्ल्यू"
-    },
-    "Telugu": {
-        "over": "ఓవర్",
-        "wicket": "వికెట్",
-        "ball": "బంతి",
-        "batsman": "బ్యాట్స్‌మన్",
-        "bowler": "బౌలర్",
-        "run_rate": "రన్ రేట్",
-        "partnership": "భాగస్వామ్యం",
-        "boundary": "బౌండరీ",
-        "catch": "క్యాచ్",
-        "lbw": "ఎల్‌బిడబ్ల్యూ"
-    },
-    "Kannada": {
-        "over": "ಓವರ್",
-        "wicket": "ವಿಕೆಟ್",
-        "ball": "ಚೆಂಡು",
-        "batsman": "ಬ್ಯಾಟ್ಸ್‌ಮನ್",
-        "bowler": "ಬೌಲರ್",
-        "run_rate": "ರನ್ ರೇಟ್",
-        "partnership": "ಪಾಲುದಾರಿಕೆ",
-        "boundary": "ಬೌಂಡರಿ",
-        "catch": "ಕ್ಯಾಚ್",
-        "lbw": "ಎಲ್‌ಬಿಡಬ್ಲ್ಯೂ"
-    },
-    "Bengali": {
-        "over": "ওভার",
-        "wicket": "উইকেট",
-        "ball": "বল",
-        "batsman": "ব্যাটসম্যান",
-        "bowler": "বোলার",
-        "run_rate": "রান রেট",
-        "partnership": "জুটি",
-        "boundary": "বাউন্ডারি",
-        "catch": "ক্যাচ",
-        "lbw": "এলবিডব্লিউ"
-    },
-    "Malayalam": {
-        "over": "ഓവർ",
-        "wicket": "വിക്കറ്റ്",
-        "ball": "പന്ത്",
-        "batsman": "ബാറ്റ്സ്മാൻ",
-        "bowler": "ബൗളർ",
-        "run_rate": "റൺ നിരക്ക്",
-        "partnership": "കൂട്ടുകെട്ട്",
-        "boundary": "ബൗണ്ടറി",
-        "catch": "ക്യാച്ച്",
-        "lbw": "എൽബിഡബ്ല്യു"
-    },
-    "Marathi": {
-        "over": "षटक",
-        "wicket": "विकेट",
-        "ball": "चेंडू",
-        "batsman": "फलंदाज",
-        "bowler": "गोलंदाज",
-        "run_rate": "धावफलक",
-        "partnership": "भागीदारी",
-        "boundary": "सीमारेषा",
-        "catch": "झेल",
-        "lbw": "एलबीडब्ल्यू"
-    }
-}
-
-# Example translations for demonstration purposes
-EXAMPLE_TRANSLATIONS = {
-    "Tamil": "கோஹ்லி லாங்-ஆன் மீது அற்புதமான சிக்ஸ் அடித்தார். இந்தியாவுக்கு 36 பந்துகளில் 45 ரன்கள் தேவை.",
-    "Hindi": "कोहली ने लॉन्ग-ऑन पर एक शानदार छक्का मारा। भारत को 36 गेंदों में 45 रन चाहिए।",
-    "Telugu": "కోహ్లీ లాంగ్-ఆన్ పై అద్భుతమైన సిక్స్ కొట్టాడు. భారత్‌కు 36 బంతుల్లో 45 పరుగులు కావాలి.",
-    "Kannada": "ಕೊಹ್ಲಿ ಲಾಂಗ್-ಆನ್ ಮೇಲೆ ಅದ್ಭುತವಾದ ಸಿಕ್ಸ್ ಹೊಡೆದರು. ಭಾರತಕ್ಕೆ 36 ಚೆಂಡುಗಳಲ್ಲಿ 45 ರನ್‌ಗಳ ಅಗತ್ಯವಿದೆ.",
-    "Bengali": "কোহলি লং-অনের উপর একটি দুর্দান্ত ছক্কা মেরেছেন। ভারতের ৩৬ বলে ৪৫ রান প্রয়োজন।",
-    "Malayalam": "കോഹ്‌ലി ലോങ്-ഓണിന് മുകളിലൂടെ ഒരു മനോഹരമായ സിക്സ് അടിച്ചു. ഇന്ത്യയ്ക്ക് 36 പന്തിൽ 45 റൺസ് വേണം.",
-    "Marathi": "कोहलीने लाँग-ऑनवर एक भव्य षटकार मारला. भारताला 36 चेंडूंमध्ये 45 धावांची आवश्यकता आहे."
-}
+# Pool of reusable model clients; every translation runs in a fresh, empty context
+CLIENT_POOL = TranslationClientPool()
+
+# Blocking model calls run here so they never stall the event loop
+MODEL_EXECUTOR = ModelExecutor()
+
+# Picks a model by text length for model_id "auto" and hedges slow calls to a second model
+MODEL_ROUTER = ModelRouter()
+
+# Repeated commentary lines are served from here instead of a Bedrock round trip
+TRANSLATION_CACHE = TranslationCache()
+
+# Identical translations requested at the same time share one model call
+IN_FLIGHT = SingleFlight()
+
+# Approved translations of near-duplicate lines (same words, other numbers), loaded
+# from CRICKET_TRANSLATION_MEMORY; empty, and never consulted, unless configured
+TRANSLATION_MEMORY = TranslationMemory()
+
+# Terminology, example translations and supported languages, loaded from a data
+# file (CRICKET_TERMS_PATH) and reloaded when it changes
+TERMINOLOGY = TerminologyStore()
+
+# Numbers, scores and player names are masked before the model call and glossary
+# terms are checked afterwards. Set CRICKET_GLOSSARY=0 to send text unmodified.
+GLOSSARY_ENABLED = os.environ.get("CRICKET_GLOSSARY", "1") != "0"
+
+# Formulaic lines ("Bumrah to Warner, FOUR", "45/2 after 3.3 overs") are rendered
+# from templates without a model call. Set CRICKET_FAST_PATH=0 to send everything to the model.
+FAST_PATH_ENABLED = os.environ.get("CRICKET_FAST_PATH", "1") != "0"
+
+# The rendered prompt is several KB and holds the input text twice, so results only
+# carry it as prompt_used when CRICKET_DEBUG_PROMPTS=1 (or --debug-prompts) is set
+DEBUG_PROMPTS = os.environ.get("CRICKET_DEBUG_PROMPTS", "0") != "0"
+
+def _publish_terminology(terminology: Terminology) -> None:
+    """Point the module-level names at a terminology snapshot."""
+    global CRICKET_TERMS, EXAMPLE_TRANSLATIONS, GLOSSARY, FAST_PATH, PROMPT_TEMPLATES, PROMPT_VERSION
+    CRICKET_TERMS = terminology.terms
+    EXAMPLE_TRANSLATIONS = terminology.examples
+    GLOSSARY = terminology.glossary
+    FAST_PATH = terminology.fast_path
+    PROMPT_TEMPLATES = terminology.prompt_templates
+    PROMPT_VERSION = terminology.prompt_version
+
+# CRICKET_TERMS, EXAMPLE_TRANSLATIONS, GLOSSARY, FAST_PATH, PROMPT_TEMPLATES and
+# PROMPT_VERSION follow the current snapshot for scripts and benchmarks. The
+# pipeline reads TERMINOLOGY.current once per request instead, so a reload never
+# pairs a template from one version with the cache key of another.
+_publish_terminology(TERMINOLOGY.current)
+TERMINOLOGY.on_reload(_publish_terminology)
+
+def generate_translation_guidelines(target_language: str) -> str:
+    """
+    Generate the translation guidelines section shared by all translation prompts.
+    
+    Args:
+        target_language: The target language for translation
+        
+    Returns:
+        The guidelines, including the terminology reference for the language
+    """
+    return render_guidelines(target_language, TERMINOLOGY.current.terms.get(target_language, {}))
+
+def get_prompt_template(target_language: str) -> PromptTemplate:
+    """
+    Get the precompiled prompt template for a language.
+    
+    Args:
+        target_language: The target language for translation
+        
+    Returns:
+        The PromptTemplate, built on demand for languages without terminology
+    """
+    return TERMINOLOGY.current.template(target_language)
 
 def generate_translation_prompt(input_text: str, target_language: str) -> str:
     """
@@ -127,100 +119,473 @@ def generate_translation_prompt(input_text: str, target_language: str) -> str:
     Returns:
         A prompt string to be sent to an LLM
     """
-    # Get language-specific cricket terms
-    terms = CRICKET_TERMS.get(target_language, {})
-    
-    # Build the terminology reference section
-    term_reference = "\n".join([f"- {k}: {v}" for k, v in terms.items()])
-    
-    prompt = f"""You are a professional cricket translator specializing in Indian regional languages. Translate the following cricket text accurately while maintaining proper cricket terminology and cultural context.
+    return get_prompt_template(target_language).render(input_text)
 
-**Source Text:** {input_text}
+def set_model_factory(factory: Optional[Callable[[str], Callable[[str], Any]]]) -> None:
+    """
+    Replace how model clients are created for translation calls.
 
-**Target Language:** {target_language}
+    Clients are called as client(prompt, on_chunk=None, system_prompt=None), see
+    BedrockTranslationClient for the reference implementation.
 
-**Translation Guidelines:**
+    Args:
+        factory: Callable taking a model ID and returning a prompt -> response callable,
+            or None to go back to Bedrock
+    """
+    CLIENT_POOL.set_factory(factory)
+
+def warm_up_clients(model_ids: Optional[List[str]] = None) -> threading.Thread:
+    """
+    Build model clients in the background, so the first translation does not pay for it.
+
+    Args:
+        model_ids: The model IDs to warm up, default every model MODEL_ROUTER can call
+
+    Returns:
+        The warm-up thread
+    """
+    return CLIENT_POOL.warm(model_ids if model_ids is not None else MODEL_ROUTER.models())
 
-1. **Cricket Terminology Preservation:**
-   - Keep standard cricket terms in English when commonly used: "over", "wicket", "boundary", "six", "four"
-   - Translate action words and descriptions to target language
-   - Maintain score formats: "45/2", "3.3 overs"
-   - numbers are to be preserved in their original form rather than being translated. Maintain clarity and consistency, especially when dealing with scores, statistics, and player performance metrics.
+def _invoke_model(model_id: str, prompt: str, on_chunk: Optional[Callable[[str], None]] = None,
+                  system_prompt: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Run a prompt against the model. Blocks, so it must run on MODEL_EXECUTOR.
 
-2. **Regional Cricket Vocabulary:**
-   - Use established cricket terms in the target language where they exist
-   - For {target_language}, use these terms:
-{term_reference}
+    Args:
+        model_id: The model ID to use for translation
+        prompt: The prompt to send, or only its variable part when system_prompt is given
+        on_chunk: Called from the worker thread with each text chunk as it streams
+        system_prompt: Static system content blocks (see PromptTemplate.system_content)
 
-3. **Player Names and Teams:**
-   - Keep player names in original script/transliteration
-   - Translate team descriptions but keep official team names
+    Returns:
+        The model response as a string
+    """
+    client = CLIENT_POOL.get(model_id)
+    kwargs: Dict[str, Any] = {}
+    if on_chunk is not None:
+        kwargs["on_chunk"] = on_chunk
+    if system_prompt is not None:
+        kwargs["system_prompt"] = system_prompt
+    response = client(prompt, **kwargs)
 
-4. **Numbers and Statistics:**
-   - Keep numerical values in standard format
-   - Translate descriptive text around numbers
+    # Prompt size per call should stay flat over a match; growth means context is leaking
+    prompt_chars = len(prompt) + sum(len(block.get("text", "")) for block in system_prompt or [])
+    METRICS.observe("prompt_chars", prompt_chars)
+    usage = getattr(getattr(response, "metrics", None), "accumulated_usage", None) or {}
+    input_tokens = usage.get("inputTokens") or max(1, prompt_chars // 4)
+    METRICS.observe("prompt_tokens", input_tokens)
+    if usage.get("outputTokens"):
+        METRICS.observe("completion_tokens", usage["outputTokens"])
+    if usage.get("cacheReadInputTokens"):
+        METRICS.observe("prompt_cache_read_tokens", usage["cacheReadInputTokens"])
+    labels = dict(request_labels(), model=model_id)
+    METRICS.increment("model_calls", labels=labels)
+    METRICS.increment("input_tokens", input_tokens, labels=labels)
+    METRICS.increment("output_tokens", usage.get("outputTokens") or 0, labels=labels)
 
-5. **Cricket Context Awareness:**
-   - Understand batting/bowling context
-   - Recognize match situations (chasing, defending, powerplay)
-   - Maintain urgency and excitement in commentary style
+    # Convert the AgentResult to a string to make it JSON serializable
+    return str(response)
 
-**Output Format:**
-Provide the translation in {target_language} script with proper formatting. Maintain the structure and flow of the original text while ensuring cultural and linguistic appropriateness.
+async def _call_model(model_id: str, prompt: str, system_prompt: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Run a prompt on MODEL_EXECUTOR, hedged to MODEL_ROUTER's hedge model when the call is slow.
 
-**Now translate the following cricket text:**
-{input_text}
-"""
-    return prompt
+    Args:
+        model_id: The model ID to use for translation
+        prompt: The prompt to send, or only its variable part when system_prompt is given
+        system_prompt: Static system content blocks (see PromptTemplate.system_content)
+
+    Returns:
+        The model response as a string
+    """
+    return await MODEL_ROUTER.run(
+        model_id, lambda target: MODEL_EXECUTOR.run(target, _invoke_model, target, prompt, None, system_prompt)
+    )
+
+def _fast_path(input_text: str, target_language: str) -> Optional[str]:
+    """Render a formulaic line from templates, or return None when it needs the model."""
+    return TERMINOLOGY.current.fast_path.translate(input_text, target_language) if FAST_PATH_ENABLED else None
+
+def _translation_memory(input_text: str, target_language: str) -> Optional[MemoryMatch]:
+    """Find an approved translation of a near-duplicate line, or return None when it needs the model."""
+    match = TRANSLATION_MEMORY.lookup(input_text, target_language)
+    if match is None:
+        return None
+    # A near-duplicate must use the same glossary terms, or the approved translation says something else
+    glossary = TERMINOLOGY.current.glossary
+    if glossary.source_terms(match.source).keys() != glossary.source_terms(input_text).keys():
+        return None
+    return match
+
+def _mask_source(input_text: str) -> Optional[MaskedText]:
+    """Mask the source text when the glossary engine is enabled."""
+    return TERMINOLOGY.current.glossary.mask(input_text) if GLOSSARY_ENABLED else None
+
+def _apply_glossary(input_text: str, translated_text: str, target_language: str,
+                    masked: Optional[MaskedText]) -> (str, List[str], List[int]):
+    """
+    Restore masked spans and enforce glossary terms in a model translation.
+    
+    Args:
+        input_text: The original source text
+        translated_text: The model output
+        target_language: The target language for translation
+        masked: The mask applied to the source, if any
+        
+    Returns:
+        Tuple of (final_text, glossary_issues, missing_placeholders)
+    """
+    if not GLOSSARY_ENABLED:
+        return translated_text, [], []
+    restored, missing = masked.restore(translated_text) if masked else (translated_text, [])
+    report = TERMINOLOGY.current.glossary.enforce(input_text, restored, target_language)
+    if report.repairs:
+        METRICS.increment("glossary_repairs", len(report.repairs))
+    if report.issues:
+        METRICS.increment("glossary_issues", len(report.issues))
+    return report.text, report.issues, missing
 
-async def translate_cricket_text(input_text: str, target_language: str, model_id: str) -> Dict[str, Any]:
+async def translate_cricket_text(input_text: str, target_language: str, model_id: str,
+                                 use_cache: bool = True) -> Dict[str, Any]:
     """
     Translate cricket text to the specified Indian regional language.
     
     Args:
         input_text: The cricket text to translate
         target_language: The target language for translation
-        model_id: The model ID to use for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by text length
+        use_cache: Serve repeated text from the translation cache and near-duplicates from
+            the translation memory, and share the model call of an identical translation
+            already in flight
         
     Returns:
         A dictionary containing the translation results
+
+    Raises:
+        ModelBusyError: If too many requests are already queued for model_id
+        ModelUnavailableError: If the model's circuit breaker is open
+        TranslationError: If the model call failed after retries
     """
-    # Generate the prompt that would be sent to an LLM
-    prompt = generate_translation_prompt(input_text, target_language)
+    model_id = MODEL_ROUTER.route(model_id, input_text)
+    with request_context(language=target_language, model=model_id):
+        METRICS.increment("translation_requests", labels=request_labels())
+        with span("translate"):
+            return await _translate_text(input_text, target_language, model_id, use_cache)
+
+async def _translate_text(input_text: str, target_language: str, model_id: str,
+                          use_cache: bool) -> Dict[str, Any]:
+    terminology = TERMINOLOGY.current
+    # Only the source text varies per request; the static prefix is precompiled
+    with span("prompt_build"):
+        template = terminology.template(target_language)
+        prompt = template.render(input_text) if DEBUG_PROMPTS else None
+
+    with span("fast_path"):
+        fast_text = _fast_path(input_text, target_language)
+    if fast_text is not None:
+        METRICS.increment("fast_path_served", labels=request_labels())
+        result = {
+            "translated_text": fast_text,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": False,
+            "fast_path": True,
+            "notes": "Translation preserves cricket terminology while adapting to target language conventions"
+        }
+        if prompt is not None:
+            result["prompt_used"] = prompt
+        return result
+
+    with span("cache_lookup"):
+        cache_key = make_cache_key(input_text, target_language, model_id, terminology.prompt_version) if use_cache else None
+        cached_text = TRANSLATION_CACHE.get(cache_key) if cache_key else None
+    if cached_text is not None:
+        METRICS.increment("cache_hits", labels=request_labels())
+        result = {
+            "translated_text": cached_text,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": True,
+            "notes": "Translation preserves cricket terminology while adapting to target language conventions"
+        }
+        if prompt is not None:
+            result["prompt_used"] = prompt
+        return result
+
+    with span("translation_memory"):
+        remembered = _translation_memory(input_text, target_language) if use_cache else None
+    if remembered is not None:
+        METRICS.increment("translation_memory_hits", labels=request_labels())
+        result = {
+            "translated_text": remembered.translation,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": False,
+            "translation_memory": {"similarity": remembered.similarity},
+            "notes": "Translation preserves cricket terminology while adapting to target language conventions"
+        }
+        if prompt is not None:
+            result["prompt_used"] = prompt
+        return result
+    
+    # Identical requests arriving while this one is at the model share its call
+    if use_cache:
+        (translated_text, glossary_issues), coalesced = await IN_FLIGHT.run(
+            cache_key, lambda: _translate_with_model(input_text, target_language, model_id, template, cache_key)
+        )
+        if coalesced:
+            METRICS.increment("coalesced_requests", labels=request_labels())
+    else:
+        translated_text, glossary_issues = await _translate_with_model(input_text, target_language, model_id, template, None)
+        coalesced = False
     
-    # In a real implementation, this would call an LLM API
-    # For now, use mock translations as a fallback
-    mock_translation = EXAMPLE_TRANSLATIONS.get(target_language, f"[Translation to {target_language} would appear here]")
+    result = {
+        "translated_text": translated_text,
+        "source_language": "English",
+        "target_language": target_language,
+        "cached": False,
+        "glossary_issues": list(glossary_issues),
+        "notes": "Translation preserves cricket terminology while adapting to target language conventions"
+    }
+    if coalesced:
+        result["coalesced"] = True
+    if prompt is not None:
+        result["prompt_used"] = prompt
+    return result
 
-    try:
-        # Check if we already have an agent for this model_id
-        if model_id not in AGENTS:
-            logger.info(f"Creating new agent for model: {model_id}")
-            # Create a configured Bedrock model
-            bedrock_model = BedrockModel(
-                model_id=model_id,
-                temperature=0.3,
-                top_p=0.8,
-            )
-            # Create and store the agent
-            AGENTS[model_id] = Agent(model=bedrock_model)
+async def _translate_with_model(input_text: str, target_language: str, model_id: str,
+                                template: PromptTemplate, cache_key: Optional[str]) -> (str, List[str]):
+    """
+    Translate text with the model, then restore masked spans, enforce the glossary and cache the result.
+    
+    Args:
+        input_text: The cricket text to translate
+        target_language: The target language for translation
+        model_id: The model ID to use for translation
+        template: The precompiled prompt template for the language
+        cache_key: Where to cache the translation, or None to skip caching
         
-        # Use the existing agent
-        agent = AGENTS[model_id]
-        response = agent(prompt)
-        # Convert the AgentResult to a string to make it JSON serializable
-        translated_text = str(response)
+    Returns:
+        Tuple of (translated_text, glossary_issues)
+    """
+    glossary_issues: List[str] = []
+    with span("mask"):
+        masked = _mask_source(input_text)
+    try:
+        # Run the blocking model call on the worker pool so other requests keep flowing
+        model_text = masked.text if masked else input_text
+        translated_text = await _call_model(model_id, template.user_message(model_text), template.system_content)
+        METRICS.observe("prompt_tokens_saved", template.tokens_saved(input_text))
+        with span("glossary"):
+            translated_text, glossary_issues, missing = _apply_glossary(input_text, translated_text, target_language, masked)
+        if missing:
+            # The model dropped a placeholder; one unmasked retry beats publishing a lost score
+            METRICS.increment("glossary_placeholder_retries")
+            logger.warning(f"Translation to {target_language} lost {len(missing)} placeholders, retrying unmasked")
+            translated_text = await _call_model(model_id, template.user_message(input_text), template.system_content)
+            translated_text, glossary_issues, _ = _apply_glossary(input_text, translated_text, target_language, None)
+    except (ModelBusyError, ModelUnavailableError):
+        # Backpressure and an open circuit reach the caller as they are
+        raise
     except Exception as e:
+        # A wrong translation is worse than none, so failures are never papered over
         logger.error(f"Error using Agent: {str(e)}")
-        # Fallback to mock translation
-        translated_text = EXAMPLE_TRANSLATIONS.get(target_language, f"[Translation to {target_language} would appear here]")
+        METRICS.increment("translation_failures", labels=request_labels())
+        raise TranslationError(f"Translation to {target_language} failed: {str(e)}") from e
+
+    if cache_key:
+        with span("cache_write"):
+            TRANSLATION_CACHE.set(cache_key, translated_text)
+    return translated_text, glossary_issues
+
+async def stream_cricket_translation(input_text: str, target_language: str, model_id: str,
+                                     use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Translate cricket text and yield the translation in chunks as the model produces them.
     
-    return {
+    Args:
+        input_text: The cricket text to translate
+        target_language: The target language for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by text length
+        use_cache: Serve repeated text from the translation cache and near-duplicates from
+            the translation memory
+        
+    Yields:
+        {"type": "chunk", "text": ...} for every piece of translated text, then one
+        {"type": "done", ...} event with the full translation and time_to_first_chunk_ms
+
+    Raises:
+        ModelBusyError: If too many requests are already queued for model_id
+        ModelUnavailableError: If the model's circuit breaker is open
+        TranslationError: If the model call failed after retries
+    """
+    started = time.perf_counter()
+    first_chunk_ms: Optional[float] = None
+    # Streamed calls are routed but not hedged: chunks already sent cannot be taken back
+    model_id = MODEL_ROUTER.route(model_id, input_text)
+
+    labels = {"language": target_language, "model": model_id}
+    METRICS.increment("translation_requests", labels=labels)
+
+    def first_chunk_seen() -> float:
+        elapsed = round((time.perf_counter() - started) * 1000, 2)
+        METRICS.observe("time_to_first_chunk_ms", elapsed)
+        return elapsed
+
+    fast_text = _fast_path(input_text, target_language)
+    if fast_text is not None:
+        METRICS.increment("fast_path_served", labels=labels)
+        first_chunk_ms = first_chunk_seen()
+        yield {"type": "chunk", "text": fast_text}
+        yield {
+            "type": "done",
+            "translated_text": fast_text,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": False,
+            "fast_path": True,
+            "time_to_first_chunk_ms": first_chunk_ms
+        }
+        return
+
+    terminology = TERMINOLOGY.current
+    cache_key = make_cache_key(input_text, target_language, model_id, terminology.prompt_version) if use_cache else None
+    cached_text = TRANSLATION_CACHE.get(cache_key) if cache_key else None
+    if cached_text is not None:
+        METRICS.increment("cache_hits", labels=labels)
+        first_chunk_ms = first_chunk_seen()
+        yield {"type": "chunk", "text": cached_text}
+        yield {
+            "type": "done",
+            "translated_text": cached_text,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": True,
+            "time_to_first_chunk_ms": first_chunk_ms
+        }
+        return
+
+    remembered = _translation_memory(input_text, target_language) if use_cache else None
+    if remembered is not None:
+        METRICS.increment("translation_memory_hits", labels=labels)
+        first_chunk_ms = first_chunk_seen()
+        yield {"type": "chunk", "text": remembered.translation}
+        yield {
+            "type": "done",
+            "translated_text": remembered.translation,
+            "source_language": "English",
+            "target_language": target_language,
+            "cached": False,
+            "translation_memory": {"similarity": remembered.similarity},
+            "time_to_first_chunk_ms": first_chunk_ms
+        }
+        return
+
+    template = terminology.template(target_language)
+    masked = _mask_source(input_text)
+    restorer = StreamingRestorer(masked) if masked else None
+    model_text = masked.text if masked else input_text
+
+    # Chunks arrive on a worker thread and are handed to the event loop through a queue
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def on_chunk(text: str) -> None:
+        loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+    streamed = []
+    # The task runs in a copy of this context, so it carries the request labels.
+    # A failed call is only retried while nothing has reached the caller yet.
+    with request_context(**labels):
+        task = asyncio.ensure_future(MODEL_EXECUTOR.run(
+            model_id, _invoke_model, model_id, template.user_message(model_text), on_chunk, template.system_content,
+            can_retry=lambda: not streamed and chunks.empty()
+        ))
+    # Completion is scheduled after every chunk the worker already queued, so ordering holds
+    task.add_done_callback(lambda _: chunks.put_nowait(done))
+
+    glossary_issues: List[str] = []
+    try:
+        while True:
+            text = await chunks.get()
+            if text is done:
+                break
+            # Placeholders split across chunks are held back until complete
+            if restorer is not None:
+                text = restorer.feed(text)
+                if not text:
+                    continue
+            if first_chunk_ms is None:
+                first_chunk_ms = first_chunk_seen()
+            streamed.append(text)
+            yield {"type": "chunk", "text": text}
+
+        if restorer is not None:
+            tail = restorer.flush()
+            if tail:
+                streamed.append(tail)
+                yield {"type": "chunk", "text": tail}
+
+        try:
+            translated_text = task.result()
+            METRICS.observe("prompt_tokens_saved", template.tokens_saved(input_text))
+            translated_text, glossary_issues, missing = _apply_glossary(input_text, translated_text, target_language, masked)
+            if missing:
+                # Chunks are already out, so report the lost placeholders instead of retrying
+                glossary_issues.append(f"placeholders missing from output: {missing}")
+                cache_key = None
+        except (ModelBusyError, ModelUnavailableError):
+            # Backpressure and an open circuit reach the caller as they are
+            raise
+        except Exception as e:
+            logger.error(f"Error using Agent: {str(e)}")
+            METRICS.increment("translation_failures", labels=labels)
+            raise TranslationError(f"Translation to {target_language} failed: {str(e)}") from e
+
+        # Models that do not stream still produce one chunk with the whole answer
+        if not streamed:
+            first_chunk_ms = first_chunk_seen()
+            yield {"type": "chunk", "text": translated_text}
+    finally:
+        if not task.done():
+            task.cancel()
+
+    if cache_key:
+        TRANSLATION_CACHE.set(cache_key, translated_text)
+
+    yield {
+        "type": "done",
         "translated_text": translated_text,
         "source_language": "English",
         "target_language": target_language,
-        "prompt_used": prompt,
-        "notes": "Translation preserves cricket terminology while adapting to target language conventions"
+        "cached": False,
+        "glossary_issues": glossary_issues,
+        "time_to_first_chunk_ms": first_chunk_ms
+    }
+
+def get_translation_stats_data() -> Dict[str, Any]:
+    """
+    Get runtime statistics for the translation pipeline.
+
+    Returns:
+        A dictionary with metrics, cache, single-flight, fast path, translation memory,
+        terminology, client pool, model executor and model router statistics, and the process ID they were read from
+        (each worker of a multi-worker server keeps its own)
+    """
+    snapshot = METRICS.snapshot()
+    return {
+        "pid": os.getpid(),
+        "metrics": snapshot,
+        "cache": TRANSLATION_CACHE.stats(),
+        "single_flight": IN_FLIGHT.stats(),
+        "fast_path": fast_path_stats(snapshot["counters"]),
+        "translation_memory": TRANSLATION_MEMORY.stats(),
+        "prompt_version": TERMINOLOGY.current.prompt_version,
+        "terminology": TERMINOLOGY.stats(),
+        "client_pool": CLIENT_POOL.stats(),
+        "model_executor": MODEL_EXECUTOR.stats(),
+        "model_router": MODEL_ROUTER.stats(),
     }
 
 async def get_cricket_terminology_data(target_language: str) -> Dict[str, Any]:
@@ -228,17 +593,31 @@ async def get_cricket_terminology_data(target_language: str) -> Dict[str, Any]:
     Get cricket terminology for the specified language.
     
     Args:
-        target_language: The target language
+        target_language: The target language, or "all" for every language
         
     Returns:
-        A dictionary containing the terminology data
+        A dictionary containing the terminology data and its etag, precomputed per language; do not modify it
+    """
+    response = TERMINOLOGY.current.response(target_language)
+    if response is None:
+        return {"language": target_language, "terminology": {}}
+    return response.payload
+
+def get_cricket_terminology_response(target_language: str,
+                                     terms: Optional[List[str]] = None) -> Optional[TerminologyResponse]:
     """
-    terms = CRICKET_TERMS.get(target_language, {})
+    Get the serialized get_cricket_terminology response for a language.
     
-    return {
-        "language": target_language,
-        "terminology": terms
-    }
+    Responses are serialized when the terminology is loaded, so this is a lookup.
+    
+    Args:
+        target_language: The target language, or "all" for every language
+        terms: Only include these term keys, e.g. ["over", "wicket"]
+        
+    Returns:
+        The TerminologyResponse with its JSON body and etag, or None for an unsupported language
+    """
+    return TERMINOLOGY.current.response(target_language, terms)
 
 def validate_language(target_language: str) -> (bool, str):
     """
@@ -250,7 +629,4 @@ def validate_language(target_language: str) -> (bool, str):
     Returns:
         Tuple of (is_valid, error_message)
     """
-    supported_languages = ["Tamil", "Hindi", "Telugu", "Kannada", "Bengali", "Malayalam", "Marathi"]
-    if target_language not in supported_languages:
-        return False, f"Error: Target language must be one of: {', '.join(supported_languages)}. Got: {target_language}"
-    return True, ""
+    return TERMINOLOGY.current.validate_language(target_language)
@@ -0,0 +1,331 @@
+"""
+Chunked translation of long documents such as match reports and analysis articles.
+
+Sending a whole article as one prompt runs into output limits, is slow, and
+fails all-or-nothing. This module splits the text on paragraph and sentence
+boundaries into chunks within a token budget, translates the chunks
+concurrently with bounded parallelism, and reassembles them in order.
+
+Each chunk carries the tail of the previous chunk as context (not translated)
+so names and tone stay consistent across chunk boundaries. A chunk whose
+translation lost a placeholder or came back empty is retried on its own (failed
+model calls are already retried by the model executor); if it still fails, its
+source text is kept in place and reported, instead of failing the whole document.
+
+Chunks are produced lazily from a string or an iterable of lines (e.g. an
+open file), and stream_cricket_document yields translated chunks as soon as
+they are ready in order, so memory stays flat for multi-megabyte inputs.
+"""
+
+import asyncio
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from common.cricket_translation import (
+    MODEL_ROUTER,
+    TERMINOLOGY,
+    TRANSLATION_CACHE,
+    _apply_glossary,
+    _call_model,
+    _mask_source,
+    logger,
+)
+from common.metrics import METRICS
+from common.model_executor import ModelBusyError
+from common.resilience import ModelUnavailableError
+from common.prompt_templates import estimate_tokens
+from common.terminology import Terminology
+from common.translation_cache import make_cache_key
+
+DEFAULT_CHUNK_TOKENS = int(os.environ.get("CRICKET_DOCUMENT_CHUNK_TOKENS", "800"))
+DEFAULT_DOCUMENT_CONCURRENCY = int(os.environ.get("CRICKET_DOCUMENT_CONCURRENCY", "4"))
+DEFAULT_CONTEXT_CHARS = int(os.environ.get("CRICKET_DOCUMENT_CONTEXT_CHARS", "300"))
+# Extra attempts for a chunk whose translation lost a placeholder or came back empty
+DEFAULT_CHUNK_RETRIES = int(os.environ.get("CRICKET_DOCUMENT_RETRIES", "2"))
+
+PARAGRAPH_SEPARATOR = "\n\n"
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?।])[\"')\]]*\s+")
+
+
+@dataclass
+class DocumentChunk:
+    """
+    One piece of a document, translated on its own.
+
+    Attributes:
+        index: Position of the chunk in the document, from 0
+        text: The source text of the chunk
+        joiner: Text placed between the previous chunk and this one when reassembling
+        context: Tail of the previous chunk, sent to the model for consistency only
+    """
+
+    index: int
+    text: str
+    joiner: str = ""
+    context: str = ""
+
+
+def needs_chunking(input_text: str, max_chunk_tokens: Optional[int] = None) -> bool:
+    """
+    Check whether a text is too long to translate in one prompt.
+
+    Args:
+        input_text: The cricket text to translate
+        max_chunk_tokens: Token budget per chunk
+
+    Returns:
+        True when the text should go through translate_cricket_document
+    """
+    return estimate_tokens(input_text) > (max_chunk_tokens or DEFAULT_CHUNK_TOKENS)
+
+
+def _iter_paragraphs(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield non-empty paragraphs from a string or from an iterable of lines."""
+    if isinstance(source, str):
+        position = 0
+        for match in _PARAGRAPH_BREAK.finditer(source):
+            paragraph = source[position:match.start()].strip()
+            if paragraph:
+                yield paragraph
+            position = match.end()
+        paragraph = source[position:].strip()
+        if paragraph:
+            yield paragraph
+        return
+
+    lines: List[str] = []
+    for line in source:
+        if line.strip():
+            lines.append(line.rstrip("\r\n"))
+        elif lines:
+            yield "\n".join(lines).strip()
+            lines = []
+    if lines:
+        yield "\n".join(lines).strip()
+
+
+def _iter_units(source: Union[str, Iterable[str]], max_chars: int) -> Iterator[Tuple[str, str]]:
+    """Yield (separator, text) units no longer than max_chars: whole paragraphs, else sentences, else words."""
+    for paragraph in _iter_paragraphs(source):
+        if len(paragraph) <= max_chars:
+            yield PARAGRAPH_SEPARATOR, paragraph
+            continue
+        separator = PARAGRAPH_SEPARATOR
+        position = 0
+        breaks = [m.end() for m in _SENTENCE_BREAK.finditer(paragraph)] + [len(paragraph)]
+        for end in breaks:
+            sentence = paragraph[position:end].strip()
+            position = end
+            if not sentence:
+                continue
+            while len(sentence) > max_chars:
+                # A single run-on sentence is cut at the last space within budget
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                yield separator, sentence[:cut].strip()
+                separator = " "
+                sentence = sentence[cut:].strip()
+            yield separator, sentence
+            separator = " "
+
+
+def _context_tail(text: str, context_chars: int) -> str:
+    """Last sentences of a chunk, up to context_chars, starting at a word boundary."""
+    if context_chars <= 0:
+        return ""
+    tail = text[-context_chars:]
+    if len(tail) < len(text):
+        space = tail.find(" ")
+        tail = tail[space + 1:] if space != -1 else tail
+    return tail.strip()
+
+
+def iter_chunks(source: Union[str, Iterable[str]], max_chunk_tokens: Optional[int] = None,
+                context_chars: Optional[int] = None) -> Iterator[DocumentChunk]:
+    """
+    Split a document into chunks on paragraph and sentence boundaries.
+
+    Args:
+        source: The document, as a string or an iterable of lines
+        max_chunk_tokens: Token budget per chunk
+        context_chars: Characters of the previous chunk carried as context
+
+    Yields:
+        DocumentChunk objects in document order
+    """
+    max_chars = max(1, max_chunk_tokens or DEFAULT_CHUNK_TOKENS) * 4
+    context_chars = DEFAULT_CONTEXT_CHARS if context_chars is None else context_chars
+    index = 0
+    parts: List[str] = []
+    size = 0
+    joiner = ""
+    context = ""
+    for separator, text in _iter_units(source, max_chars):
+        if parts and size + len(separator) + len(text) > max_chars:
+            chunk_text = "".join(parts)
+            yield DocumentChunk(index=index, text=chunk_text, joiner=joiner if index else "", context=context)
+            context = _context_tail(chunk_text, context_chars)
+            index += 1
+            parts, size = [], 0
+        if parts:
+            parts.append(separator)
+            size += len(separator)
+        else:
+            joiner = separator
+        parts.append(text)
+        size += len(text)
+    if parts:
+        yield DocumentChunk(index=index, text="".join(parts), joiner=joiner if index else "", context=context)
+
+
+async def _translate_chunk(chunk: DocumentChunk, target_language: str, model_id: str,
+                           use_cache: bool, retries: int, terminology: Terminology) -> Tuple[str, List[str], bool]:
+    """Translate one chunk, retrying a lost placeholder or an empty answer; returns (text, glossary issues, cached)."""
+    cache_key = make_cache_key(chunk.text, target_language, model_id, terminology.prompt_version) if use_cache else None
+    cached_text = TRANSLATION_CACHE.get(cache_key) if cache_key else None
+    if cached_text is not None:
+        return cached_text, [], True
+
+    template = terminology.template(target_language)
+    masked = _mask_source(chunk.text)
+    for attempt in range(retries + 1):
+        # Failed model calls are not retried here: the executor already retried the transient ones
+        model_text = masked.text if masked else chunk.text
+        translated_text = await _call_model(
+            model_id, template.user_message(model_text, chunk.context), template.system_content
+        )
+        translated_text, issues, missing = _apply_glossary(chunk.text, translated_text, target_language, masked)
+        if missing:
+            # The next attempt goes unmasked rather than publishing a lost score
+            METRICS.increment("glossary_placeholder_retries")
+            masked = None
+            problem = f"{len(missing)} placeholders missing from chunk {chunk.index}"
+        elif not translated_text.strip():
+            problem = f"empty translation of chunk {chunk.index}"
+        else:
+            break
+        if attempt == retries:
+            raise ValueError(problem)
+        METRICS.increment("document_chunk_retries")
+        logger.warning(f"Chunk {chunk.index} to {target_language} failed, retrying: {problem}")
+
+    if cache_key:
+        TRANSLATION_CACHE.set(cache_key, translated_text)
+    return translated_text, issues, False
+
+
+async def stream_cricket_document(source: Union[str, Iterable[str]], target_language: str, model_id: str,
+                                  max_chunk_tokens: Optional[int] = None,
+                                  max_concurrency: Optional[int] = None,
+                                  use_cache: bool = True,
+                                  retries: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Translate a long document chunk by chunk, yielding translated chunks in order.
+
+    At most max_concurrency chunks are in flight; the next chunk is only read
+    from the source once a slot frees up.
+
+    Args:
+        source: The document, as a string or an iterable of lines
+        target_language: The target language for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by document length
+        max_chunk_tokens: Token budget per chunk
+        max_concurrency: Chunks translated at the same time
+        use_cache: Serve repeated chunks from the translation cache
+        retries: Extra attempts for a chunk that lost a placeholder or came back empty
+
+    Yields:
+        {"type": "chunk", "index", "text", "joiner", "cached", "glossary_issues"} per chunk,
+        with an "error" and the source text for chunks that could not be translated
+
+    Raises:
+        ModelBusyError: If too many requests are already queued for model_id
+        ModelUnavailableError: If the model's circuit breaker is open
+    """
+    concurrency = max(1, max_concurrency or DEFAULT_DOCUMENT_CONCURRENCY)
+    # The whole document goes to one model; a file of unknown length goes to the largest tier
+    model_id = MODEL_ROUTER.route(model_id, source if isinstance(source, str) else None)
+    retries = DEFAULT_CHUNK_RETRIES if retries is None else max(0, retries)
+    # Every chunk uses the terminology in place when the document started
+    terminology = TERMINOLOGY.current
+    in_flight: Deque[Tuple[DocumentChunk, asyncio.Future]] = deque()
+
+    async def finish(chunk: DocumentChunk, task: asyncio.Future) -> Dict[str, Any]:
+        event = {"type": "chunk", "index": chunk.index, "joiner": chunk.joiner}
+        try:
+            text, issues, cached = await task
+            event.update(text=text, cached=cached, glossary_issues=issues)
+        except (ModelBusyError, ModelUnavailableError):
+            raise
+        except Exception as e:
+            METRICS.increment("document_chunks_failed")
+            logger.error(f"Error translating chunk {chunk.index} to {target_language}: {str(e)}")
+            event.update(text=chunk.text, cached=False, glossary_issues=[],
+                         error=f"Error translating cricket text: {str(e)}")
+        return event
+
+    METRICS.increment("document_requests")
+    try:
+        for chunk in iter_chunks(source, max_chunk_tokens):
+            METRICS.increment("document_chunks")
+            METRICS.observe("document_chunk_chars", len(chunk.text))
+            in_flight.append((chunk, asyncio.ensure_future(
+                _translate_chunk(chunk, target_language, model_id, use_cache, retries, terminology)
+            )))
+            if len(in_flight) >= concurrency:
+                yield await finish(*in_flight.popleft())
+        while in_flight:
+            yield await finish(*in_flight.popleft())
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+
+
+async def translate_cricket_document(source: Union[str, Iterable[str]], target_language: str, model_id: str,
+                                     max_chunk_tokens: Optional[int] = None,
+                                     max_concurrency: Optional[int] = None,
+                                     use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Translate a long cricket document such as a match report or analysis article.
+
+    Args:
+        source: The document, as a string or an iterable of lines
+        target_language: The target language for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by document length
+        max_chunk_tokens: Token budget per chunk
+        max_concurrency: Chunks translated at the same time
+        use_cache: Serve repeated chunks from the translation cache
+
+    Returns:
+        A dictionary containing the reassembled translation, the number of chunks
+        and the chunks that could not be translated (left in English)
+
+    Raises:
+        ModelBusyError: If too many requests are already queued for model_id
+        ModelUnavailableError: If the model's circuit breaker is open
+    """
+    pieces: List[str] = []
+    chunks = 0
+    glossary_issues: List[str] = []
+    failed_chunks: List[Dict[str, Any]] = []
+    async for event in stream_cricket_document(source, target_language, model_id, max_chunk_tokens,
+                                               max_concurrency, use_cache):
+        chunks += 1
+        pieces.append(event["joiner"])
+        pieces.append(event["text"])
+        glossary_issues.extend(event["glossary_issues"])
+        if "error" in event:
+            failed_chunks.append({"index": event["index"], "error": event["error"]})
+
+    return {
+        "translated_text": "".join(pieces),
+        "source_language": "English",
+        "target_language": target_language,
+        "chunks": chunks,
+        "failed_chunks": failed_chunks,
+        "glossary_issues": glossary_issues,
+    }
@@ -0,0 +1,269 @@
+"""
+Offline quality checks for cricket translations.
+
+Batching, caching, chunking, routing and the translation memory all change
+how a translation is produced. These checks tell whether they still produce
+the same quality, without a person reading every line:
+
+- glossary: every glossary term found in the source (see common.glossary) is
+  rendered with the language's term from the terminology data
+- numbers: every number, score and bowling figure in the source appears in
+  the translation unchanged
+- script: the share of letters written in the language's Unicode block
+- chrf: character n-gram F-score against a reference translation (0-100),
+  when a reference is available
+
+evaluate_translation checks one translation; summarize averages a run. The
+golden corpus the references come from is src/benchmark/data/golden.jsonl,
+and src/benchmark/bench_quality.py runs it through each pipeline.
+"""
+
+import json
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from common.terminology import Terminology
+
+# A translation passes when its letters are at least this much in the target script;
+# player names kept in Latin letters stay well below the rest of a line
+MIN_SCRIPT_RATIO = 0.6
+CHRF_ORDER = 6
+CHRF_BETA = 2
+
+
+@dataclass(frozen=True)
+class GoldenExample:
+    """
+    An English source with reference translations.
+
+    Attributes:
+        id: Stable identifier of the example
+        source: The English commentary text
+        references: Reference translation per language
+        variant_of: Id of the example this one is a near-duplicate of, if any
+    """
+
+    id: str
+    source: str
+    references: Dict[str, str] = field(default_factory=dict)
+    variant_of: Optional[str] = None
+
+
+def load_golden_corpus(path: str) -> List[GoldenExample]:
+    """
+    Read a golden corpus file.
+
+    Args:
+        path: JSONL file with one {"id", "source", "references": {language: text}} object per line
+
+    Returns:
+        The examples, in file order
+    """
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                examples.append(GoldenExample(
+                    id=entry["id"],
+                    source=entry["source"],
+                    references=entry["references"],
+                    variant_of=entry.get("variant_of"),
+                ))
+    return examples
+
+
+def source_numbers(text: str, terminology: Terminology) -> List[str]:
+    """The numbers, scores and bowling figures in a source text, as the glossary masks them."""
+    return list(terminology.glossary.mask(text, mask_names=False).placeholders.values())
+
+
+def _term_forms(term: str) -> List[str]:
+    """
+    The forms of a term a translation may use: each "/" alternative, and the
+    alternative without its final vowel sign or virama, so inflected forms
+    (பந்து -> பந்தில், सीमारेषा -> सीमारेषेपार) still count.
+    """
+    forms = []
+    for alternative in term.split("/"):
+        alternative = alternative.strip()
+        if not alternative:
+            continue
+        forms.append(alternative)
+        stem = alternative
+        while len(stem) > 1 and unicodedata.category(stem[-1]).startswith("M"):
+            stem = stem[:-1]
+        if stem != alternative:
+            forms.append(stem)
+    return forms
+
+
+def check_glossary(source: str, translated: str, language: str, terminology: Terminology) -> Dict[str, Any]:
+    """
+    Check that the glossary terms in the source are rendered with the language's terms.
+
+    Args:
+        source: The English source text
+        translated: The translation
+        language: The target language
+        terminology: The terminology snapshot to check against
+
+    Returns:
+        Dictionary with the expected term keys, the missing ones and a score (1.0 when nothing is expected)
+    """
+    terms = terminology.terms.get(language, {})
+    expected = [key for key in terminology.glossary.source_terms(source) if terms.get(key)]
+    missing = [key for key in expected if not any(form in translated for form in _term_forms(terms[key]))]
+    return {
+        "expected": expected,
+        "missing": missing,
+        "score": (len(expected) - len(missing)) / len(expected) if expected else 1.0,
+    }
+
+
+def check_numbers(source: str, translated: str, terminology: Terminology) -> Dict[str, Any]:
+    """
+    Check that the numbers and scores in the source appear unchanged in the translation.
+
+    Args:
+        source: The English source text
+        translated: The translation
+        terminology: The terminology snapshot whose glossary finds the numbers
+
+    Returns:
+        Dictionary with the expected numbers, the missing ones and a score (1.0 when there are none)
+    """
+    expected = source_numbers(source, terminology)
+    found = Counter(source_numbers(translated, terminology))
+    missing = []
+    for number in expected:
+        if found[number]:
+            found[number] -= 1
+        else:
+            missing.append(number)
+    return {
+        "expected": expected,
+        "missing": missing,
+        "score": (len(expected) - len(missing)) / len(expected) if expected else 1.0,
+    }
+
+
+def script_ratio(translated: str, language: str, terminology: Terminology) -> float:
+    """
+    Share of the translation's letters that are in the language's script.
+
+    Args:
+        translated: The translation
+        language: The target language
+        terminology: The terminology snapshot with each language's Unicode block
+
+    Returns:
+        A ratio between 0 and 1; 1.0 for languages without a known script
+    """
+    script = terminology.scripts.get(language)
+    if script is None:
+        return 1.0
+    low, high = script
+    # Combining vowel signs and viramas are not "alpha" but belong to the script
+    letters = [char for char in translated if char.isalpha() or low <= char <= high]
+    if not letters:
+        return 0.0
+    return sum(1 for char in letters if low <= char <= high) / len(letters)
+
+
+def _char_ngrams(text: str, n: int) -> Counter:
+    text = "".join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypothesis: str, reference: str, order: int = CHRF_ORDER, beta: float = CHRF_BETA) -> float:
+    """
+    Character n-gram F-score of a translation against a reference (chrF, Popović 2015).
+
+    Whitespace is ignored, so it works the same for every script and does not
+    depend on tokenization.
+
+    Args:
+        hypothesis: The translation
+        reference: The reference translation
+        order: Longest n-gram
+        beta: Weight of recall over precision
+
+    Returns:
+        The score from 0 to 100
+    """
+    precisions, recalls = [], []
+    for n in range(1, order + 1):
+        hypothesis_grams = _char_ngrams(hypothesis, n)
+        reference_grams = _char_ngrams(reference, n)
+        if not hypothesis_grams or not reference_grams:
+            continue
+        overlap = sum((hypothesis_grams & reference_grams).values())
+        precisions.append(overlap / sum(hypothesis_grams.values()))
+        recalls.append(overlap / sum(reference_grams.values()))
+    if not precisions:
+        return 100.0 if hypothesis.split() == reference.split() else 0.0
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def evaluate_translation(source: str, translated: str, language: str, terminology: Terminology,
+                         reference: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run every check on one translation.
+
+    Args:
+        source: The English source text
+        translated: The translation
+        language: The target language
+        terminology: The terminology snapshot to check against
+        reference: A reference translation, for chrf
+
+    Returns:
+        Dictionary with glossary, numbers, script and chrf scores, what is missing, and
+        passed: True when no glossary term or number is missing and the script ratio is
+        at least MIN_SCRIPT_RATIO
+    """
+    glossary = check_glossary(source, translated, language, terminology)
+    numbers = check_numbers(source, translated, terminology)
+    script = script_ratio(translated, language, terminology)
+    result = {
+        "glossary": round(glossary["score"], 4),
+        "numbers": round(numbers["score"], 4),
+        "script": round(script, 4),
+        "passed": not glossary["missing"] and not numbers["missing"] and script >= MIN_SCRIPT_RATIO,
+    }
+    if glossary["missing"]:
+        result["missing_terms"] = glossary["missing"]
+    if numbers["missing"]:
+        result["missing_numbers"] = numbers["missing"]
+    if reference is not None:
+        result["chrf"] = round(chrf(translated, reference), 2)
+    return result
+
+
+def summarize(evaluations: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Average the checks of a run.
+
+    Args:
+        evaluations: Results of evaluate_translation
+
+    Returns:
+        Dictionary with the count, the pass rate and the mean of each score
+    """
+    evaluations = list(evaluations)
+    if not evaluations:
+        return {"translations": 0}
+    summary = {"translations": len(evaluations),
+               "pass_rate": round(sum(e["passed"] for e in evaluations) / len(evaluations), 4)}
+    for name in ("chrf", "glossary", "numbers", "script"):
+        scores = [e[name] for e in evaluations if name in e]
+        if scores:
+            summary[name] = round(sum(scores) / len(scores), 4 if name != "chrf" else 2)
+    return summary
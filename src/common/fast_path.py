@@ -0,0 +1,192 @@
+"""
+Template-based fast path for formulaic ball-by-ball lines.
+
+A large share of live commentary is formulaic: "Bumrah to Warner, FOUR",
+"45/2 after 3.3 overs", "India need 45 runs from 36 balls", "Drinks break".
+Their target-language forms are regular, so this module recognises them with
+precompiled regular expressions and renders them directly from CRICKET_TERMS
+and a small phrase table, without a model call. A line is only handled here
+when a rule matches it completely; anything else (for example a ball with a
+shot description) falls through to Bedrock.
+
+Player and team names are kept as written, in line with the translation
+guidelines; numbers and scores are kept in their original form.
+"""
+
+import re
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from common.glossary import _NAME
+from common.metrics import METRICS
+
+# Per-language phrases for the rendered templates. Names and numbers are
+# substituted as-is; glossary words (over, ball, bowler, batsman) come from CRICKET_TERMS.
+PHRASES: Dict[str, Dict[str, str]] = {
+    "Tamil": {
+        "four": "ஃபோர்", "six": "சிக்ஸ்", "out": "அவுட்", "wide": "வைடு", "no_ball": "நோ பால்",
+        "no_run": "ரன் இல்லை", "run": "{n} ரன்", "runs": "{n} ரன்கள்",
+        "score_after_overs": "{overs} ஓவர்களுக்குப் பிறகு {score}",
+        "need_runs": "{team} அணிக்கு {balls} பந்துகளில் {runs} ரன்கள் தேவை",
+        "end_of_over": "ஓவர் முடிந்தது", "end_of_innings": "இன்னிங்ஸ் முடிந்தது",
+        "drinks": "டிரிங்க்ஸ் இடைவேளை", "timeout": "ஸ்ட்ராடஜிக் டைம் அவுட்",
+    },
+    "Hindi": {
+        "four": "चौका", "six": "छक्का", "out": "आउट", "wide": "वाइड", "no_ball": "नो बॉल",
+        "no_run": "कोई रन नहीं", "run": "{n} रन", "runs": "{n} रन",
+        "score_after_overs": "{overs} ओवर के बाद {score}",
+        "need_runs": "{team} को {balls} गेंदों में {runs} रन चाहिए",
+        "end_of_over": "ओवर समाप्त", "end_of_innings": "पारी समाप्त",
+        "drinks": "ड्रिंक्स ब्रेक", "timeout": "स्ट्रैटेजिक टाइम आउट",
+    },
+    "Telugu": {
+        "four": "ఫోర్", "six": "సిక్స్", "out": "ఔట్", "wide": "వైడ్", "no_ball": "నో బాల్",
+        "no_run": "పరుగు లేదు", "run": "{n} పరుగు", "runs": "{n} పరుగులు",
+        "score_after_overs": "{overs} ఓవర్ల తర్వాత {score}",
+        "need_runs": "{team} జట్టుకు {balls} బంతుల్లో {runs} పరుగులు కావాలి",
+        "end_of_over": "ఓవర్ ముగిసింది", "end_of_innings": "ఇన్నింగ్స్ ముగిసింది",
+        "drinks": "డ్రింక్స్ బ్రేక్", "timeout": "స్ట్రాటజిక్ టైమ్ ఔట్",
+    },
+    "Kannada": {
+        "four": "ಫೋರ್", "six": "ಸಿಕ್ಸ್", "out": "ಔಟ್", "wide": "ವೈಡ್", "no_ball": "ನೋ ಬಾಲ್",
+        "no_run": "ರನ್ ಇಲ್ಲ", "run": "{n} ರನ್", "runs": "{n} ರನ್‌ಗಳು",
+        "score_after_overs": "{overs} ಓವರ್‌ಗಳ ನಂತರ {score}",
+        "need_runs": "{team} ತಂಡಕ್ಕೆ {balls} ಚೆಂಡುಗಳಲ್ಲಿ {runs} ರನ್‌ಗಳ ಅಗತ್ಯವಿದೆ",
+        "end_of_over": "ಓವರ್ ಮುಗಿಯಿತು", "end_of_innings": "ಇನ್ನಿಂಗ್ಸ್ ಮುಗಿಯಿತು",
+        "drinks": "ಡ್ರಿಂಕ್ಸ್ ಬ್ರೇಕ್", "timeout": "ಸ್ಟ್ರಾಟಜಿಕ್ ಟೈಮ್ ಔಟ್",
+    },
+    "Bengali": {
+        "four": "চার", "six": "ছক্কা", "out": "আউট", "wide": "ওয়াইড", "no_ball": "নো বল",
+        "no_run": "কোনো রান নেই", "run": "{n} রান", "runs": "{n} রান",
+        "score_after_overs": "{overs} ওভার শেষে {score}",
+        "need_runs": "{team} দলের {balls} বলে {runs} রান প্রয়োজন",
+        "end_of_over": "ওভার শেষ", "end_of_innings": "ইনিংস শেষ",
+        "drinks": "পানীয় বিরতি", "timeout": "স্ট্র্যাটেজিক টাইম আউট",
+    },
+    "Malayalam": {
+        "four": "ഫോർ", "six": "സിക്സ്", "out": "ഔട്ട്", "wide": "വൈഡ്", "no_ball": "നോ ബോൾ",
+        "no_run": "റൺ ഇല്ല", "run": "{n} റൺ", "runs": "{n} റൺസ്",
+        "score_after_overs": "{overs} ഓവറിന് ശേഷം {score}",
+        "need_runs": "{team} ടീമിന് {balls} പന്തിൽ {runs} റൺസ് വേണം",
+        "end_of_over": "ഓവർ അവസാനിച്ചു", "end_of_innings": "ഇന്നിംഗ്സ് അവസാനിച്ചു",
+        "drinks": "ഡ്രിങ്ക്സ് ബ്രേക്ക്", "timeout": "സ്ട്രാറ്റജിക് ടൈം ഔട്ട്",
+    },
+    "Marathi": {
+        "four": "चौकार", "six": "षटकार", "out": "बाद", "wide": "वाइड", "no_ball": "नो बॉल",
+        "no_run": "धाव नाही", "run": "{n} धाव", "runs": "{n} धावा",
+        "score_after_overs": "{overs} षटकांनंतर {score}",
+        "need_runs": "{team} संघाला {balls} चेंडूंमध्ये {runs} धावांची आवश्यकता आहे",
+        "end_of_over": "षटक संपले", "end_of_innings": "डाव संपला",
+        "drinks": "ड्रिंक्स ब्रेक", "timeout": "स्ट्रॅटेजिक टाइम आउट",
+    },
+}
+
+# Names stay case-sensitive so ordinary sentences are not read as "<bowler> to <batsman>"
+_OUTCOME = r"(?i:FOUR|SIX|OUT|wide|no ball|no run|(?P<n>\d+) runs?)"
+
+# (rule name, pattern); a rule only applies when the pattern matches the whole line
+_RULES: List[Tuple[str, "re.Pattern"]] = [
+    ("ball_outcome", re.compile(rf"(?P<bowler>{_NAME}) to (?P<batsman>{_NAME}), (?P<outcome>{_OUTCOME})[.!]?")),
+    ("score_after_overs", re.compile(r"(?P<score>\d{1,3}/\d{1,2}) after (?P<overs>\d+(?:\.\d)?) overs?[.!]?", re.IGNORECASE)),
+    ("need_runs", re.compile(rf"(?P<team>{_NAME}) needs? (?P<runs>\d+) runs? (?:from|off|in) (?P<balls>\d+) balls?[.!]?")),
+    ("end_of_over", re.compile(r"(?:that's |that is )?(?:the )?end of (?:the )?over[.!]?", re.IGNORECASE)),
+    ("end_of_innings", re.compile(r"(?:that's |that is )?(?:the )?end of (?:the )?innings[.!]?", re.IGNORECASE)),
+    ("drinks", re.compile(r"drinks(?: break)?[.!]?", re.IGNORECASE)),
+    ("timeout", re.compile(r"strategic time-?out[.!]?", re.IGNORECASE)),
+    ("exclamation", re.compile(r"(?P<outcome>FOUR|SIX|OUT)(?P<bang>!*)", re.IGNORECASE)),
+]
+
+
+class FastPathEngine:
+    """
+    Renders formulaic commentary lines without a model call.
+
+    Args:
+        terminology: Cricket terminology keyed by language
+        phrases: Template phrases keyed by language (defaults to PHRASES)
+    """
+
+    def __init__(self, terminology: Mapping[str, Mapping[str, str]],
+                 phrases: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self.terminology = terminology
+        self.phrases = phrases if phrases is not None else PHRASES
+        self._renderers: Dict[str, Callable[["re.Match", Mapping[str, str], Mapping[str, str]], str]] = {
+            "ball_outcome": self._render_ball_outcome,
+            "score_after_overs": lambda m, p, t: p["score_after_overs"].format(**m.groupdict()),
+            "need_runs": lambda m, p, t: p["need_runs"].format(**m.groupdict()),
+            "end_of_over": lambda m, p, t: p["end_of_over"],
+            "end_of_innings": lambda m, p, t: p["end_of_innings"],
+            "drinks": lambda m, p, t: p["drinks"],
+            "timeout": lambda m, p, t: p["timeout"],
+            "exclamation": lambda m, p, t: self._outcome(m, p) + m.group("bang"),
+        }
+
+    @staticmethod
+    def _outcome(match: "re.Match", phrases: Mapping[str, str]) -> str:
+        outcome = match.group("outcome").lower()
+        if outcome in ("four", "six", "out", "wide"):
+            return phrases[outcome]
+        if outcome == "no ball":
+            return phrases["no_ball"]
+        if outcome == "no run":
+            return phrases["no_run"]
+        count = match.group("n")
+        return phrases["run" if count == "1" else "runs"].format(n=count)
+
+    def _render_ball_outcome(self, match: "re.Match", phrases: Mapping[str, str], terms: Mapping[str, str]) -> str:
+        bowler = terms.get("bowler", "bowler")
+        batsman = terms.get("batsman", "batsman")
+        return f"{bowler} {match.group('bowler')}, {batsman} {match.group('batsman')}: {self._outcome(match, phrases)}"
+
+    def match(self, text: str) -> Optional[Tuple[str, "re.Match"]]:
+        """
+        Find the rule that matches a whole line.
+
+        Args:
+            text: The English source text
+
+        Returns:
+            (rule name, match) or None when no rule covers the line
+        """
+        stripped = text.strip()
+        for name, pattern in _RULES:
+            match = pattern.fullmatch(stripped)
+            if match:
+                return name, match
+        return None
+
+    def translate(self, text: str, target_language: str) -> Optional[str]:
+        """
+        Render a formulaic line directly in the target language.
+
+        Args:
+            text: The English source text
+            target_language: The target language for translation
+
+        Returns:
+            The translation, or None when the line must go to the model
+        """
+        phrases = self.phrases.get(target_language)
+        found = self.match(text) if phrases else None
+        if found is None:
+            METRICS.increment("fast_path_misses")
+            return None
+        name, match = found
+        METRICS.increment("fast_path_hits")
+        METRICS.increment("fast_path_rule_hits", labels={"rule": name})
+        return self._renderers[name](match, phrases, self.terminology.get(target_language, {}))
+
+
+def fast_path_stats(counters: Mapping[str, float]) -> Dict[str, float]:
+    """
+    Summarise fast path counters from a metrics snapshot.
+
+    Args:
+        counters: The "counters" section of METRICS.snapshot()
+
+    Returns:
+        Hits, misses and hit rate
+    """
+    hits = counters.get("fast_path_hits", 0)
+    misses = counters.get("fast_path_misses", 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 4) if total else 0.0}
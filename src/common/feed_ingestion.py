@@ -0,0 +1,433 @@
+"""
+Ingestion of a live ball-by-ball feed.
+
+The tools take one string per call, so a feed has to be driven by a client
+that tracks order and progress itself. FeedPipeline does that in process: it
+reads JSON events, one per line, from a JSONL file (optionally tailed),
+stdin or a local socket, translates each event into the configured languages
+concurrently, and writes one JSON line per event in per-match event order.
+
+An event looks like {"match_id": "ind-aus-3", "seq": 42, "text": "..."}.
+"seq" must increase within a match; events without it are numbered after
+the last event seen for their match. "languages" overrides the configured
+target languages for one event.
+
+At most max_in_flight events are read but not yet written; beyond that the
+source is not read, so a socket producer is slowed down by TCP backpressure.
+A FeedCheckpoint records the last event written per match and, for files,
+the byte offset up to which every event was written. A restarted pipeline
+resumes from there and skips events it already wrote instead of translating
+them again.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, TextIO, Tuple
+
+from common.cricket_translation import (
+    ModelBusyError,
+    ModelUnavailableError,
+    TERMINOLOGY,
+    TranslationError,
+    logger,
+    translate_cricket_text,
+    validate_language,
+)
+from common.document_translation import needs_chunking, translate_cricket_document
+from common.metrics import METRICS
+
+DEFAULT_FEED_MAX_IN_FLIGHT = int(os.environ.get("CRICKET_FEED_MAX_IN_FLIGHT", "32"))
+DEFAULT_FEED_RETRIES = int(os.environ.get("CRICKET_FEED_RETRIES", "3"))
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Seconds to wait before retrying a language rejected as busy or unavailable, doubled on every further retry
+RETRY_BACKOFF = 1.0
+
+DEFAULT_MATCH_ID = "default"
+
+
+@dataclass
+class FeedEvent:
+    """
+    One commentary event read from the feed.
+
+    Attributes:
+        match_id: The match the event belongs to
+        seq: Position of the event within its match
+        text: The cricket text to translate
+        languages: Target languages for this event, or None for the pipeline's
+        offset: Source position just after the event, for sources that can be re-read
+        received: When the event was read, for the latency written with it
+    """
+
+    match_id: str
+    seq: int
+    text: str
+    languages: Optional[List[str]] = None
+    offset: Optional[int] = None
+    received: float = field(default_factory=time.perf_counter)
+
+
+class FeedCheckpoint:
+    """
+    Progress of a feed, kept in a JSON file that is replaced atomically on every save.
+
+    Attributes:
+        source: The source the offset belongs to
+        offset: Byte offset up to which every event has been written
+        emitted: Last seq written per match
+        watermark: Highest seq per match at the offset, where numbering resumes when the source is re-read
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.source: Optional[str] = None
+        self.offset = 0
+        self.emitted: Dict[str, int] = {}
+        self.watermark: Dict[str, int] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.source = state.get("source")
+            self.offset = int(state.get("offset", 0))
+            self.emitted = {match: int(seq) for match, seq in state.get("emitted", {}).items()}
+            self.watermark = {match: int(seq) for match, seq in state.get("watermark", {}).items()}
+
+    def resume_offset(self, source: str) -> int:
+        """Byte offset to resume reading a source from, 0 when the checkpoint is for another source."""
+        return self.offset if source == self.source else 0
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"source": self.source, "offset": self.offset,
+                       "emitted": self.emitted, "watermark": self.watermark}, f)
+        os.replace(temporary, self.path)
+
+
+async def file_source(path: str, offset: int = 0, follow: bool = False,
+                      poll_interval: float = DEFAULT_POLL_INTERVAL) -> AsyncIterator[Tuple[str, Optional[int]]]:
+    """
+    Read lines from a JSONL file, optionally waiting for more like tail -f.
+
+    Args:
+        path: The file to read
+        offset: Byte offset to start reading at
+        follow: Keep waiting for lines appended to the file instead of stopping at its end
+        poll_interval: Seconds between checks for new lines when following
+
+    Yields:
+        (line, offset after the line)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if line.endswith(b"\n") or (line and not follow):
+                yield line.decode("utf-8"), f.tell()
+                continue
+            if not follow:
+                return
+            # Nothing new, or a line still being written: try again shortly
+            f.seek(position)
+            await asyncio.sleep(poll_interval)
+
+
+async def stdin_source() -> AsyncIterator[Tuple[str, Optional[int]]]:
+    """Read lines from standard input until it closes."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line.decode("utf-8"), None
+
+
+async def socket_source(address: str, max_buffered: int = DEFAULT_FEED_MAX_IN_FLIGHT) -> AsyncIterator[Tuple[str, Optional[int]]]:
+    """
+    Accept producers on a local socket and read lines from all of them.
+
+    Args:
+        address: "tcp://host:port" or "unix:/path/to/socket"
+        max_buffered: Lines held before producers stop being read
+
+    Yields:
+        (line, None) for every line from any connection, until cancelled
+    """
+    lines: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_buffered))
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Blocks while the pipeline is full, which stops reading from the producer
+                await lines.put(line.decode("utf-8"))
+        finally:
+            writer.close()
+
+    if address.startswith("unix:"):
+        server = await asyncio.start_unix_server(handle, path=address[len("unix:"):])
+    else:
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        server = await asyncio.start_server(handle, host or "127.0.0.1", int(port))
+    logger.info(f"Reading feed events from {address}")
+    async with server:
+        while True:
+            yield await lines.get(), None
+
+
+def open_feed_source(spec: str, offset: int = 0, follow: bool = False) -> AsyncIterator[Tuple[str, Optional[int]]]:
+    """
+    Open a feed source from its command line form.
+
+    Args:
+        spec: "-" for stdin, "tcp://host:port" or "unix:/path" for a local socket, otherwise a JSONL file path
+        offset: Byte offset to resume a file from
+        follow: Keep reading lines appended to a file
+
+    Returns:
+        An async iterator of (line, offset) pairs, offset None for sources that cannot be re-read
+    """
+    if spec == "-":
+        return stdin_source()
+    if spec.startswith(("tcp://", "unix:")):
+        return socket_source(spec)
+    return file_source(spec[len("file:"):] if spec.startswith("file:") else spec, offset, follow)
+
+
+async def translate_with_retries(text: str, language: str, model_id: str, retries: int = DEFAULT_FEED_RETRIES,
+                                 retry_metric: str = "feed_retries") -> Dict[str, Any]:
+    """
+    Translate one text into one language for a pipeline that must not drop it.
+
+    Requests rejected as busy or unavailable are retried with backoff. Long
+    texts are translated as documents, in chunks. Failures are returned rather
+    than raised, so one bad text never holds up the ones after it.
+
+    Args:
+        text: The cricket text to translate
+        language: The target language
+        model_id: The model ID to use for translation
+        retries: Retries of a request rejected as busy or unavailable
+        retry_metric: Counter incremented on every retry
+
+    Returns:
+        {"translated_text": ...} plus "cached", "fast_path", "coalesced" or "chunks" when they apply,
+        or {"error": ...}
+    """
+    is_valid, error_message = validate_language(language)
+    if not is_valid:
+        return {"error": error_message}
+    for attempt in range(retries + 1):
+        try:
+            if needs_chunking(text):
+                result = await translate_cricket_document(text, language, model_id)
+            else:
+                result = await translate_cricket_text(text, language, model_id)
+        except (ModelBusyError, ModelUnavailableError) as e:
+            # A pipeline must not lose texts to a moment of backpressure, so wait and try again
+            if attempt == retries:
+                return {"error": f"Error: {str(e)}"}
+            METRICS.increment(retry_metric)
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+            continue
+        except TranslationError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            # One bad text must not hold up the ones after it
+            logger.error(f"Error translating text to {language}: {str(e)}")
+            return {"error": f"Error translating cricket text: {str(e)}"}
+        translation = {"translated_text": result["translated_text"]}
+        for flag in ("cached", "fast_path", "coalesced"):
+            if result.get(flag):
+                translation[flag] = True
+        if "chunks" in result:
+            translation["chunks"] = result["chunks"]
+            if result["failed_chunks"]:
+                translation["failed_chunks"] = result["failed_chunks"]
+        return translation
+
+
+class _Entry:
+    """A line read from the source, tracked until its event is written or skipped."""
+
+    __slots__ = ("event", "offset", "task", "done")
+
+    def __init__(self, event: Optional[FeedEvent], offset: Optional[int]):
+        self.event = event
+        self.offset = offset
+        self.task: Optional[asyncio.Future] = None
+        self.done = event is None
+
+
+class FeedPipeline:
+    """Translates feed events concurrently and writes them in per-match order."""
+
+    def __init__(self, languages: List[str], model_id: str, output: TextIO,
+                 checkpoint: Optional[FeedCheckpoint] = None, max_in_flight: Optional[int] = None,
+                 retries: Optional[int] = None):
+        self.languages = languages
+        self.model_id = model_id
+        self.output = output
+        self.checkpoint = checkpoint or FeedCheckpoint()
+        self.max_in_flight = max(1, max_in_flight or DEFAULT_FEED_MAX_IN_FLIGHT)
+        self.retries = DEFAULT_FEED_RETRIES if retries is None else max(0, retries)
+        self.counters = {"events": 0, "written": 0, "skipped": 0, "invalid": 0}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._next_seq: Dict[str, int] = {}
+        # Events of each match waiting to be written, in seq order
+        self._matches: Dict[str, Deque[_Entry]] = {}
+        # Every line in read order, to find the offset up to which everything is written
+        self._arrivals: Deque[_Entry] = deque()
+
+    def _parse(self, line: str, offset: Optional[int]) -> Optional[FeedEvent]:
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict) or not isinstance(payload.get("text"), str) or not payload["text"].strip():
+                raise ValueError("an event needs a non-empty \"text\"")
+            match_id = str(payload.get("match_id", DEFAULT_MATCH_ID))
+            seq = payload.get("seq")
+            seq = int(seq) if seq is not None else self._next_seq.get(match_id, 0) + 1
+            languages = payload.get("languages")
+            if isinstance(languages, str):
+                languages = [languages]
+        except (TypeError, ValueError) as e:
+            if line.strip():
+                METRICS.increment("feed_invalid_events")
+                self.counters["invalid"] += 1
+                logger.warning(f"Skipping invalid feed event: {str(e)}")
+            return None
+        self._next_seq[match_id] = max(seq, self._next_seq.get(match_id, 0))
+        return FeedEvent(match_id, seq, payload["text"], languages, offset)
+
+    async def _translate_language(self, text: str, language: str) -> Dict[str, Any]:
+        return await translate_with_retries(text, language, self.model_id, self.retries)
+
+    async def _translate(self, event: FeedEvent) -> Dict[str, Dict[str, Any]]:
+        languages = list(dict.fromkeys(event.languages or self.languages))
+        results = await asyncio.gather(*(self._translate_language(event.text, language) for language in languages))
+        return dict(zip(languages, results))
+
+    def _flush(self, match_id: str) -> None:
+        """Write the finished events at the head of a match's queue, then move the checkpoint on."""
+        queue = self._matches[match_id]
+        written = False
+        while queue and queue[0].task.done():
+            entry = queue.popleft()
+            event = entry.event
+            if entry.task.cancelled():
+                return
+            latency_ms = round((time.perf_counter() - event.received) * 1000, 2)
+            record = {"match_id": event.match_id, "seq": event.seq, "text": event.text,
+                      "translations": entry.task.result(), "latency_ms": latency_ms}
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            METRICS.histogram("feed_event_latency_ms", latency_ms)
+            self.checkpoint.emitted[match_id] = event.seq
+            self.counters["written"] += 1
+            entry.done = written = True
+            self._slots.release()
+        if written:
+            self.output.flush()
+            self._advance()
+
+    def _advance(self) -> None:
+        while self._arrivals and self._arrivals[0].done:
+            entry = self._arrivals.popleft()
+            if entry.offset is not None:
+                self.checkpoint.offset = entry.offset
+            if entry.event is not None:
+                self.checkpoint.watermark[entry.event.match_id] = entry.event.seq
+        self.checkpoint.save()
+
+    async def run(self, source: AsyncIterator[Tuple[str, Optional[int]]], source_name: str = "",
+                  resumed: bool = False) -> Dict[str, int]:
+        """
+        Translate every event from a source and write the results.
+
+        Args:
+            source: Lines to read, as returned by open_feed_source
+            source_name: Identifies the source in the checkpoint, so a file offset is never applied to another file
+            resumed: True when the source is re-read from the checkpoint offset rather than carrying on live
+
+        Returns:
+            Counts of events read, written, skipped as already written, and invalid
+        """
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self.checkpoint.source = source_name
+        # Events without a seq are numbered as they were the first time round when a file is re-read,
+        # and after the last event written when a live source carries on
+        self._next_seq = dict(self.checkpoint.watermark if resumed else self.checkpoint.emitted)
+        try:
+            async for line, offset in source:
+                await self._slots.acquire()
+                event = self._parse(line, offset)
+                if event is not None and event.seq <= self.checkpoint.emitted.get(event.match_id, 0):
+                    METRICS.increment("feed_events_skipped")
+                    self.counters["skipped"] += 1
+                    event = None
+                entry = _Entry(event, offset)
+                self._arrivals.append(entry)
+                if event is None:
+                    self._slots.release()
+                    self._advance()
+                    continue
+                METRICS.increment("feed_events")
+                self.counters["events"] += 1
+                self._matches.setdefault(event.match_id, deque()).append(entry)
+                entry.task = asyncio.ensure_future(self._translate(event))
+                entry.task.add_done_callback(lambda _, match_id=event.match_id: self._flush(match_id))
+            pending = [entry.task for queue in self._matches.values() for entry in queue]
+            if pending:
+                await asyncio.gather(*pending)
+                # Done callbacks have run by now, but make sure every finished event is out
+                for match_id in list(self._matches):
+                    self._flush(match_id)
+        finally:
+            for queue in self._matches.values():
+                for entry in queue:
+                    entry.task.cancel()
+            self.checkpoint.save()
+        return dict(self.counters)
+
+
+def is_file_source(spec: str) -> bool:
+    return spec != "-" and not spec.startswith(("tcp://", "unix:"))
+
+
+async def run_feed(spec: str, languages: Optional[List[str]], model_id: str, output: TextIO,
+                   checkpoint_path: Optional[str] = None, follow: bool = False,
+                   max_in_flight: Optional[int] = None) -> Dict[str, int]:
+    """
+    Translate a feed from a source spec until the source ends, resuming from a checkpoint.
+
+    Args:
+        spec: The feed source, see open_feed_source
+        languages: Target languages for every event without its own, None for all supported languages
+        model_id: The model ID to use for translation
+        output: Where the translated events are written, one JSON line each
+        checkpoint_path: JSON file recording progress, or None to start from scratch every time
+        follow: Keep reading lines appended to a file source
+        max_in_flight: Events read but not yet written before reading pauses
+
+    Returns:
+        Counts of events read, written, skipped as already written, and invalid
+    """
+    checkpoint = FeedCheckpoint(checkpoint_path)
+    resumed = is_file_source(spec) and checkpoint.source == spec
+    offset = checkpoint.resume_offset(spec) if resumed else 0
+    if offset:
+        logger.info(f"Resuming feed {spec} at byte {offset}")
+    pipeline = FeedPipeline(languages or list(TERMINOLOGY.current.languages), model_id, output, checkpoint, max_in_flight)
+    return await pipeline.run(open_feed_source(spec, offset, follow), spec, resumed)
@@ -0,0 +1,342 @@
+"""
+Deterministic glossary pre/post-processing for cricket translations.
+
+CRICKET_TERMS used to be text pasted into the prompt and nothing more. This
+module enforces it around the model call:
+
+- Before the call, numbers, score patterns ("45/2", "3.3", "4-0-29-3") and
+  known player names are replaced with numbered placeholders such as {{1}},
+  so the model cannot mangle them.
+- After the call, placeholders are restored, and glossary terms found in the
+  source are checked in the output. English terms left untranslated are
+  replaced with the language's glossary term; terms that cannot be repaired
+  are reported as issues.
+
+All glossary surface forms are compiled into a single Aho-Corasick automaton,
+so a line is scanned once regardless of how many terms there are. It is cheap
+enough to run on every ball (see src/benchmark/bench_glossary.py).
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+PLACEHOLDER = "{{{{{index}}}}}"
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\d+)\s*\}\}")
+
+# Longest alternatives first so "4-0-29-3" is not split into four numbers
+_NUMBER_PATTERN = re.compile(
+    r"(?<![\w.])(?:"
+    r"\d+(?:-\d+){2,3}"            # bowling figures: 4-0-29-3
+    r"|\d{1,3}/\d{1,2}"            # scores: 45/2
+    r"|\d+(?:,\d{3})+(?:\.\d+)?"   # grouped numbers: 1,250
+    r"|\d+(?:\.\d+)?"              # plain numbers and overs: 36, 3.3
+    r")(?![\w/])"
+)
+
+# "<bowler> to <batsman>," at the start of a ball-by-ball line
+_NAME = r"[A-Z][\w'.-]*(?: [A-Z][\w'.-]*){0,3}"
+_BALL_BY_BALL_PATTERN = re.compile(rf"^({_NAME}) to ({_NAME}),")
+
+# English surface forms for each glossary key
+TERM_SURFACE_FORMS: Dict[str, Tuple[str, ...]] = {
+    "over": ("over", "overs"),
+    "wicket": ("wicket", "wickets"),
+    "ball": ("ball", "balls"),
+    "batsman": ("batsman", "batsmen", "batter", "batters"),
+    "bowler": ("bowler", "bowlers"),
+    "run_rate": ("run rate", "run-rate"),
+    "partnership": ("partnership", "partnerships"),
+    "boundary": ("boundary", "boundaries"),
+    "catch": ("catch", "catches"),
+    "lbw": ("lbw",),
+}
+
+# Surface forms that are also everyday words only count as terms in these contexts,
+# e.g. "the final over" but not "six over long-on"
+_TERM_CONTEXT: Dict[str, "re.Pattern"] = {
+    "over": re.compile(r"(?:\d|\}\}|\b(?:the|this|that|next|last|final|first|an|maiden|per|of|'s)\s+)$", re.IGNORECASE),
+}
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher that finds every occurrence of a set of strings in one pass.
+
+    Patterns map to arbitrary values. Matching can be restricted to whole words,
+    where a word boundary is any character that is not alphanumeric.
+    """
+
+    def __init__(self, patterns: Mapping[str, object]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, object]]] = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern, value)
+        self._build()
+
+    def _add(self, pattern: str, value: object) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str, whole_words: bool = False) -> List[Tuple[int, int, object]]:
+        """
+        Find all pattern occurrences.
+
+        Args:
+            text: The text to scan
+            whole_words: Only report matches bounded by non-alphanumeric characters
+
+        Returns:
+            (start, end, value) tuples in order of end position
+        """
+        matches = []
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for size, value in out[node]:
+                start = i + 1 - size
+                if whole_words and (
+                    (start > 0 and text[start - 1].isalnum())
+                    or (i + 1 < length and text[i + 1].isalnum())
+                ):
+                    continue
+                matches.append((start, i + 1, value))
+        return matches
+
+
+@dataclass
+class MaskedText:
+    """Source text with protected spans replaced by placeholders."""
+
+    text: str
+    original: str
+    placeholders: Dict[int, str] = field(default_factory=dict)
+
+    def restore(self, translated: str) -> Tuple[str, List[int]]:
+        """
+        Put the protected spans back into a translation.
+
+        Args:
+            translated: Model output containing placeholders
+
+        Returns:
+            The restored text and the placeholder numbers missing from the output
+        """
+        seen = set()
+
+        def replace(match: "re.Match") -> str:
+            index = int(match.group(1))
+            if index not in self.placeholders:
+                return match.group(0)
+            seen.add(index)
+            return self.placeholders[index]
+
+        restored = _PLACEHOLDER_PATTERN.sub(replace, translated)
+        return restored, [i for i in self.placeholders if i not in seen]
+
+
+class StreamingRestorer:
+    """Restores placeholders in streamed chunks, holding back text that may be a split placeholder."""
+
+    def __init__(self, masked: MaskedText):
+        self.masked = masked
+        self._pending = ""
+        self.seen = set()
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk and return the text that is safe to emit."""
+        text = self._pending + chunk
+        cut = text.rfind("{")
+        if cut != -1 and "}}" not in text[cut:] and len(text) - cut < 12:
+            # Step back over a preceding "{" so "{{" is kept together
+            if cut > 0 and text[cut - 1] == "{":
+                cut -= 1
+            self._pending, text = text[cut:], text[:cut]
+        else:
+            self._pending = ""
+        return self._restore(text)
+
+    def flush(self) -> str:
+        """Return whatever is still held back."""
+        text, self._pending = self._pending, ""
+        return self._restore(text)
+
+    def _restore(self, text: str) -> str:
+        for match in _PLACEHOLDER_PATTERN.finditer(text):
+            self.seen.add(int(match.group(1)))
+        restored, _ = self.masked.restore(text)
+        return restored
+
+
+@dataclass
+class GlossaryReport:
+    """Outcome of glossary verification for one translation."""
+
+    text: str
+    repairs: List[str] = field(default_factory=list)
+    issues: List[str] = field(default_factory=list)
+
+
+class GlossaryEngine:
+    """
+    Compiled glossary for masking source text and verifying translations.
+
+    Args:
+        terminology: Cricket terminology keyed by language, then by term key
+        player_names: Names to protect from translation in addition to ball-by-ball bowler/batsman names
+    """
+
+    def __init__(self, terminology: Mapping[str, Mapping[str, str]], player_names: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self.terminology = terminology
+        surface_forms = {}
+        for key, forms in TERM_SURFACE_FORMS.items():
+            for form in forms:
+                surface_forms[form] = key
+        # Keys without a listed surface form match on their own spelling
+        for terms in terminology.values():
+            for key in terms:
+                surface_forms.setdefault(key.replace("_", " "), key)
+        self.source_matcher = AhoCorasick(surface_forms)
+        self._player_names: set = set()
+        self._name_pattern: Optional["re.Pattern"] = None
+        self.register_player_names(player_names)
+
+    def register_player_names(self, names: Iterable[str]) -> None:
+        """
+        Add player names that must be passed through untranslated.
+
+        Args:
+            names: Player names as they appear in the source text
+        """
+        with self._lock:
+            self._player_names.update(n.strip() for n in names if n and n.strip())
+            if self._player_names:
+                alternatives = "|".join(re.escape(n) for n in sorted(self._player_names, key=len, reverse=True))
+                self._name_pattern = re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+    def mask(self, text: str, mask_names: bool = True) -> MaskedText:
+        """
+        Replace numbers, scores and player names with numbered placeholders.
+
+        Args:
+            text: The source text
+            mask_names: Also protect player names
+
+        Returns:
+            The MaskedText, whose restore() puts the spans back
+        """
+        spans: List[Tuple[int, int]] = [m.span() for m in _NUMBER_PATTERN.finditer(text)]
+        if mask_names:
+            match = _BALL_BY_BALL_PATTERN.match(text)
+            if match:
+                spans.extend([match.span(1), match.span(2)])
+            if self._name_pattern is not None:
+                spans.extend(m.span() for m in self._name_pattern.finditer(text))
+        if not spans:
+            return MaskedText(text=text, original=text)
+
+        # Keep the earliest, longest span where spans overlap
+        spans.sort(key=lambda s: (s[0], -(s[1] - s[0])))
+        pieces, placeholders, position = [], {}, 0
+        values: Dict[str, int] = {}
+        for start, end in spans:
+            if start < position:
+                continue
+            value = text[start:end]
+            index = values.get(value)
+            if index is None:
+                index = len(placeholders) + 1
+                values[value] = index
+                placeholders[index] = value
+            pieces.append(text[position:start])
+            pieces.append(PLACEHOLDER.format(index=index))
+            position = end
+        pieces.append(text[position:])
+        return MaskedText(text="".join(pieces), original=text, placeholders=placeholders)
+
+    def source_terms(self, text: str) -> Dict[str, str]:
+        """
+        Find the glossary terms used in source text.
+
+        Args:
+            text: The English source text
+
+        Returns:
+            Matched surface form keyed by glossary key
+        """
+        found = {}
+        lowered = text.lower()
+        for start, end, key in self.source_matcher.find(lowered, whole_words=True):
+            surface = text[start:end]
+            context = _TERM_CONTEXT.get(surface.lower())
+            if context is not None and not context.search(text[max(0, start - 16):start]):
+                continue
+            found.setdefault(key, surface)
+        return found
+
+    def enforce(self, source: str, translated: str, target_language: str) -> GlossaryReport:
+        """
+        Check that glossary terms in the source are rendered with the language's terms.
+
+        English terms left in the output are replaced with the glossary term when it
+        has a single form; anything else missing is reported as an issue.
+
+        Args:
+            source: The English source text
+            translated: The translated text, placeholders already restored
+            target_language: The target language
+
+        Returns:
+            A GlossaryReport with the (possibly repaired) text
+        """
+        terms = self.terminology.get(target_language, {})
+        report = GlossaryReport(text=translated)
+        if not terms:
+            return report
+        for key, surface in self.source_terms(source).items():
+            target = terms.get(key)
+            if not target:
+                continue
+            alternatives = [t for t in target.split("/") if t]
+            if any(t in report.text for t in alternatives):
+                continue
+            pattern = re.compile(
+                "(?<![A-Za-z])(?:" + "|".join(re.escape(f) for f in TERM_SURFACE_FORMS.get(key, (surface,))) + ")(?![A-Za-z])",
+                re.IGNORECASE,
+            )
+            if len(alternatives) == 1 and pattern.search(report.text):
+                report.text = pattern.sub(alternatives[0], report.text)
+                report.repairs.append(key)
+            else:
+                report.issues.append(f"missing glossary term '{key}' ({target})")
+        return report
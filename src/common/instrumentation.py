@@ -0,0 +1,159 @@
+"""
+Timing spans, request labels and an optional per-request profiler.
+
+span() times one stage of the translation hot path (prompt building, cache
+lookup, queueing, the model call, glossary work, serialization) into the
+stage_duration_ms histogram. request_context() attaches labels such as the
+language and model to everything recorded while it is active. The labels
+and spans also reach the model worker threads, because MODEL_EXECUTOR runs
+calls in a copy of the caller's context.
+
+profile_request() wraps one request in cProfile, or in pyinstrument when it
+is installed and selected with CRICKET_PROFILER=pyinstrument. It only runs
+when profiling was enabled at startup (CRICKET_PROFILING=1 or the server's
+--enable-profiling flag).
+"""
+
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from common.metrics import METRICS
+
+logger = logging.getLogger("cricket-translation")
+
+PROFILING_ENABLED = os.environ.get("CRICKET_PROFILING", "0") == "1"
+PROFILER = os.environ.get("CRICKET_PROFILER", "cprofile")
+
+# Labels of the request being served, e.g. {"language": "Tamil", "model": "..."}
+_REQUEST_LABELS: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("request_labels", default={})
+# Spans of the request being served, when someone asked to collect them
+_SPANS: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("spans", default=None)
+
+# cProfile can only have one profiler active per process at a time
+_PROFILE_LOCK = threading.Lock()
+
+
+def request_labels() -> Dict[str, str]:
+    """Get the labels of the request being served."""
+    return _REQUEST_LABELS.get()
+
+
+@contextmanager
+def request_context(**labels: str) -> Iterator[Dict[str, str]]:
+    """
+    Attach labels to all metrics recorded while the block runs.
+
+    Args:
+        **labels: Labels to add to those of any enclosing request context
+
+    Yields:
+        The combined labels
+    """
+    combined = dict(_REQUEST_LABELS.get(), **labels)
+    token = _REQUEST_LABELS.set(combined)
+    try:
+        yield combined
+    finally:
+        _REQUEST_LABELS.reset(token)
+
+
+@contextmanager
+def span(stage: str, **labels: str) -> Iterator[None]:
+    """
+    Time one stage of the hot path into the stage_duration_ms histogram.
+
+    Args:
+        stage: The stage name, e.g. "prompt_build" or "model"
+        **labels: Labels beyond the request labels, e.g. the tool name
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        all_labels = dict(_REQUEST_LABELS.get(), stage=stage, **labels)
+        METRICS.histogram("stage_duration_ms", elapsed_ms, all_labels)
+        spans = _SPANS.get()
+        if spans is not None:
+            spans.append({"stage": stage, "ms": round(elapsed_ms, 3), **labels})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({"span": stage, "ms": round(elapsed_ms, 3), **all_labels}, ensure_ascii=False))
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect the spans recorded while the block runs, in completion order.
+
+    Yields:
+        The list the spans are appended to
+    """
+    spans: List[Dict[str, Any]] = []
+    token = _SPANS.set(spans)
+    try:
+        yield spans
+    finally:
+        _SPANS.reset(token)
+
+
+@contextmanager
+def profile_request(enabled: bool, limit: int = 25) -> Iterator[Dict[str, Any]]:
+    """
+    Profile the block when asked to and profiling is enabled for the process.
+
+    cProfile only sees the thread that enabled it (the event loop), and other
+    requests served concurrently on that loop show up in the profile too.
+    pyinstrument in async mode follows just this request across awaits.
+
+    Args:
+        enabled: Whether this request asked to be profiled
+        limit: Number of functions to include in the cProfile report
+
+    Yields:
+        A dictionary that holds the "profile" report text once the block exits
+    """
+    result: Dict[str, Any] = {}
+    if not enabled or not PROFILING_ENABLED:
+        yield result
+        return
+
+    if PROFILER == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("pyinstrument is not installed, falling back to cProfile")
+        else:
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            try:
+                yield result
+            finally:
+                profiler.stop()
+                result["profile"] = profiler.output_text()
+            return
+
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        result["profile"] = "Profiler busy with another request, try again"
+        yield result
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(limit)
+        result["profile"] = output.getvalue()
+    finally:
+        _PROFILE_LOCK.release()
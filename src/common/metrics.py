@@ -0,0 +1,203 @@
+"""
+Lightweight in-process metrics for the cricket translation services.
+
+Counters, value summaries and latency histograms are kept in memory. They can
+be read back as a plain dictionary, which the MCP server exposes through its
+stats tool, or rendered in the Prometheus text format for its /metrics route.
+
+Every metric can carry labels (e.g. language and model); labelled series are
+keyed as name{label="value"} in snapshots.
+"""
+
+import bisect
+import re
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+# Upper bounds in milliseconds, from cache hits to slow model calls
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def series_key(name: str, labels: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Build the snapshot key for a metric series.
+
+    Args:
+        name: The metric name
+        labels: The series labels
+
+    Returns:
+        name, or name{label="value",...} when labels are given
+    """
+    if not labels:
+        return name
+    rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _split_key(key: str) -> (str, str):
+    """Split a series key into its metric name and label block (with braces, or empty)."""
+    brace = key.find("{")
+    return (key, "") if brace == -1 else (key[:brace], key[brace:])
+
+
+def _by_series(item: Any) -> (str, str):
+    # Keeps every series of a metric together, which the text format requires
+    return _split_key(item[0])
+
+
+def _with_label(labels: str, extra: str) -> str:
+    return "{" + (labels[1:-1] + "," if labels else "") + extra + "}"
+
+
+class Metrics:
+    """Thread-safe counters, value summaries (count, sum, min, max, last) and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._summaries: Dict[str, Dict[str, float]] = {}
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: The counter name
+            value: The amount to add
+            labels: Optional labels, e.g. {"language": "Tamil"}
+        """
+        key = series_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Record one observation of a value, e.g. the prompt size of a call.
+
+        Args:
+            name: The summary name
+            value: The observed value
+            labels: Optional labels, e.g. {"model": model_id}
+        """
+        key = series_key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = {"count": 1, "sum": value, "min": value, "max": value, "last": value}
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def histogram(self, name: str, value: float, labels: Optional[Mapping[str, Any]] = None,
+                  buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        """
+        Record a value into a histogram, e.g. the duration of a pipeline stage.
+
+        Args:
+            name: The histogram name
+            value: The observed value
+            labels: Optional labels, e.g. {"stage": "model"}
+            buckets: Bucket upper bounds, used when the series is first created
+        """
+        key = series_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = {"bounds": tuple(buckets), "counts": [0] * (len(buckets) + 1), "count": 0, "sum": 0.0}
+                self._histograms[key] = histogram
+            histogram["counts"][bisect.bisect_left(histogram["bounds"], value)] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of all counters, summaries and histograms.
+
+        Returns:
+            A dictionary with "counters", "summaries" and "histograms" keys
+        """
+        with self._lock:
+            summaries = {}
+            for name, summary in self._summaries.items():
+                summaries[name] = dict(summary, avg=summary["sum"] / summary["count"])
+            histograms = {}
+            for name, histogram in self._histograms.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(list(histogram["bounds"]) + ["+Inf"], histogram["counts"]):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                histograms[name] = {"buckets": buckets, "count": histogram["count"], "sum": histogram["sum"]}
+            return {"counters": dict(self._counters), "summaries": summaries, "histograms": histograms}
+
+    def render_prometheus(self, prefix: str = "cricket_",
+                          gauges: Optional[Mapping[str, float]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Counters become <name>_total, summaries become <name>_count/_sum and
+        histograms get the usual _bucket/_count/_sum series.
+
+        Args:
+            prefix: Prefix added to every metric name
+            gauges: Extra point-in-time values to include, keyed like snapshot series
+
+        Returns:
+            The exposition text
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        typed = set()
+
+        def emit(metric_type: str, name: str, series: str, value: float) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{series} {value:g}")
+
+        def metric_name(key: str, suffix: str = "") -> (str, str):
+            name, labels = _split_key(key)
+            return prefix + _INVALID_NAME_CHARS.sub("_", name) + suffix, labels
+
+        for key, value in sorted(snapshot["counters"].items(), key=_by_series):
+            name, labels = metric_name(key, "_total")
+            emit("counter", name, name + labels, value)
+        for key, summary in sorted(snapshot["summaries"].items(), key=_by_series):
+            name, labels = metric_name(key)
+            emit("summary", name, f"{name}_count{labels}", summary["count"])
+            lines.append(f"{name}_sum{labels} {summary['sum']:g}")
+        for key, histogram in sorted(snapshot["histograms"].items(), key=_by_series):
+            name, labels = metric_name(key)
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            for bound, count in histogram["buckets"].items():
+                bucket_labels = _with_label(labels, 'le="' + bound + '"')
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            lines.append(f"{name}_count{labels} {histogram['count']}")
+            lines.append(f"{name}_sum{labels} {histogram['sum']:g}")
+        for key, value in sorted((gauges or {}).items(), key=_by_series):
+            name, labels = metric_name(key)
+            emit("gauge", name, name + labels, value)
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear all counters, summaries and histograms."""
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+            self._histograms.clear()
+
+
+# Shared registry used across the common module, the MCP server and the agent
+METRICS = Metrics()
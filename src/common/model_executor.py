@@ -0,0 +1,349 @@
+"""
+Off-loop execution of blocking model calls.
+
+Model SDK calls (strands Agent / Bedrock) are synchronous. Running them directly
+inside a coroutine stalls the event loop, so every other request served by the
+same process waits for the slowest Bedrock round trip. This module runs those
+calls on a shared thread pool, limits how many calls may run at once for each
+model ID and rejects new work with ModelBusyError once a model's queue is full.
+
+Every call also goes through the model's rate limiter and circuit breaker and
+is retried on throttling and transient errors (see common.resilience).
+Server workers started with a shared rate budget pace their calls against
+one bucket per model ID (see share_rate_limits).
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from common.instrumentation import span
+from common.metrics import METRICS
+from common.resilience import (
+    DEFAULT_BREAKER_FAILURES,
+    DEFAULT_BREAKER_RESET,
+    DEFAULT_RATE,
+    DEFAULT_RATE_BUDGET_PATH,
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    ModelUnavailableError,
+    RetryPolicy,
+    SharedRateBudget,
+    SharedRateLimiter,
+    is_throttling_error,
+    is_transient_error,
+)
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("CRICKET_MODEL_CONCURRENCY", "4"))
+DEFAULT_MAX_QUEUE_DEPTH = int(os.environ.get("CRICKET_MODEL_QUEUE_DEPTH", "32"))
+DEFAULT_MAX_WORKERS = int(os.environ.get("CRICKET_MODEL_WORKERS", "32"))
+
+logger = logging.getLogger("cricket-translation")
+
+
+class ModelBusyError(RuntimeError):
+    """Raised when a model already has the maximum number of queued calls."""
+
+    def __init__(self, model_id: str, max_queue_depth: int):
+        super().__init__(
+            f"Translation service is busy for model {model_id} "
+            f"({max_queue_depth} requests already queued), please retry shortly"
+        )
+        self.model_id = model_id
+        self.max_queue_depth = max_queue_depth
+
+
+@dataclass
+class ModelLimit:
+    """Concurrency and queue limits for a single model ID."""
+
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH
+    explicit: bool = False
+    running: int = 0
+    waiting: int = 0
+    limiter: AdaptiveRateLimiter = field(default_factory=AdaptiveRateLimiter, repr=False)
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker, repr=False)
+    semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+    loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
+
+
+class ModelExecutor:
+    """
+    Runs blocking model calls off the event loop with per-model backpressure.
+
+    Each model ID gets at most ``max_concurrency`` calls running on the thread
+    pool and at most ``max_queue_depth`` calls waiting for a slot. Any call
+    beyond that fails immediately with ModelBusyError instead of piling up.
+    A call whose caller is cancelled keeps its slot until the worker thread
+    returns, since the model is still being called.
+    Calls start no faster than the model's adaptive rate limit allow, are
+    retried per ``retry_policy``, and fail fast with ModelUnavailableError
+    while the model's circuit breaker is open.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.retry_policy = RetryPolicy()
+        self.max_rate = DEFAULT_RATE
+        self.breaker_failures = DEFAULT_BREAKER_FAILURES
+        self.breaker_reset = DEFAULT_BREAKER_RESET
+        self.rate_budget: Optional[SharedRateBudget] = (
+            SharedRateBudget(DEFAULT_RATE_BUDGET_PATH) if DEFAULT_RATE_BUDGET_PATH else None
+        )
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[str, ModelLimit] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, model_id: Optional[str] = None, max_concurrency: Optional[int] = None,
+                  max_queue_depth: Optional[int] = None, max_rate: Optional[float] = None) -> None:
+        """
+        Set the limits for a model ID, or the defaults for all models when model_id is None.
+
+        Args:
+            model_id: The model ID to configure, or None to change the defaults
+            max_concurrency: Maximum number of calls running at once
+            max_queue_depth: Maximum number of calls waiting for a free slot
+            max_rate: Maximum calls started per second, 0 for no rate limit
+        """
+        global DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_QUEUE_DEPTH
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue_depth is not None and max_queue_depth < 0:
+            raise ValueError("max_queue_depth cannot be negative")
+
+        with self._lock:
+            if model_id is None:
+                if max_concurrency is not None:
+                    DEFAULT_MAX_CONCURRENCY = max_concurrency
+                if max_queue_depth is not None:
+                    DEFAULT_MAX_QUEUE_DEPTH = max_queue_depth
+                if max_rate is not None:
+                    self.max_rate = max_rate
+                # Models without their own limits follow the new defaults
+                for limit in self._limits.values():
+                    if not limit.explicit:
+                        limit.max_concurrency = DEFAULT_MAX_CONCURRENCY
+                        limit.max_queue_depth = DEFAULT_MAX_QUEUE_DEPTH
+                        limit.limiter.configure(max_rate=self.max_rate)
+                        limit.semaphore = None
+                return
+
+            limit = self._limits.get(model_id) or self._new_limit(model_id)
+            limit.explicit = True
+            if max_rate is not None:
+                limit.limiter.configure(max_rate=max_rate)
+            if max_concurrency is not None:
+                limit.max_concurrency = max_concurrency
+                # Semaphore is rebuilt with the new size on next use
+                limit.semaphore = None
+            if max_queue_depth is not None:
+                limit.max_queue_depth = max_queue_depth
+            self._limits[model_id] = limit
+
+    def share_rate_limits(self, path: Optional[str]) -> None:
+        """
+        Pace calls against a rate budget shared with other processes, or stop sharing it.
+
+        Every process started with the same file draws on one token bucket per
+        model ID, so N server workers together stay within the rate one
+        process would use.
+
+        Args:
+            path: SQLite file holding the shared budget, or None for a budget of this process only
+        """
+        with self._lock:
+            if self.rate_budget is not None:
+                if self.rate_budget.path == path:
+                    return
+                self.rate_budget.close()
+            self.rate_budget = SharedRateBudget(path) if path else None
+            for model_id, limit in self._limits.items():
+                limit.limiter = self._new_limiter(model_id, limit.limiter.max_rate)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a snapshot of the running and waiting calls, rate limit and circuit state for each model ID.
+
+        Returns:
+            A dictionary keyed by model ID
+        """
+        return {
+            model_id: {
+                "running": limit.running,
+                "waiting": limit.waiting,
+                "max_concurrency": limit.max_concurrency,
+                "max_queue_depth": limit.max_queue_depth,
+                "rate_limiter": limit.limiter.stats(),
+                "circuit_breaker": limit.breaker.stats(),
+            }
+            for model_id, limit in self._limits.items()
+        }
+
+    def _new_limiter(self, model_id: str, max_rate: float) -> AdaptiveRateLimiter:
+        if self.rate_budget is not None:
+            return SharedRateLimiter(model_id, self.rate_budget, max_rate=max_rate)
+        return AdaptiveRateLimiter(max_rate=max_rate)
+
+    def _new_limit(self, model_id: str) -> ModelLimit:
+        return ModelLimit(
+            max_concurrency=DEFAULT_MAX_CONCURRENCY,
+            max_queue_depth=DEFAULT_MAX_QUEUE_DEPTH,
+            limiter=self._new_limiter(model_id, self.max_rate),
+            breaker=CircuitBreaker(failure_threshold=self.breaker_failures, reset_timeout=self.breaker_reset),
+        )
+
+    def _limit_for(self, model_id: str) -> ModelLimit:
+        limit = self._limits.get(model_id)
+        if limit is None:
+            limit = self._new_limit(model_id)
+            self._limits[model_id] = limit
+
+        # Semaphores belong to a single event loop; standalone mode and
+        # benchmarks may call asyncio.run() more than once per process
+        loop = asyncio.get_running_loop()
+        if limit.semaphore is None or limit.loop is not loop:
+            limit.semaphore = asyncio.Semaphore(limit.max_concurrency)
+            limit.loop = loop
+        return limit
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="cricket-model",
+                    )
+        return self._executor
+
+    async def run(self, model_id: str, func: Callable[..., Any], *args: Any,
+                  can_retry: Optional[Callable[[], bool]] = None, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the worker pool under the model's limits, retrying transient failures.
+
+        Args:
+            model_id: The model ID the call is made against
+            func: The blocking callable to run
+            *args: Positional arguments for func
+            can_retry: Checked before each retry; return False to give up, e.g. once
+                output has already been streamed to the caller
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            ModelBusyError: If the model's queue is already full
+            ModelUnavailableError: If the model's circuit breaker is open
+            Exception: Whatever func raised on its last attempt
+        """
+        limit = self._limit_for(model_id)
+        labels = {"model": model_id}
+        attempt = 0
+        while True:
+            # Checked again right before the call, for requests that queued while it opened
+            limit.breaker.reject_if_open(model_id)
+            try:
+                result = await self._run_once(limit, model_id, func, args, kwargs)
+            except (ModelUnavailableError, ModelBusyError):
+                # Rejected before the model was called, so no verdict on its health
+                raise
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                if throttled:
+                    # The model is healthy but saturated: slow down instead of tripping the breaker
+                    limit.limiter.on_throttle()
+                    METRICS.increment("model_throttled", labels=labels)
+                elif limit.breaker.on_failure():
+                    METRICS.increment("circuit_breaker_opened", labels=labels)
+                    logger.warning(f"Circuit breaker opened for model {model_id} after repeated failures")
+                if (not is_transient_error(e) or attempt >= self.retry_policy.retries
+                        or (can_retry is not None and not can_retry())):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                attempt += 1
+                METRICS.increment("model_retries", labels=dict(labels, reason="throttled" if throttled else "transient"))
+                logger.warning(f"Model {model_id} call failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            limit.breaker.on_success()
+            limit.limiter.on_success()
+            return result
+
+    async def _run_once(self, limit: ModelLimit, model_id: str, func: Callable[..., Any],
+                        args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        # Hold on to this semaphore even if the limit is reconfigured mid-call
+        semaphore = limit.semaphore
+        if semaphore.locked() and limit.waiting >= limit.max_queue_depth:
+            raise ModelBusyError(model_id, limit.max_queue_depth)
+
+        limit.waiting += 1
+        try:
+            with span("queue_wait", model=model_id):
+                await semaphore.acquire()
+                try:
+                    # Paced after taking a slot, so the limiter sees the rate calls really start at
+                    await limit.limiter.acquire(check=lambda: limit.breaker.reject_if_open(model_id))
+                    probe = limit.breaker.before_call(model_id)
+                except BaseException:
+                    semaphore.release()
+                    raise
+        finally:
+            limit.waiting -= 1
+
+        limit.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Run in a copy of the caller's context so request labels and spans reach the worker
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(
+                self._get_executor(), functools.partial(context.run, func, *args, **kwargs)
+            )
+        except BaseException:
+            limit.running -= 1
+            semaphore.release()
+            raise
+
+        abandoned = False
+
+        def release(done: asyncio.Future) -> None:
+            # The slot is held until the worker thread returns, even when the caller stopped waiting
+            limit.running -= 1
+            semaphore.release()
+            if not done.cancelled():
+                done.exception()
+            if probe and abandoned:
+                limit.breaker.on_abandoned()
+
+        future.add_done_callback(release)
+        try:
+            with span("model", model=model_id):
+                return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # A cancelled probe gives no verdict; it frees the probe once its thread returns
+            if probe:
+                if future.done():
+                    limit.breaker.on_abandoned()
+                else:
+                    abandoned = True
+            raise
+        except Exception as e:
+            # Throttling says nothing about the model's health either
+            if probe and is_throttling_error(e):
+                limit.breaker.on_abandoned()
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool. A new pool is created on next use."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -0,0 +1,304 @@
+"""
+Model tiering and hedged requests.
+
+Every translation used to go to one model. ModelRouter picks the model and
+guards its tail latency:
+
+- tiering: with model_id "auto", short commentary lines go to a fast, cheap
+  model and long articles to a stronger one, by estimated token count
+  (CRICKET_MODEL_TIERS, e.g. "60=us.amazon.nova-micro-v1:0,us.amazon.nova-lite-v1:0")
+- latency tracking: a moving window of recent call latencies per model, with
+  an exponentially weighted mean and quantiles
+- hedging: when a hedge model is set (CRICKET_HEDGE_MODEL) and the primary
+  has not answered within its p95 latency, or has failed, the same request
+  goes to the hedge model as well and the first answer wins. At most
+  CRICKET_HEDGE_BUDGET of the calls in flight are hedged at once, so a
+  slowdown does not double the load on both models
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from common.metrics import METRICS
+from common.prompt_templates import estimate_tokens
+
+T = TypeVar("T")
+
+# model_id value that asks the router to pick the model
+AUTO_MODEL = "auto"
+DEFAULT_MODEL_ID = os.environ.get("CRICKET_MODEL_ID", "us.amazon.nova-lite-v1:0")
+
+DEFAULT_TIERS = os.environ.get("CRICKET_MODEL_TIERS", "")
+DEFAULT_HEDGE_MODEL = os.environ.get("CRICKET_HEDGE_MODEL", "")
+DEFAULT_HEDGE_QUANTILE = float(os.environ.get("CRICKET_HEDGE_QUANTILE", "0.95"))
+# Used until a model has enough latency samples for a meaningful quantile
+DEFAULT_HEDGE_DELAY = float(os.environ.get("CRICKET_HEDGE_DELAY", "2.0"))
+# Share of the calls in flight that may be hedged at once; one hedge is always allowed
+DEFAULT_HEDGE_BUDGET = float(os.environ.get("CRICKET_HEDGE_BUDGET", "0.1"))
+DEFAULT_LATENCY_WINDOW = int(os.environ.get("CRICKET_LATENCY_WINDOW", "200"))
+
+MIN_SAMPLES = 20
+
+
+def parse_tiers(spec: str) -> List[Tuple[Optional[int], str]]:
+    """
+    Parse a model tier specification.
+
+    Args:
+        spec: Comma-separated "max_tokens=model_id" entries from smallest to
+            largest; the last entry may be a bare model ID that takes everything longer
+
+    Returns:
+        List of (max_tokens, model_id), max_tokens None for the catch-all tier
+
+    Raises:
+        ValueError: If a threshold is not a positive integer or thresholds are not increasing
+    """
+    tiers: List[Tuple[Optional[int], str]] = []
+    for entry in (part.strip() for part in spec.split(",")):
+        if not entry:
+            continue
+        if "=" in entry:
+            threshold, model_id = (value.strip() for value in entry.split("=", 1))
+            if not threshold.isdigit() or int(threshold) <= 0:
+                raise ValueError(f"Model tier threshold must be a positive number of tokens: {entry}")
+            max_tokens: Optional[int] = int(threshold)
+        else:
+            max_tokens, model_id = None, entry
+        if tiers and (tiers[-1][0] is None or (max_tokens is not None and max_tokens <= tiers[-1][0])):
+            raise ValueError(f"Model tiers must be listed by increasing threshold, with the catch-all last: {spec}")
+        tiers.append((max_tokens, model_id))
+    return tiers
+
+
+class LatencyTracker:
+    """Moving latency estimate for one model: recent samples plus an exponentially weighted mean."""
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW, alpha: float = 0.1):
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.ewma = seconds if self.ewma is None else self.ewma + self.alpha * (seconds - self.ewma)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Get a latency quantile over the window.
+
+        Args:
+            q: The quantile, between 0 and 1
+
+        Returns:
+            Seconds, or None before the first sample
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "samples": len(self),
+            "ewma_ms": round(self.ewma * 1000, 2) if self.ewma is not None else None,
+            "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+        }
+
+
+def _consume(task: asyncio.Future) -> None:
+    # A losing call that failed after the race was decided is not an error worth logging
+    if not task.cancelled():
+        task.exception()
+
+
+class ModelRouter:
+    """Picks a model per request and hedges slow calls to a second model."""
+
+    def __init__(self, tiers: str = DEFAULT_TIERS, hedge_model: str = DEFAULT_HEDGE_MODEL,
+                 hedge_quantile: float = DEFAULT_HEDGE_QUANTILE, hedge_delay: float = DEFAULT_HEDGE_DELAY,
+                 hedge_budget: float = DEFAULT_HEDGE_BUDGET, default_model: str = DEFAULT_MODEL_ID):
+        self.tiers = parse_tiers(tiers)
+        self.hedge_model = hedge_model or None
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.hedge_budget = hedge_budget
+        self.default_model = default_model
+        self.in_flight = 0
+        self.hedges_in_flight = 0
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, tiers: Optional[str] = None, hedge_model: Optional[str] = None,
+                  hedge_quantile: Optional[float] = None, hedge_delay: Optional[float] = None,
+                  hedge_budget: Optional[float] = None) -> None:
+        """
+        Change routing and hedging. Arguments left as None keep their current value.
+
+        Args:
+            tiers: Model tier specification (see parse_tiers), "" to turn tiering off
+            hedge_model: Model that slow calls are hedged to, "" to turn hedging off
+            hedge_quantile: Latency quantile of the primary after which a hedge is sent
+            hedge_delay: Seconds to wait before hedging while a model has too few latency samples
+            hedge_budget: Share of the calls in flight that may be hedged at once
+        """
+        if tiers is not None:
+            self.tiers = parse_tiers(tiers)
+        if hedge_model is not None:
+            self.hedge_model = hedge_model or None
+        if hedge_quantile is not None:
+            self.hedge_quantile = hedge_quantile
+        if hedge_delay is not None:
+            self.hedge_delay = hedge_delay
+        if hedge_budget is not None:
+            self.hedge_budget = hedge_budget
+
+    def route(self, model_id: Optional[str], input_text: Optional[str] = None) -> str:
+        """
+        Resolve the model for a request.
+
+        Args:
+            model_id: The requested model ID; AUTO_MODEL or None picks one by tier
+            input_text: The text to translate, or None for input of unknown length
+                such as a streamed file, which goes to the largest tier
+
+        Returns:
+            The model ID to call
+        """
+        if model_id and model_id != AUTO_MODEL:
+            return model_id
+        if not self.tiers:
+            return self.default_model
+        chosen = self.tiers[-1][1]
+        if input_text is not None:
+            tokens = estimate_tokens(input_text)
+            for max_tokens, tier_model in self.tiers:
+                if max_tokens is None or tokens <= max_tokens:
+                    chosen = tier_model
+                    break
+        METRICS.increment("routed_requests", labels={"model": chosen})
+        return chosen
+
+    def models(self) -> List[str]:
+        """The model IDs that model_id "auto" and hedging can call, fastest tier first."""
+        models = [model for _, model in self.tiers] or [self.default_model]
+        if self.hedge_model:
+            models.append(self.hedge_model)
+        return list(dict.fromkeys(models))
+
+    def latency(self, model_id: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._latency.get(model_id)
+            if tracker is None:
+                tracker = self._latency[model_id] = LatencyTracker()
+            return tracker
+
+    def hedge_after(self, model_id: str) -> float:
+        """Seconds to give a model before hedging: its latency quantile once it has enough samples."""
+        tracker = self.latency(model_id)
+        if len(tracker) < MIN_SAMPLES:
+            return self.hedge_delay
+        return tracker.quantile(self.hedge_quantile)
+
+    def _may_hedge(self) -> bool:
+        # Calls only stall together when a model slows down, which is when hedging them all would hurt most
+        return self.hedges_in_flight < max(1.0, self.hedge_budget * self.in_flight)
+
+    async def _timed(self, model_id: str, call: Callable[[str], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await call(model_id)
+        except asyncio.CancelledError:
+            # A call hedged away was at least this slow; leaving it out would drag the estimate down
+            self.latency(model_id).observe(time.perf_counter() - started)
+            raise
+        self.latency(model_id).observe(time.perf_counter() - started)
+        return result
+
+    async def run(self, model_id: str, call: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Make a model call, hedging it to the hedge model when the primary is slow or fails.
+
+        Args:
+            model_id: The primary model ID
+            call: Makes the call for a given model ID and returns its result
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Whatever the primary call raised, when no call succeeded
+        """
+        backup = self.hedge_model
+        if backup is None or backup == model_id:
+            return await self._timed(model_id, call)
+
+        primary = asyncio.ensure_future(self._timed(model_id, call))
+        primary.add_done_callback(_consume)
+        tasks = [primary]
+        hedging = False
+        self.in_flight += 1
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after(model_id))
+            if primary in done and primary.exception() is None:
+                return primary.result()
+            if not self._may_hedge():
+                METRICS.increment("hedges_skipped", labels={"model": model_id})
+                return await primary
+
+            METRICS.increment("hedged_requests", labels={"model": model_id, "reason": "failed" if done else "slow"})
+            hedging = True
+            self.hedges_in_flight += 1
+            hedge = asyncio.ensure_future(self._timed(backup, call))
+            hedge.add_done_callback(_consume)
+            tasks.append(hedge)
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            METRICS.increment("hedge_wins", labels={"model": backup})
+                        return task.result()
+            # Neither answered: report the primary's error, as an unhedged call would
+            return primary.result()
+        finally:
+            self.in_flight -= 1
+            if hedging:
+                self.hedges_in_flight -= 1
+            # The loser's worker thread finishes in the background, holding its model's slot; its answer is discarded
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the routing configuration and the latency estimate of every model called.
+
+        Returns:
+            A dictionary of router statistics
+        """
+        with self._lock:
+            trackers = dict(self._latency)
+        return {
+            "default_model": self.default_model,
+            "tiers": [{"max_tokens": max_tokens, "model": model_id} for max_tokens, model_id in self.tiers],
+            "hedge_model": self.hedge_model,
+            "hedge_quantile": self.hedge_quantile,
+            "hedge_budget": self.hedge_budget,
+            "in_flight": self.in_flight,
+            "hedges_in_flight": self.hedges_in_flight,
+            "latency": {model_id: tracker.stats() for model_id, tracker in trackers.items()},
+        }
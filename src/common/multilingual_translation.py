@@ -0,0 +1,306 @@
+"""
+Translation of one cricket text into several languages with a single model call.
+
+Publishing a line in all seven languages through translate_cricket_text sends
+seven prompts, each repeating the role, the guidelines and the source text.
+This module sends one prompt instead: the guidelines once, the terminology of
+every requested language once, and the source text once, and asks for a JSON
+object keyed by language.
+
+Each language in the answer is validated on its own (non-empty, written in the
+language's script, every glossary placeholder kept). Languages that fail fall
+back to an individual translate_cricket_text call; the others are kept.
+Formulaic and cached lines, and near-duplicates of approved translations, are
+served without a model call, as elsewhere.
+"""
+
+import asyncio
+import functools
+import json
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from common.cricket_translation import (
+    MODEL_ROUTER,
+    TERMINOLOGY,
+    TRANSLATION_CACHE,
+    TranslationError,
+    _apply_glossary,
+    _call_model,
+    _fast_path,
+    _mask_source,
+    _translation_memory,
+    logger,
+    translate_cricket_text,
+    validate_language,
+)
+from common.instrumentation import request_context, span
+from common.metrics import METRICS
+from common.model_executor import ModelBusyError
+from common.resilience import ModelUnavailableError
+from common.prompt_templates import (
+    PLACEHOLDER_INSTRUCTION,
+    SOURCE_TEXT_HEADING,
+    render_multilingual_guidelines,
+)
+from common.terminology import Terminology
+from common.translation_cache import make_cache_key
+
+LANGUAGE_KEYS_HEADING = "**Answer with a JSON object with exactly these keys:**"
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@functools.lru_cache(maxsize=None)
+def _multilingual_prompt_prefix(terminology: Terminology, target_languages: Tuple[str, ...]) -> str:
+    """Static part of the fan-out prompt for a set of languages, rendered once per set and terminology version."""
+    languages = ", ".join(target_languages)
+    example = json.dumps({language: "..." for language in target_languages}, ensure_ascii=False)
+    return f"""You are a professional cricket translator specializing in Indian regional languages. Translate the cricket text given by the user into each of the target languages accurately while maintaining proper cricket terminology and cultural context.
+
+**Target Languages:** {languages}
+
+{render_multilingual_guidelines({language: terminology.terms.get(language, {}) for language in target_languages})}
+
+**Output Format:**
+Answer with a single JSON object and nothing else, for example {example}. Each value is the complete translation in that language's script, with proper formatting. Maintain the structure and flow of the original text while ensuring cultural and linguistic appropriateness. Do not translate one language from another; translate each from the source text.
+{PLACEHOLDER_INSTRUCTION}"""
+
+
+@functools.lru_cache(maxsize=None)
+def _multilingual_system_content(terminology: Terminology, target_languages: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """System content blocks for the fan-out prompt, reusing the templates' cache point setting."""
+    blocks: List[Dict[str, Any]] = [{"text": _multilingual_prompt_prefix(terminology, target_languages)}]
+    blocks.extend(block for block in terminology.template(target_languages[0]).system_content if "cachePoint" in block)
+    return blocks
+
+
+def _clear_prompt_caches(terminology: Terminology) -> None:
+    # Prompts rendered for an older terminology version are never asked for again
+    _multilingual_prompt_prefix.cache_clear()
+    _multilingual_system_content.cache_clear()
+
+
+TERMINOLOGY.on_reload(_clear_prompt_caches)
+
+
+def _multilingual_user_message(input_text: str, target_languages: Sequence[str]) -> str:
+    return f"{LANGUAGE_KEYS_HEADING} {', '.join(target_languages)}\n\n{SOURCE_TEXT_HEADING}\n{input_text}\n"
+
+
+def generate_multilingual_translation_prompt(input_text: str, target_languages: Sequence[str]) -> str:
+    """
+    Generate a prompt that translates one text into several languages in one request.
+
+    Args:
+        input_text: The cricket text to translate
+        target_languages: The target languages for translation
+
+    Returns:
+        A prompt string to be sent to an LLM
+    """
+    languages = tuple(target_languages)
+    return f"{_multilingual_prompt_prefix(TERMINOLOGY.current, languages)}\n\n{_multilingual_user_message(input_text, languages)}"
+
+
+def parse_multilingual_translation(response: str, target_languages: Sequence[str]) -> Dict[str, str]:
+    """
+    Read the per-language translations out of a fan-out model response.
+
+    Args:
+        response: The raw model output, a JSON object optionally wrapped in a code fence
+        target_languages: The languages that were requested
+
+    Returns:
+        Translations keyed by language. Languages that are missing, not strings
+        or empty are left out, as is everything when the JSON does not parse.
+    """
+    text = _CODE_FENCE.sub("", response.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    try:
+        answer = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(answer, dict):
+        return {}
+    parsed: Dict[str, str] = {}
+    for language in target_languages:
+        value = answer.get(language)
+        if isinstance(value, str) and value.strip():
+            parsed[language] = value.strip()
+    return parsed
+
+
+def in_language_script(text: str, target_language: str) -> bool:
+    """
+    Check a translation contains characters of the target language's script, as given in the terminology data.
+
+    Args:
+        text: The translated text
+        target_language: The language it should be written in
+
+    Returns:
+        True when the script matches, or for languages without a known script
+    """
+    script = TERMINOLOGY.current.scripts.get(target_language)
+    if script is None:
+        return True
+    low, high = script
+    return any(low <= char <= high for char in text)
+
+
+def tokens_saved(input_text: str, target_languages: Sequence[str]) -> int:
+    """
+    Estimated input tokens saved against one translate_cricket_text prompt per language.
+
+    Args:
+        input_text: The cricket text to translate
+        target_languages: The target languages for translation
+
+    Returns:
+        The estimated saving, 0 when the fan-out prompt is not smaller
+    """
+    terminology = TERMINOLOGY.current
+    per_language = sum(len(terminology.template(language).render(input_text)) for language in target_languages)
+    fan_out = len(generate_multilingual_translation_prompt(input_text, target_languages))
+    return max(0, (per_language - fan_out) // 4)
+
+
+async def _fan_out(input_text: str, target_languages: List[str], model_id: str,
+                   results: Dict[str, Dict[str, Any]], terminology: Terminology, use_cache: bool) -> List[str]:
+    """Translate into several languages with one model call; returns the languages that still need one."""
+    languages = tuple(target_languages)
+    masked = _mask_source(input_text)
+    model_text = masked.text if masked else input_text
+    try:
+        response = await _call_model(
+            model_id, _multilingual_user_message(model_text, languages), _multilingual_system_content(terminology, languages)
+        )
+    except (ModelBusyError, ModelUnavailableError):
+        # Backpressure and an open circuit must reach the caller rather than turn into seven more calls
+        raise
+    except Exception as e:
+        logger.error(f"Multi-language translation to {', '.join(languages)} failed, translating individually: {str(e)}")
+        return list(languages)
+    METRICS.observe("prompt_tokens_saved", tokens_saved(input_text, languages))
+
+    parsed = parse_multilingual_translation(response, languages)
+    failed: List[str] = []
+    for language in languages:
+        translated = parsed.get(language)
+        if translated is None or not in_language_script(translated, language):
+            failed.append(language)
+            continue
+        with span("glossary", language=language):
+            translated, issues, missing = _apply_glossary(input_text, translated, language, masked)
+        if missing:
+            # A language that lost a score or name is retried on its own, unmasked
+            METRICS.increment("glossary_placeholder_retries")
+            failed.append(language)
+            continue
+        if use_cache:
+            TRANSLATION_CACHE.set(make_cache_key(input_text, language, model_id, terminology.prompt_version), translated)
+        results[language] = {"translated_text": translated, "cached": False, "glossary_issues": issues}
+    return failed
+
+
+async def _translate_individually(input_text: str, target_language: str, model_id: str,
+                                  use_cache: bool) -> Dict[str, Any]:
+    try:
+        result = await translate_cricket_text(input_text, target_language, model_id, use_cache=use_cache)
+    except (ModelBusyError, ModelUnavailableError, TranslationError) as e:
+        return {"error": str(e)}
+    translation = {
+        "translated_text": result["translated_text"],
+        "cached": result["cached"],
+        "glossary_issues": result.get("glossary_issues", []),
+        "fallback": True,
+    }
+    for key in ("coalesced", "translation_memory"):
+        if key in result:
+            translation[key] = result[key]
+    return translation
+
+
+async def translate_cricket_multilingual(input_text: str, target_languages: List[str], model_id: str,
+                                         use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Translate one cricket text into several Indian regional languages with one model call.
+
+    Args:
+        input_text: The cricket text to translate
+        target_languages: The target languages for translation
+        model_id: The model ID to use for translation, or "auto" to pick one by text length
+        use_cache: Serve repeated text from the translation cache and near-duplicates from
+            the translation memory
+
+    Returns:
+        A dictionary mapping every target language to either a translated_text or
+        an error, plus the number of model calls made. Languages translated by an
+        individual call after the fan-out answer failed validation carry "fallback": true.
+
+    Raises:
+        ModelBusyError: If too many requests are already queued for model_id
+        ModelUnavailableError: If the model's circuit breaker is open
+    """
+    model_id = MODEL_ROUTER.route(model_id, input_text)
+    terminology = TERMINOLOGY.current
+    languages: List[str] = []
+    translations: Dict[str, Dict[str, Any]] = {}
+    for language in dict.fromkeys(target_languages):
+        is_valid, error_message = validate_language(language)
+        if is_valid:
+            languages.append(language)
+        else:
+            translations[language] = {"error": error_message}
+
+    with request_context(model=model_id), span("translate_multilingual"):
+        pending: List[str] = []
+        for language in languages:
+            fast_text = _fast_path(input_text, language)
+            if fast_text is not None:
+                translations[language] = {"translated_text": fast_text, "cached": False, "fast_path": True}
+                continue
+            cached = TRANSLATION_CACHE.get(make_cache_key(input_text, language, model_id, terminology.prompt_version)) if use_cache else None
+            if cached is not None:
+                translations[language] = {"translated_text": cached, "cached": True}
+                continue
+            remembered = _translation_memory(input_text, language) if use_cache else None
+            if remembered is not None:
+                translations[language] = {"translated_text": remembered.translation, "cached": False,
+                                          "translation_memory": {"similarity": remembered.similarity}}
+            else:
+                pending.append(language)
+
+        model_calls = 0
+        failed = pending
+        if len(pending) > 1:
+            model_calls += 1
+            failed = await _fan_out(input_text, pending, model_id, translations, terminology, use_cache)
+            if failed:
+                logger.warning(f"Multi-language answer failed validation for {', '.join(failed)}, translating individually")
+                for language in failed:
+                    METRICS.increment("multilingual_fallbacks", labels={"language": language, "model": model_id})
+        individual = await asyncio.gather(
+            *(_translate_individually(input_text, language, model_id, use_cache) for language in failed)
+        )
+        # Answers from the cache, the translation memory or another request's call cost no model call
+        model_calls += sum(1 for result in individual
+                           if not (result.get("cached") or result.get("coalesced") or "translation_memory" in result))
+        for language, result in zip(failed, individual):
+            # A single pending language needs no fan-out, so it is not a fallback
+            if len(pending) == 1:
+                result.pop("fallback", None)
+            translations[language] = result
+
+    METRICS.increment("multilingual_requests")
+    METRICS.increment("multilingual_model_calls", model_calls)
+    return {
+        "input_text": input_text,
+        "source_language": "English",
+        "target_languages": list(dict.fromkeys(target_languages)),
+        "translations": {language: translations[language] for language in dict.fromkeys(target_languages)},
+        "model_calls": model_calls,
+    }
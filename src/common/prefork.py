@@ -0,0 +1,119 @@
+"""
+Pre-forked worker processes sharing one listening socket.
+
+A single server process runs its event loop, JSON handling and prompt
+building on one core. run_prefork binds the port once in a supervisor
+process and forks N workers that all accept connections on that socket, so
+the kernel spreads requests across them. The supervisor restarts a worker
+that dies and stops them all on SIGINT or SIGTERM.
+
+It knows nothing about MCP: the caller passes the function each worker runs
+with the shared socket. Workers are forked, so anything holding a thread or
+an open connection (SQLite files, the terminology watcher, thread pools,
+model clients) must be opened in the worker, not before run_prefork.
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict
+
+DEFAULT_WORKERS = int(os.environ.get("CRICKET_WORKERS", "1"))
+# A worker that dies sooner than this after starting is restarted only after this delay, so a crash loop does not spin
+RESTART_DELAY = 1.0
+STOP_TIMEOUT = 10.0
+
+logger = logging.getLogger("cricket-translation")
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """
+    Bind and listen on a TCP socket that forked workers can accept on.
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+        backlog: Pending connections queued by the kernel
+
+    Returns:
+        The listening socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _worker_main(serve: Callable[[socket.socket, int], None], sock: socket.socket, index: int) -> None:
+    # The supervisor's handlers are inherited; the worker's server installs its own
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    serve(sock, index)
+
+
+def run_prefork(sock: socket.socket, workers: int, serve: Callable[[socket.socket, int], None]) -> None:
+    """
+    Fork workers that serve on a shared socket and supervise them until stopped.
+
+    Args:
+        sock: A listening socket from bind_socket
+        workers: Number of worker processes
+        serve: Runs one worker: called in the child with the socket and the worker's index
+
+    Raises:
+        ValueError: If workers is less than 1
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    context = multiprocessing.get_context("fork")
+    processes: Dict[int, multiprocessing.Process] = {}
+    started_at: Dict[int, float] = {}
+    stopping = []
+
+    def start(index: int) -> None:
+        process = context.Process(target=_worker_main, args=(serve, sock, index), name=f"cricket-worker-{index}")
+        process.start()
+        processes[index] = process
+        started_at[index] = time.monotonic()
+        logger.info(f"Started worker {index} (pid {process.pid})")
+
+    def stop(signum, frame) -> None:
+        stopping.append(signum)
+
+    previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for index in range(workers):
+            start(index)
+        while not stopping:
+            sentinels = {process.sentinel: index for index, process in processes.items()}
+            for sentinel in multiprocessing.connection.wait(list(sentinels), timeout=0.5):
+                index = sentinels[sentinel]
+                process = processes[index]
+                process.join()
+                if stopping:
+                    break
+                logger.warning(f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}, restarting it")
+                if time.monotonic() - started_at[index] < RESTART_DELAY:
+                    time.sleep(RESTART_DELAY)
+                start(index)
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for process in processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        sock.close()
+        logger.info(f"Stopped {len(processes)} workers")
@@ -0,0 +1,272 @@
+"""
+Precompiled translation prompt templates.
+
+The translation prompt is mostly static: the role, the guidelines and the
+terminology reference only depend on the target language. Each language's
+static prefix is rendered once at startup and version-hashed, and only the
+source text (sent once) varies per request.
+
+The prefix is sent as the system prompt, followed by a cache point, so
+providers that support prompt caching (e.g. Amazon Bedrock) can reuse it
+across requests. Clients that take a single string get render() instead,
+which joins prefix and source text.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping
+
+from common.glossary import PLACEHOLDER
+
+# Set CRICKET_PROMPT_CACHING=0 for models that reject cache points
+PROMPT_CACHING_ENABLED = os.environ.get("CRICKET_PROMPT_CACHING", "1") != "0"
+
+SOURCE_TEXT_HEADING = "**Now translate the following cricket text:**"
+CONTEXT_HEADING = "**Preceding text, for context only (do not translate):**"
+
+# Masked source text (see common.glossary) carries placeholders the model must keep
+PLACEHOLDER_INSTRUCTION = (
+    f"Placeholders such as {PLACEHOLDER.format(index=1)} stand for numbers, scores and player names: "
+    "copy every placeholder into the translation exactly as it appears."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token) for when the model reports no usage."""
+    return max(1, len(text) // 4)
+
+
+def render_terminology(target_language: str, terms: Mapping[str, str]) -> str:
+    """
+    Render the terminology reference for one language, as listed in the guidelines.
+
+    Args:
+        target_language: The target language for translation
+        terms: Cricket terminology for the target language
+
+    Returns:
+        The terminology lines for the language
+    """
+    # Build the terminology reference section
+    term_reference = "\n".join([f"- {k}: {v}" for k, v in terms.items()])
+    return f"""   - For {target_language}, use these terms:
+{term_reference}"""
+
+
+def render_guidelines(target_language: str, terms: Mapping[str, str]) -> str:
+    """
+    Render the translation guidelines section shared by all translation prompts.
+
+    Args:
+        target_language: The target language for translation
+        terms: Cricket terminology for the target language
+
+    Returns:
+        The guidelines, including the terminology reference for the language
+    """
+    return _render_guidelines(render_terminology(target_language, terms))
+
+
+def render_multilingual_guidelines(terminology: Mapping[str, Mapping[str, str]]) -> str:
+    """
+    Render the guidelines once for several languages, with each language's terminology.
+
+    Args:
+        terminology: Cricket terminology keyed by target language, in prompt order
+
+    Returns:
+        The guidelines, including the terminology reference for every language
+    """
+    return _render_guidelines("\n".join(
+        render_terminology(language, terms) for language, terms in terminology.items()
+    ))
+
+
+def _render_guidelines(terminology_reference: str) -> str:
+    return f"""**Translation Guidelines:**
+
+1. **Cricket Terminology Preservation:**
+   - Keep standard cricket terms in English when commonly used: "over", "wicket", "boundary", "six", "four"
+   - Translate action words and descriptions to target language
+   - Maintain score formats: "45/2", "3.3 overs"
+   - numbers are to be preserved in their original form rather than being translated. Maintain clarity and consistency, especially when dealing with scores, statistics, and player performance metrics.
+
+2. **Regional Cricket Vocabulary:**
+   - Use established cricket terms in the target language where they exist
+{terminology_reference}
+
+3. **Player Names and Teams:**
+   - Keep player names in original script/transliteration
+   - Translate team descriptions but keep official team names
+
+4. **Numbers and Statistics:**
+   - Keep numerical values in standard format
+   - Translate descriptive text around numbers
+
+5. **Cricket Context Awareness:**
+   - Understand batting/bowling context
+   - Recognize match situations (chasing, defending, powerplay)
+   - Maintain urgency and excitement in commentary style"""
+
+
+def render_legacy_prompt(input_text: str, target_language: str, terms: Mapping[str, str]) -> str:
+    """
+    Render the original single-string prompt, which embeds the source text twice.
+
+    Kept to measure token savings and to check the templates stay equivalent.
+
+    Args:
+        input_text: The cricket text to translate
+        target_language: The target language for translation
+        terms: Cricket terminology for the target language
+
+    Returns:
+        The legacy prompt string
+    """
+    return f"""You are a professional cricket translator specializing in Indian regional languages. Translate the following cricket text accurately while maintaining proper cricket terminology and cultural context.
+
+**Source Text:** {input_text}
+
+**Target Language:** {target_language}
+
+{render_guidelines(target_language, terms)}
+
+**Output Format:**
+Provide the translation in {target_language} script with proper formatting. Maintain the structure and flow of the original text while ensuring cultural and linguistic appropriateness.
+
+{SOURCE_TEXT_HEADING}
+{input_text}
+"""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    Precompiled prompt for one target language.
+
+    Attributes:
+        language: The target language
+        prefix: Static system prompt (role, guidelines, terminology, output format)
+        version: Hash of the prefix, changes whenever the prompt or terminology does
+        prefix_tokens: Estimated token count of the prefix
+        legacy_overhead_chars: Characters the legacy prompt spent besides the two copies of the source text
+    """
+
+    language: str
+    prefix: str
+    version: str
+    prefix_tokens: int
+    legacy_overhead_chars: int
+    system_content: List[Dict[str, Any]] = field(compare=False, repr=False)
+
+    def user_message(self, input_text: str, context: str = "") -> str:
+        """Build the variable part of the prompt: optional preceding context, then the source text, once."""
+        if context:
+            return f"{CONTEXT_HEADING}\n{context}\n\n{SOURCE_TEXT_HEADING}\n{input_text}\n"
+        return f"{SOURCE_TEXT_HEADING}\n{input_text}\n"
+
+    def render(self, input_text: str) -> str:
+        """Build the full prompt as one string, for clients without a system prompt."""
+        return f"{self.prefix}\n\n{self.user_message(input_text)}"
+
+    def tokens_saved(self, input_text: str) -> int:
+        """Estimated input tokens saved against the legacy prompt for this source text."""
+        legacy_chars = self.legacy_overhead_chars + 2 * len(input_text)
+        return max(0, (legacy_chars - len(self.render(input_text))) // 4)
+
+
+def build_prompt_template(target_language: str, terms: Mapping[str, str]) -> PromptTemplate:
+    """
+    Render and hash the static prompt prefix for a language.
+
+    Args:
+        target_language: The target language for translation
+        terms: Cricket terminology for the target language
+
+    Returns:
+        The precompiled PromptTemplate
+    """
+    prefix = f"""You are a professional cricket translator specializing in Indian regional languages. Translate the cricket text given by the user accurately while maintaining proper cricket terminology and cultural context.
+
+**Target Language:** {target_language}
+
+{render_guidelines(target_language, terms)}
+
+**Output Format:**
+Provide the translation in {target_language} script with proper formatting. Maintain the structure and flow of the original text while ensuring cultural and linguistic appropriateness.
+{PLACEHOLDER_INSTRUCTION}"""
+
+    system_content: List[Dict[str, Any]] = [{"text": prefix}]
+    if PROMPT_CACHING_ENABLED:
+        # Everything before the cache point is identical across requests for this language
+        system_content.append({"cachePoint": {"type": "default"}})
+
+    return PromptTemplate(
+        language=target_language,
+        prefix=prefix,
+        version=hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16],
+        prefix_tokens=estimate_tokens(prefix),
+        legacy_overhead_chars=len(render_legacy_prompt("", target_language, terms)),
+        system_content=system_content,
+    )
+
+
+def build_prompt_templates(terminology: Mapping[str, Mapping[str, str]]) -> Dict[str, PromptTemplate]:
+    """
+    Precompile templates for every language in the terminology.
+
+    Args:
+        terminology: Cricket terminology keyed by language
+
+    Returns:
+        Templates keyed by language
+    """
+    return {language: build_prompt_template(language, terms) for language, terms in terminology.items()}
+
+
+def combined_version(templates: Mapping[str, PromptTemplate]) -> str:
+    """
+    Hash the versions of a set of templates into one prompt version.
+
+    Args:
+        templates: Templates keyed by language
+
+    Returns:
+        A short hex digest
+    """
+    digest = hashlib.sha256()
+    for language in sorted(templates):
+        digest.update(f"{language}:{templates[language].version};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def verify_template(template: PromptTemplate, terms: Mapping[str, str],
+                    sample_text: str = "Kohli hits a magnificent six over long-on, India need 45 from 36 balls (45/2 after 3.3 overs)") -> List[str]:
+    """
+    Check a template says the same thing as the legacy prompt.
+
+    Every non-empty line of the legacy prompt must appear in the rendered
+    template, apart from the role sentence and the duplicated source text, and
+    the source text must appear exactly once.
+
+    Args:
+        template: The template to check
+        terms: Cricket terminology for the template's language
+        sample_text: Source text used for rendering
+
+    Returns:
+        A list of problems, empty when the template is equivalent
+    """
+    problems = []
+    rendered = template.render(sample_text)
+    legacy = render_legacy_prompt(sample_text, template.language, terms)
+    for line in legacy.splitlines():
+        line = line.strip()
+        if not line or line.startswith("You are a professional cricket translator") or sample_text in line:
+            continue
+        if line not in rendered:
+            problems.append(f"{template.language}: missing line {line!r}")
+    if rendered.count(sample_text) != 1:
+        problems.append(f"{template.language}: source text appears {rendered.count(sample_text)} times")
+    return problems
@@ -0,0 +1,470 @@
+"""
+Rate limiting, retries and circuit breaking for model calls.
+
+Bedrock throttles bursts (ThrottlingException) and occasionally fails or
+times out. Each model ID gets:
+
+- an AdaptiveRateLimiter, a token bucket that halves its rate whenever the
+  model reports throttling and creeps back up as calls succeed. Unless a
+  maximum rate is configured, it starts pacing calls at the first throttle.
+- bounded retries with jittered exponential backoff for throttling and other
+  transient errors (RetryPolicy)
+- a CircuitBreaker that rejects calls straight away with ModelUnavailableError
+  after repeated failures (throttling is left to the rate limiter), then lets a single probe call through once the
+  reset timeout has passed
+
+ModelExecutor applies all three around every model call. When several
+server processes share one Bedrock quota, SharedRateLimiter keeps the token
+bucket in a SharedRateBudget file, so they all draw on one budget.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+# 0 leaves calls unpaced until the first throttle, then paces them below the rate that was throttled; -1 never paces
+DEFAULT_RATE = float(os.environ.get("CRICKET_MODEL_RATE", "0"))
+DEFAULT_BURST = float(os.environ.get("CRICKET_MODEL_BURST", "20"))
+DEFAULT_MIN_RATE = float(os.environ.get("CRICKET_MODEL_MIN_RATE", "0.5"))
+DEFAULT_RETRIES = int(os.environ.get("CRICKET_MODEL_RETRIES", "3"))
+DEFAULT_BACKOFF_BASE = float(os.environ.get("CRICKET_MODEL_BACKOFF_BASE", "0.2"))
+DEFAULT_BACKOFF_MAX = float(os.environ.get("CRICKET_MODEL_BACKOFF_MAX", "5"))
+DEFAULT_BREAKER_FAILURES = int(os.environ.get("CRICKET_BREAKER_FAILURES", "5"))
+DEFAULT_BREAKER_RESET = float(os.environ.get("CRICKET_BREAKER_RESET", "30"))
+DEFAULT_RATE_BUDGET_PATH = os.environ.get("CRICKET_RATE_BUDGET_PATH") or None
+# Longest the event loop waits for another process's lock on the rate budget before pacing on its own
+DEFAULT_RATE_BUDGET_TIMEOUT = float(os.environ.get("CRICKET_RATE_BUDGET_TIMEOUT", "0.05"))
+
+# Error codes Bedrock returns when a call may succeed if made again later
+THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+TRANSIENT_CODES = THROTTLING_CODES | {
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+}
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised without calling the model while its circuit breaker is open."""
+
+    def __init__(self, model_id: str, retry_after: float):
+        super().__init__(
+            f"Translation model {model_id} is unavailable after repeated failures, "
+            f"please retry in {max(1, round(retry_after))}s"
+        )
+        self.model_id = model_id
+        self.retry_after = retry_after
+
+
+def _error_code(error: BaseException) -> Optional[str]:
+    # botocore ClientError carries the service error code in its response
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """
+    Check whether an error means the model is throttling requests.
+
+    Args:
+        error: The exception raised by a model call
+
+    Returns:
+        True for strands ModelThrottledException, Bedrock throttling codes and
+        errors whose message says so
+    """
+    if type(error).__name__ == "ModelThrottledException" or _error_code(error) in THROTTLING_CODES:
+        return True
+    message = str(error).lower()
+    return "throttl" in message or "too many requests" in message
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether a failed model call is worth retrying.
+
+    Args:
+        error: The exception raised by a model call
+
+    Returns:
+        True for throttling, timeouts, connection errors and Bedrock server-side errors
+    """
+    if is_throttling_error(error) or _error_code(error) in TRANSIENT_CODES:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    # botocore's connection and read timeout errors do not share a builtin base class
+    return type(error).__name__ in {"EndpointConnectionError", "ReadTimeoutError", "ConnectTimeoutError"}
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Bounded retries with jittered exponential backoff.
+
+    Attributes:
+        retries: Attempts made after the first one fails
+        backoff_base: Upper bound of the first backoff delay, in seconds
+        backoff_max: Cap on any single backoff delay, in seconds
+    """
+
+    retries: int = DEFAULT_RETRIES
+    backoff_base: float = DEFAULT_BACKOFF_BASE
+    backoff_max: float = DEFAULT_BACKOFF_MAX
+
+    def delay(self, attempt: int) -> float:
+        """
+        Pick the delay before a retry, with full jitter so callers spread out.
+
+        Args:
+            attempt: 0 for the first retry, 1 for the second and so on
+
+        Returns:
+            Seconds to wait
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate adapts to throttling (additive increase, multiplicative decrease).
+
+    ``max_rate`` caps the rate; 0 means no cap is configured, so calls are not
+    paced at all until the model first throttles, and the rate calls were
+    starting at over the last second becomes the cap from then on. A negative
+    ``max_rate`` turns pacing off altogether.
+
+    A throttled call halves the rate, down to ``min_rate``, at most once per
+    second so a burst of throttled calls counts as one signal. Each successful
+    call raises it by a twentieth of the cap, up to the cap.
+    """
+
+    def __init__(self, max_rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 min_rate: float = DEFAULT_MIN_RATE):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = max(1.0, burst)
+        self.ceiling = self.rate = max(0.0, max_rate)
+        self.throttled = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        # Start times of recent calls, kept only until a rate is known
+        self._starts: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limiting(self) -> bool:
+        return self.rate > 0
+
+    def _try_take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until the next one."""
+        with self._lock:
+            now = time.monotonic()
+            if not self.limiting:
+                if self.max_rate < 0:
+                    return 0.0
+                self._starts.append(now)
+                while now - self._starts[0] >= 1.0:
+                    self._starts.popleft()
+                return 0.0
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self, check: Optional[Callable[[], None]] = None) -> None:
+        """
+        Wait until the bucket allows another call.
+
+        Args:
+            check: Called each time the caller wakes up to retry; may raise to stop
+                waiting, e.g. when the model's circuit breaker opened meanwhile
+        """
+        # Waiters re-check after sleeping, so a rate cut during the wait applies to them too
+        wait = self._try_take()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            if check is not None:
+                check()
+            wait = self._try_take()
+
+    def on_success(self) -> None:
+        if not self.limiting:
+            return
+        with self._lock:
+            self.rate = min(self.ceiling, self.rate + self.ceiling / 20)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if self.max_rate < 0:
+                return
+            if not self.limiting:
+                # Learn the cap from the rate that got us throttled
+                recent = sum(1 for started in self._starts if now - started < 1.0)
+                self.ceiling = self.rate = max(1.0, self.min_rate, recent)
+                self._starts.clear()
+            elif now - self._last_decrease < 1.0:
+                return
+            self._last_decrease = now
+            self.rate = max(min(self.min_rate, self.ceiling), self.rate / 2)
+            # Drop saved-up burst so the lower rate takes effect at once
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+
+    def configure(self, max_rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        with self._lock:
+            if max_rate is not None:
+                self.max_rate = max_rate
+                self.ceiling = self.rate = max(0.0, max_rate)
+                self._starts.clear()
+            if burst is not None:
+                self.burst = max(1.0, burst)
+                self._tokens = min(self._tokens, self.burst)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"rate": round(self.rate, 3), "max_rate": self.max_rate,
+                    "ceiling": round(self.ceiling, 3), "throttled": self.throttled}
+
+
+class SharedRateBudget:
+    """
+    Rate limiter state kept in a local SQLite file, one row per model ID.
+
+    Every process that opens the same file reads and updates the bucket in
+    one transaction, so they pace their calls against a single budget.
+    Bucket times are time.monotonic() readings, which all processes on one
+    host share; the file must not be shared between hosts.
+
+    Transactions run on the event loop, so a process waits at most
+    ``busy_timeout`` seconds for another one's lock; past that the
+    transaction yields None and the caller paces on its own state.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = DEFAULT_RATE_BUDGET_TIMEOUT):
+        self.path = path
+        self.busy = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Pacing state is rebuilt from scratch after a crash, so it need not reach the disk
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (model_id TEXT PRIMARY KEY, state TEXT NOT NULL)")
+        # Setup may wait for other workers starting up; after that, never block the event loop for long
+        self._conn.execute(f"PRAGMA busy_timeout = {max(0, int(busy_timeout * 1000))}")
+
+    @contextmanager
+    def transaction(self, model_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lock a model's row across processes and yield its state for updating.
+
+        Args:
+            model_id: The model ID
+
+        Yields:
+            The stored state, empty if none is stored yet; it is written back on exit.
+            None if another process held the lock past the busy timeout
+        """
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                self.busy += 1
+                yield None
+                return
+            try:
+                row = self._conn.execute("SELECT state FROM rate_limits WHERE model_id = ?", (model_id,)).fetchone()
+                state = json.loads(row[0]) if row else {}
+                yield state
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (model_id, state) VALUES (?, ?)",
+                    (model_id, json.dumps(state)),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """
+    AdaptiveRateLimiter whose bucket lives in a SharedRateBudget.
+
+    Tokens, the adapted rate and the learned cap are loaded from the budget
+    before every decision and saved after it, so a throttle seen by one
+    process slows down all of them and the burst is shared rather than
+    granted to each process. While the budget is locked by another process
+    for too long, decisions are made on the state last loaded and are not
+    saved.
+    """
+
+    _SHARED = ("max_rate", "ceiling", "rate", "throttled", "burst", "_tokens", "_updated", "_last_decrease")
+
+    def __init__(self, model_id: str, budget: SharedRateBudget, max_rate: float = DEFAULT_RATE,
+                 burst: float = DEFAULT_BURST, min_rate: float = DEFAULT_MIN_RATE):
+        super().__init__(max_rate=max_rate, burst=burst, min_rate=min_rate)
+        self.model_id = model_id
+        self.budget = budget
+
+    @contextmanager
+    def _synced(self) -> Iterator[None]:
+        with self.budget.transaction(self.model_id) as state:
+            if state is None:
+                yield
+                return
+            if state:
+                for name in self._SHARED:
+                    setattr(self, name, state[name])
+                self._starts = deque(state["starts"])
+            yield
+            state.update({name: getattr(self, name) for name in self._SHARED})
+            state["starts"] = list(self._starts)
+
+    def _try_take(self) -> float:
+        with self._synced():
+            return super()._try_take()
+
+    def on_success(self) -> None:
+        with self._synced():
+            super().on_success()
+
+    def on_throttle(self) -> None:
+        with self._synced():
+            super().on_throttle()
+
+    def configure(self, max_rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        with self._synced():
+            # Every process configures the same cap at startup; that must not undo a rate the others adapted
+            if max_rate == self.max_rate:
+                max_rate = None
+            super().configure(max_rate=max_rate, burst=burst)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._synced():
+            stats = super().stats()
+        stats["shared"] = self.budget.path
+        stats["budget_busy"] = self.budget.busy
+        return stats
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+
+    Closed: calls go through. After ``failure_threshold`` consecutive failures
+    it opens and every call fails fast for ``reset_timeout`` seconds. Then it is
+    half-open: one probe call goes through, and its outcome closes or reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_BREAKER_FAILURES,
+                 reset_timeout: float = DEFAULT_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def reject_if_open(self, model_id: str) -> None:
+        """
+        Fail fast while the breaker is open, without claiming the half-open probe.
+
+        Args:
+            model_id: The model ID, for the error message
+
+        Raises:
+            ModelUnavailableError: If the breaker is open and its reset timeout has not passed
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise ModelUnavailableError(model_id, remaining)
+
+    def before_call(self, model_id: str) -> bool:
+        """
+        Let a call through or reject it.
+
+        Args:
+            model_id: The model ID, for the error message
+
+        Returns:
+            True when this call is the half-open probe; only it may call on_abandoned
+
+        Raises:
+            ModelUnavailableError: If the breaker is open, or half-open with a probe already running
+        """
+        if self.failure_threshold <= 0:
+            return False
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise ModelUnavailableError(model_id, remaining)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise ModelUnavailableError(model_id, self.reset_timeout)
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def on_failure(self) -> bool:
+        """Record a failed call; returns True when this failure opened the breaker."""
+        if self.failure_threshold <= 0:
+            return False
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                return True
+            return False
+
+    def on_abandoned(self) -> None:
+        """Release the probe slot held by a probe call that ended without an outcome, e.g. throttled."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures,
+                    "opened": self.opened, "rejected": self.rejected}
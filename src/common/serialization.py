@@ -0,0 +1,66 @@
+"""
+JSON encoding of tool responses.
+
+Tool responses used to be written with json.dumps(indent=2): a third of a
+short response was whitespace, and encoding was a noticeable share of a
+cached or fast-path request. encode_json writes compact JSON instead, with
+orjson when it is installed (CRICKET_JSON=json forces the standard library).
+Non-ASCII text is written as UTF-8, not as \\u escapes, either way.
+
+RESPONSE_FORMAT picks how the MCP server returns a tool's JSON:
+
+- "compact": one line of JSON in the text content (the default)
+- "pretty": indented JSON in the text content, as before
+- "structured": the object as MCP structured content, with the compact JSON
+  as text content too, for clients that do not read structured content
+
+It is set with CRICKET_RESPONSE_FORMAT or the server's --response-format flag.
+"""
+
+import json
+import os
+from typing import Any, Mapping
+
+RESPONSE_FORMATS = ("compact", "pretty", "structured")
+RESPONSE_FORMAT = os.environ.get("CRICKET_RESPONSE_FORMAT", "compact").lower()
+if RESPONSE_FORMAT not in RESPONSE_FORMATS:
+    RESPONSE_FORMAT = "compact"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+if os.environ.get("CRICKET_JSON", "auto").lower() == "json":
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # Terminology snapshots hold read-only mappings, which orjson does not know
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(value: Any, pretty: bool = False) -> str:
+    """
+    Encode a response as JSON.
+
+    Args:
+        value: The response
+        pretty: Indent it for people to read instead of writing it compactly
+
+    Returns:
+        The JSON text
+    """
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=_default)
+    if orjson is not None:
+        return orjson.dumps(value, default=_default).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def encoder_name() -> str:
+    """The encoder encode_json uses for compact JSON: "orjson" or "json"."""
+    return "orjson" if orjson is not None else "json"
@@ -0,0 +1,97 @@
+"""
+Single-flight coalescing of identical in-flight translations.
+
+When web, app and TV ticker consumers push the same commentary line at the
+same moment, every one of them misses the translation cache, because none of
+the model calls has finished yet. SingleFlight lets the first request start
+the work and every identical request that arrives while it runs await the
+same result, so one Bedrock call serves all of them.
+
+The shared work runs in its own task. A waiter that is cancelled stops
+waiting without cancelling it for the others; the task is only cancelled
+once every waiter has gone. An exception raised by the work is raised in
+every waiter.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """One shared unit of work and the number of requests awaiting it."""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one instance of the work for a key at a time, sharing its result."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._counters = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+    async def run(self, key: str, work: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await the in-flight work for a key, starting it when nothing is in flight.
+
+        Args:
+            key: Identity of the work, e.g. a translation cache key
+            work: Called with no arguments to start the work when this request leads
+
+        Returns:
+            Tuple of (result, coalesced), where coalesced is True when the result
+            came from work another request started
+
+        Raises:
+            Whatever the work raises, in every waiter
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        # A flight left behind by another event loop cannot be awaited from this one
+        coalesced = flight is not None and flight.task.get_loop() is loop and not flight.task.cancelled()
+        if coalesced:
+            with self._lock:
+                self._counters["coalesced"] += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(work()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            with self._lock:
+                self._counters["leaders"] += 1
+
+        flight.waiters += 1
+        try:
+            # shield() keeps one waiter's cancellation from reaching the shared task
+            return await asyncio.shield(flight.task), coalesced
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody wants the result any more
+                self._forget(key, flight)
+                flight.task.cancel()
+                with self._lock:
+                    self._counters["abandoned"] += 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the number of flights in progress and the coalescing counters.
+
+        Returns:
+            A dictionary of single-flight statistics
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        stats["in_flight"] = len(self._flights)
+        requests = stats["leaders"] + stats["coalesced"]
+        stats["coalesced_rate"] = round(stats["coalesced"] / requests, 4) if requests else 0.0
+        return stats
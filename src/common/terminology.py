@@ -0,0 +1,401 @@
+"""
+Hot-reloadable cricket terminology.
+
+The terminology, the example translations and the supported languages used
+to be Python literals, so adding a term or a language needed a redeploy. They
+now live in a JSON data file (CRICKET_TERMS_PATH, default
+common/data/terminology.json):
+
+    {"languages": {"Tamil": {"script": "0B80-0BFF", "example": "...", "terms": {"over": "ஓவர்", ...}}}}
+
+The file is loaded into an immutable Terminology snapshot. The snapshot also
+carries everything derived from the data: read-only term maps, a set of
+supported languages, the glossary and fast path engines, the precompiled
+prompt templates and their combined prompt version. It also carries the
+get_cricket_terminology responses, serialized once with an etag each, so the
+tool does no work per call beyond a dictionary lookup.
+
+TerminologyStore holds the current snapshot. When the file changes, it builds
+a new snapshot and swaps it in with a single assignment. A request that
+already took a snapshot keeps using it to the end. New requests see the new
+one, and nothing on the request path takes a lock. The prompt version is part
+of every translation cache key, so translations made with the old terminology
+are not served under the new one.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from common.fast_path import FastPathEngine
+from common.glossary import GlossaryEngine
+from common.metrics import METRICS
+from common.prompt_templates import PromptTemplate, build_prompt_template, combined_version
+from common.serialization import encode_json
+
+logger = logging.getLogger("cricket-translation")
+
+DEFAULT_TERMS_PATH = os.environ.get(
+    "CRICKET_TERMS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "terminology.json")
+)
+DEFAULT_RELOAD_INTERVAL = float(os.environ.get("CRICKET_TERMS_RELOAD_INTERVAL", "5"))
+
+# get_cricket_terminology language that returns every language in one response
+ALL_LANGUAGES = "all"
+
+
+@dataclass(frozen=True)
+class TerminologyResponse:
+    """
+    A get_cricket_terminology response, serialized once.
+
+    Attributes:
+        payload: The response as a dictionary; do not modify it
+        body: The payload serialized as JSON
+        etag: Hash of the language and terms in the response, unchanged until they change
+        not_modified: Serialized short answer for a client that already holds this etag
+    """
+
+    payload: Dict[str, Any] = field(repr=False)
+    body: str = field(repr=False)
+    etag: str
+    not_modified: str = field(repr=False)
+
+
+def build_terminology_response(language: str, terminology: Mapping[str, Any]) -> TerminologyResponse:
+    """
+    Serialize a get_cricket_terminology response and compute its etag.
+
+    Args:
+        language: The language, or ALL_LANGUAGES
+        terminology: Terms keyed by term key, or by language then term key for ALL_LANGUAGES
+
+    Returns:
+        The TerminologyResponse
+    """
+    canonical = json.dumps([language, terminology], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    etag = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    payload = {"language": language, "terminology": terminology, "etag": etag}
+    return TerminologyResponse(
+        payload=payload,
+        body=encode_json(payload),
+        etag=etag,
+        not_modified=encode_json({"language": language, "etag": etag, "not_modified": True}),
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class Terminology:
+    """
+    One immutable version of the terminology data and everything derived from it.
+
+    Snapshots compare and hash by identity, so they can key caches of
+    derived values (see batch_translation and multilingual_translation).
+
+    Attributes:
+        version: Hash of the data file contents
+        languages: Supported languages, in file order
+        terms: Read-only cricket terminology keyed by language, then by term key
+        examples: Example translation per language
+        scripts: First and last character of each language's Unicode block
+        glossary: Glossary engine compiled from the terms
+        fast_path: Fast path engine rendering from the terms
+        prompt_templates: Precompiled prompt template per language
+        prompt_version: Combined version of the templates, part of every translation cache key
+        responses: get_cricket_terminology response per language, and for ALL_LANGUAGES
+    """
+
+    version: str
+    languages: Tuple[str, ...]
+    terms: Mapping[str, Mapping[str, str]]
+    examples: Mapping[str, str]
+    scripts: Mapping[str, Tuple[str, str]]
+    glossary: GlossaryEngine = field(repr=False)
+    fast_path: FastPathEngine = field(repr=False)
+    prompt_templates: Mapping[str, PromptTemplate] = field(repr=False)
+    prompt_version: str
+    responses: Mapping[str, TerminologyResponse] = field(repr=False)
+    language_set: FrozenSet[str] = field(repr=False)
+    language_error: str = field(repr=False)
+
+    def validate_language(self, target_language: str) -> Tuple[bool, str]:
+        """Check a target language is supported; a set lookup, with the error message prefix prebuilt."""
+        if target_language in self.language_set:
+            return True, ""
+        return False, f"{self.language_error} Got: {target_language}"
+
+    def template(self, target_language: str) -> PromptTemplate:
+        """The precompiled prompt template for a language, built on demand for languages without terminology."""
+        template = self.prompt_templates.get(target_language)
+        if template is None:
+            template = build_prompt_template(target_language, {})
+        return template
+
+    def response(self, language: str, terms: Optional[Sequence[str]] = None) -> Optional[TerminologyResponse]:
+        """
+        Get the get_cricket_terminology response for a language.
+
+        Args:
+            language: A supported language, or ALL_LANGUAGES
+            terms: Only include these term keys; unknown keys are left out
+
+        Returns:
+            The precomputed response, or None for an unsupported language
+        """
+        if language != ALL_LANGUAGES and language not in self.language_set:
+            return None
+        if not terms:
+            return self.responses[language]
+        return _subset_response(self, language, tuple(dict.fromkeys(terms)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _subset_response(terminology: Terminology, language: str, keys: Tuple[str, ...]) -> TerminologyResponse:
+    # Keyed by snapshot, so subsets from an older terminology version are simply never asked for again
+    def pick(terms: Mapping[str, str]) -> Dict[str, str]:
+        return {key: terms[key] for key in keys if key in terms}
+
+    if language == ALL_LANGUAGES:
+        return build_terminology_response(language, {name: pick(terms) for name, terms in terminology.terms.items()})
+    return build_terminology_response(language, pick(terminology.terms[language]))
+
+
+def _parse_script(language: str, spec: Any) -> Optional[Tuple[str, str]]:
+    if spec is None:
+        return None
+    try:
+        low, high = (int(part, 16) for part in str(spec).split("-"))
+    except ValueError:
+        raise ValueError(f"{language}: script must be a Unicode range like 0B80-0BFF, got {spec!r}")
+    return chr(low), chr(high)
+
+
+def parse_terminology(raw: bytes) -> Terminology:
+    """
+    Build a Terminology snapshot from the contents of a data file.
+
+    Args:
+        raw: The JSON file contents
+
+    Returns:
+        The snapshot, with its glossary, fast path and prompt templates compiled
+
+    Raises:
+        ValueError: If the file is not valid JSON or does not have the expected shape
+    """
+    data = json.loads(raw.decode("utf-8"))
+    languages = data.get("languages") if isinstance(data, dict) else None
+    if not isinstance(languages, dict) or not languages:
+        raise ValueError('terminology file must hold a non-empty "languages" object')
+    if ALL_LANGUAGES in languages:
+        raise ValueError(f'"{ALL_LANGUAGES}" is reserved and cannot be a language name')
+
+    terms: Dict[str, Mapping[str, str]] = {}
+    examples: Dict[str, str] = {}
+    scripts: Dict[str, Tuple[str, str]] = {}
+    for language, entry in languages.items():
+        language_terms = entry.get("terms") if isinstance(entry, dict) else None
+        if not isinstance(language_terms, dict) or not all(
+                isinstance(k, str) and isinstance(v, str) and v for k, v in language_terms.items()):
+            raise ValueError(f'{language}: "terms" must map term keys to non-empty strings')
+        terms[language] = MappingProxyType(dict(language_terms))
+        if entry.get("example"):
+            examples[language] = str(entry["example"])
+        script = _parse_script(language, entry.get("script"))
+        if script is not None:
+            scripts[language] = script
+
+    terms_view = MappingProxyType(terms)
+    templates = {language: build_prompt_template(language, language_terms) for language, language_terms in terms.items()}
+    names = tuple(languages)
+    return Terminology(
+        version=hashlib.sha256(raw).hexdigest()[:16],
+        languages=names,
+        terms=terms_view,
+        examples=MappingProxyType(examples),
+        scripts=MappingProxyType(scripts),
+        glossary=GlossaryEngine(terms_view),
+        fast_path=FastPathEngine(terms_view),
+        prompt_templates=MappingProxyType(templates),
+        prompt_version=combined_version(templates),
+        responses=MappingProxyType({
+            **{language: build_terminology_response(language, dict(language_terms))
+               for language, language_terms in terms.items()},
+            ALL_LANGUAGES: build_terminology_response(
+                ALL_LANGUAGES, {language: dict(language_terms) for language, language_terms in terms.items()}
+            ),
+        }),
+        language_set=frozenset(names),
+        language_error=f"Error: Target language must be one of: {', '.join(names)}.",
+    )
+
+
+def load_terminology(path: str) -> Terminology:
+    """
+    Load a Terminology snapshot from a data file.
+
+    Args:
+        path: Path of the JSON terminology file
+
+    Returns:
+        The snapshot
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid terminology
+    """
+    with open(path, "rb") as f:
+        return parse_terminology(f.read())
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    # Editors and deploys often replace the file, which changes the inode but maybe not the size
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class TerminologyStore:
+    """
+    Holds the current Terminology snapshot and reloads it when the data file changes.
+
+    Read ``current`` once per request and use that snapshot throughout, so one
+    translation never mixes a template from one version with the cache key of another.
+    """
+
+    def __init__(self, path: str = DEFAULT_TERMS_PATH):
+        self.path = path
+        self._signature = _signature(path)
+        self.current: Terminology = load_terminology(path)
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.reload_errors = 0
+        self._listeners: List[Callable[[Terminology], None]] = []
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._interval = DEFAULT_RELOAD_INTERVAL
+
+    def on_reload(self, listener: Callable[[Terminology], None]) -> None:
+        """
+        Register a callback run with the new snapshot after every reload.
+
+        Args:
+            listener: Called from the reloading thread; use it to drop values derived from the old snapshot
+        """
+        self._listeners.append(listener)
+
+    def configure(self, path: Optional[str] = None) -> None:
+        """
+        Load terminology from another data file.
+
+        Args:
+            path: Path of the JSON terminology file, None to keep the current one
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid terminology
+        """
+        if path is None or path == self.path:
+            return
+        with self._lock:
+            signature = _signature(path)
+            terminology = load_terminology(path)
+            self.path = path
+            self._signature = signature
+            self._install(terminology)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the data file if it changed since the last load.
+
+        A file that does not load (half written, invalid JSON, wrong shape) is
+        logged and skipped, and the current snapshot stays in use.
+
+        Args:
+            force: Reload even if the file looks unchanged
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        with self._lock:
+            signature = _signature(self.path)
+            if not force and signature == self._signature:
+                return False
+            self._signature = signature
+            try:
+                terminology = load_terminology(self.path)
+            except (OSError, ValueError) as e:
+                self.reload_errors += 1
+                METRICS.increment("terminology_reload_errors")
+                logger.error(f"Keeping terminology {self.current.version}, could not load {self.path}: {str(e)}")
+                return False
+            return self._install(terminology)
+
+    def _install(self, terminology: Terminology) -> bool:
+        # Caller holds the lock, so listeners run in reload order
+        if terminology.version == self.current.version:
+            return False
+        previous, self.current = self.current, terminology
+        self.loaded_at = time.time()
+        self.reloads += 1
+        METRICS.increment("terminology_reloads")
+        logger.info(f"Reloaded terminology {previous.version} -> {terminology.version} "
+                    f"({len(terminology.languages)} languages, prompt version {terminology.prompt_version})")
+        for listener in self._listeners:
+            try:
+                listener(terminology)
+            except Exception as e:
+                logger.error(f"Terminology reload listener failed: {str(e)}")
+        return True
+
+    def watch(self, interval: Optional[float] = None) -> Optional[threading.Thread]:
+        """
+        Check the data file for changes every ``interval`` seconds on a daemon thread.
+
+        Args:
+            interval: Seconds between checks (default: CRICKET_TERMS_RELOAD_INTERVAL or 5), 0 or less to not watch
+
+        Returns:
+            The watcher thread, or None when watching is off
+        """
+        if interval is not None:
+            self._interval = interval
+        if self._interval <= 0:
+            return None
+        if self._watcher is None:
+            def poll() -> None:
+                while True:
+                    time.sleep(self._interval)
+                    self.reload()
+
+            self._watcher = threading.Thread(target=poll, name="terminology-watcher", daemon=True)
+            self._watcher.start()
+        return self._watcher
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the loaded version and reload counts.
+
+        Returns:
+            A dictionary of terminology store statistics
+        """
+        current = self.current
+        return {
+            "path": self.path,
+            "version": current.version,
+            "prompt_version": current.prompt_version,
+            "languages": list(current.languages),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "watching": self._watcher is not None,
+        }
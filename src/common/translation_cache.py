@@ -0,0 +1,254 @@
+"""
+Content-addressed cache for translated cricket text.
+
+Live commentary repeats itself ("FOUR!", "Drinks break", "That's the end of the
+over"), and every repeat would otherwise be a full Bedrock round trip per
+language. Entries are keyed on the normalized input text, target language,
+model ID and a version hash of the prompt and terminology, so changing the
+prompt or the glossary never serves stale translations.
+
+The in-memory tier is an LRU with a TTL. An optional SQLite file adds a
+persistent tier that survives restarts. Several processes can open the same
+file; each keeps its own memory tier and finds the others' translations in
+the file.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("CRICKET_CACHE_SIZE", "10000"))
+DEFAULT_CACHE_TTL = float(os.environ.get("CRICKET_CACHE_TTL", "86400"))
+DEFAULT_CACHE_PATH = os.environ.get("CRICKET_CACHE_PATH") or None
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache lookups: Unicode NFC, collapsed whitespace, trimmed.
+
+    Args:
+        text: The input text
+
+    Returns:
+        The normalized text
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_cache_key(input_text: str, target_language: str, model_id: str, prompt_version: str) -> str:
+    """
+    Build the content-addressed key for a translation.
+
+    Args:
+        input_text: The cricket text to translate
+        target_language: The target language for translation
+        model_id: The model ID used for translation
+        prompt_version: Version hash of the prompt template and terminology
+
+    Returns:
+        A hex SHA-256 digest
+    """
+    material = "\x1f".join((normalize_text(input_text), target_language, model_id, prompt_version))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """Persistent cache tier stored in a local SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Waits for writers in other processes instead of failing with "database is locked"
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                return None
+            return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM translations WHERE expires_at <= ?", (now,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache: in-memory LRU with TTL, backed by optional SQLite.
+
+    Hits in the persistent tier are promoted into memory. Hit, miss and
+    eviction counters are available from stats().
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL,
+                 path: Optional[str] = DEFAULT_CACHE_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = max_entries > 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._backend: Optional[SQLiteCacheBackend] = SQLiteCacheBackend(path) if path else None
+        self._counters = {"hits": 0, "misses": 0, "persistent_hits": 0, "evictions": 0, "expirations": 0, "writes": 0}
+
+    def configure(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                  path: Optional[str] = None) -> None:
+        """
+        Change the cache limits or attach a persistent SQLite file.
+
+        Args:
+            max_entries: Maximum entries kept in memory, 0 disables the cache
+            ttl: Seconds an entry stays valid
+            path: SQLite file for the persistent tier
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+                self.enabled = max_entries > 0
+                self._trim()
+            if ttl is not None:
+                self.ttl = ttl
+            if path and (self._backend is None or self._backend.path != path):
+                if self._backend is not None:
+                    self._backend.close()
+                self._backend = SQLiteCacheBackend(path)
+
+    @property
+    def path(self) -> Optional[str]:
+        """The SQLite file of the persistent tier, or None without one."""
+        return self._backend.path if self._backend else None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a translation.
+
+        Args:
+            key: A key from make_cache_key
+
+        Returns:
+            The cached translation, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[0]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+            if self._backend is not None:
+                stored = self._backend.get(key, now)
+                if stored is not None:
+                    self._entries[key] = stored
+                    self._trim()
+                    self._counters["hits"] += 1
+                    self._counters["persistent_hits"] += 1
+                    return stored[0]
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a translation.
+
+        Args:
+            key: A key from make_cache_key
+            value: The translated text
+        """
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            self._trim()
+            self._counters["writes"] += 1
+            if self._backend is not None:
+                self._backend.set(key, value, expires_at)
+
+    def _trim(self) -> None:
+        # Caller holds the lock
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and sizes.
+
+        Returns:
+            A dictionary of cache statistics
+        """
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            stats = dict(self._counters)
+            stats.update({
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "persistent_path": self._backend.path if self._backend else None,
+                "persistent_entries": len(self._backend) if self._backend else 0,
+            })
+            return stats
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._backend is not None:
+                self._backend.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def close(self) -> None:
+        """Close the persistent tier, if any."""
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+                self._backend = None
@@ -0,0 +1,295 @@
+"""
+Translation memory of approved translations, found by n-gram similarity.
+
+The translation cache only answers a line it has seen word for word. Live
+commentary and archives are full of near-duplicates that differ only in
+the score or a punctuation mark ("India are 180/3 after 30 overs" and
+"India are 212/4 after 35 overs"). A translation that an editor approved for
+one of them is a better answer for the other than a fresh model call.
+
+Sources are indexed by character trigrams of their normalized shape:
+lowercased, punctuation dropped and every number collapsed to "#". A lookup
+scores the candidates sharing trigrams with the query by Dice similarity and
+takes the best one at or above min_similarity. The approved translation is
+then adapted by mapping each number of the remembered source to the number
+in the same position of the new one. A match is not reused when its numbers
+cannot be mapped one to one, or when the words the two sources differ in are
+not all articles or fillers ("the", "just", "now"...): "Gill and Iyer" for
+"Gill and Kohli", "four" for "six" or "is" for "was" reads almost the same
+and means something else.
+
+Entries are loaded from a JSONL file (CRICKET_TRANSLATION_MEMORY), one
+source per line with its approved translations:
+
+    {"source": "India are 180/3 after 30 overs", "translations": {"Hindi": "...", "Tamil": "..."}}
+
+"references" is accepted in place of "translations", so the golden corpus
+(src/benchmark/data/golden.jsonl) can be loaded as it is.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+# The numbers the glossary masks: figures, scores, grouped numbers, overs
+from common.glossary import _NUMBER_PATTERN
+
+DEFAULT_MEMORY_PATH = os.environ.get("CRICKET_TRANSLATION_MEMORY") or None
+DEFAULT_MIN_SIMILARITY = float(os.environ.get("CRICKET_MEMORY_MIN_SIMILARITY", "0.9"))
+NGRAM_SIZE = 3
+
+# Words a near-duplicate may add, drop or swap and still mean the same
+FILLER_WORDS = frozenset({"a", "an", "the", "just", "so", "well", "now"})
+
+_NON_WORD = re.compile(r"[^\w#]+")
+
+logger = logging.getLogger("cricket-translation")
+
+
+def source_shape(text: str) -> str:
+    """
+    Reduce a source text to what the index compares: lowercase words, numbers as "#".
+
+    Args:
+        text: The English source text
+
+    Returns:
+        The shape, words separated by single spaces
+    """
+    text = _NUMBER_PATTERN.sub("#", unicodedata.normalize("NFC", text).lower())
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def ngrams(shape: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """Character n-grams of a shape, padded so short words still produce some."""
+    padded = f" {shape} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def adapt_numbers(remembered_source: str, translation: str, new_source: str) -> Optional[str]:
+    """
+    Carry the numbers of a new source into the translation of a near-duplicate.
+
+    Args:
+        remembered_source: The source the translation was approved for
+        translation: The approved translation
+        new_source: The source being translated
+
+    Returns:
+        The translation with every number replaced by its counterpart, or None when
+        the numbers do not map one to one or do not all appear in the translation
+    """
+    old = _NUMBER_PATTERN.findall(remembered_source)
+    new = _NUMBER_PATTERN.findall(new_source)
+    if len(old) != len(new):
+        return None
+    mapping: Dict[str, str] = {}
+    for before, after in zip(old, new):
+        if mapping.setdefault(before, after) != after:
+            return None
+    if not mapping:
+        return translation
+    found = set(_NUMBER_PATTERN.findall(translation))
+    if not set(mapping) <= found:
+        return None
+    # One pass, so "45" -> "39" and "39" -> "45" do not undo each other
+    return _NUMBER_PATTERN.sub(lambda match: mapping.get(match.group(0), match.group(0)), translation)
+
+
+@dataclass(frozen=True)
+class MemoryMatch:
+    """
+    A translation reused from the memory.
+
+    Attributes:
+        source: The remembered source text
+        translation: Its approved translation, with the numbers of the new source
+        similarity: Dice similarity of the two sources' n-grams, 1.0 for the same shape
+    """
+
+    source: str
+    translation: str
+    similarity: float
+
+
+class TranslationMemory:
+    """
+    Approved translations of source texts, looked up by n-gram similarity.
+
+    Args:
+        path: JSONL file to load approved translations from
+        min_similarity: Similarity a remembered source needs for its translation to be reused
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_MEMORY_PATH,
+                 min_similarity: float = DEFAULT_MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._sources: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._translations: List[Dict[str, str]] = []
+        self._by_source: Dict[str, int] = {}
+        self._by_shape: Dict[str, List[int]] = defaultdict(list)
+        self._index: Dict[str, List[int]] = defaultdict(list)
+        self._counters = {"lookups": 0, "hits": 0, "exact_shape_hits": 0, "rejected": 0}
+        if path:
+            self.load(path)
+
+    def configure(self, path: Optional[str] = None, min_similarity: Optional[float] = None) -> None:
+        """
+        Load approved translations from a file or change the similarity needed for reuse.
+
+        Args:
+            path: JSONL file of approved translations, added to those already held
+            min_similarity: Similarity a remembered source needs for its translation to be reused
+        """
+        if min_similarity is not None:
+            self.min_similarity = min_similarity
+        if path:
+            self.load(path)
+
+    def load(self, path: str) -> int:
+        """
+        Add the approved translations in a JSONL file.
+
+        Args:
+            path: File with one {"source": ..., "translations": {language: text}} object per line
+
+        Returns:
+            The number of translations added
+        """
+        added = 0
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    translations = entry.get("translations", entry.get("references")) or {}
+                    for language, translation in translations.items():
+                        self.add(entry["source"], language, translation)
+                        added += 1
+                except (ValueError, KeyError, AttributeError) as e:
+                    logger.warning(f"Skipping translation memory line {number} of {path}: {str(e)}")
+        logger.info(f"Loaded {added} approved translations into the translation memory from {path}")
+        return added
+
+    def add(self, source: str, language: str, translation: str) -> None:
+        """
+        Remember an approved translation.
+
+        Args:
+            source: The English source text
+            language: The language of the translation
+            translation: The approved translation
+        """
+        with self._lock:
+            entry = self._by_source.get(source)
+            if entry is None:
+                entry = len(self._sources)
+                shape = source_shape(source)
+                grams = ngrams(shape)
+                self._sources.append(source)
+                self._grams.append(grams)
+                self._translations.append({})
+                self._by_source[source] = entry
+                self._by_shape[shape].append(entry)
+                for gram in grams:
+                    self._index[gram].append(entry)
+            self._translations[entry][language] = translation
+
+    def lookup(self, text: str, language: str, min_similarity: Optional[float] = None) -> Optional[MemoryMatch]:
+        """
+        Find an approved translation of the text, or of a near-duplicate, in a language.
+
+        Args:
+            text: The English source text
+            language: The target language
+            min_similarity: Override of the memory's min_similarity
+
+        Returns:
+            The best MemoryMatch, or None when nothing is similar enough, differs in more
+            than filler words or its numbers cannot be adapted
+        """
+        if not self._sources:
+            return None
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        shape = source_shape(text)
+        with self._lock:
+            self._counters["lookups"] += 1
+            exact = self._by_shape.get(shape, ())
+            candidates = [(1.0, entry) for entry in exact if language in self._translations[entry]]
+            if not candidates:
+                # None of the same-shape sources has this language: try the near ones
+                candidates = [(similarity, entry) for similarity, entry in self._similar(ngrams(shape), threshold)
+                              if entry not in exact]
+            words = set(shape.split())
+            for similarity, entry in candidates:
+                translation = self._translations[entry].get(language)
+                if translation is None:
+                    continue
+                source = self._sources[entry]
+                if similarity < 1.0 and not words.symmetric_difference(source_shape(source).split()) <= FILLER_WORDS:
+                    self._counters["rejected"] += 1
+                    continue
+                adapted = adapt_numbers(source, translation, text)
+                if adapted is None:
+                    self._counters["rejected"] += 1
+                    continue
+                self._counters["hits"] += 1
+                if similarity == 1.0:
+                    self._counters["exact_shape_hits"] += 1
+                return MemoryMatch(source=source, translation=adapted, similarity=round(similarity, 4))
+        return None
+
+    def _similar(self, grams: Set[str], threshold: float) -> List[tuple]:
+        """Entries sharing n-grams with the query, best first, with a Dice similarity of at least threshold."""
+        shared = Counter()
+        for gram in grams:
+            for entry in self._index.get(gram, ()):
+                shared[entry] += 1
+        scored = []
+        for entry, overlap in shared.items():
+            similarity = 2 * overlap / (len(grams) + len(self._grams[entry]))
+            if similarity >= threshold:
+                scored.append((similarity, entry))
+        scored.sort(reverse=True)
+        return scored
+
+    def clear(self) -> None:
+        """Forget every approved translation."""
+        with self._lock:
+            self._sources.clear()
+            self._grams.clear()
+            self._translations.clear()
+            self._by_source.clear()
+            self._by_shape.clear()
+            self._index.clear()
+
+    def __len__(self) -> int:
+        return sum(len(translations) for translations in self._translations)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the memory's size and lookup counters.
+
+        Returns:
+            Dictionary with sources, translations, min_similarity and lookup counters
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            sources = len(self._sources)
+        lookups = counters["lookups"]
+        return {
+            "sources": sources,
+            "translations": len(self),
+            "min_similarity": self.min_similarity,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
@@ -4,6 +4,14 @@ import json
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
+def tool_json(result):
+    """Read a tool's JSON whether the server sent it as structured content or as text."""
+    if result.structuredContent is not None:
+        return result.structuredContent
+    text = result.content[0].text if result.content else ""
+    # Errors come back as plain "Error: ..." text
+    return json.loads(text) if text.startswith("{") else text
+
 async def main():
     print("calling main")
     mcp_url = "http://0.0.0.0:8080/mcp"
@@ -39,7 +47,23 @@ async def main():
             
             # Pretty print the result
             print("\nTranslation Result:")
-            print(translation_result.content[0].text)
-            print(json.dumps(translation_result, indent=2, ensure_ascii=False))
+            print(json.dumps(tool_json(translation_result), indent=2, ensure_ascii=False))
+
+            # Stream the same translation: chunks arrive as progress notifications
+            print("\nStreaming Translation:")
+
+            async def print_chunk(progress, total, message):
+                print(message or "", end="", flush=True)
+
+            stream_result = await session.call_tool(
+                "translate_cricket_stream",
+                {
+                    "input_text": cricket_text,
+                    "target_language": target_lang
+                },
+                progress_callback=print_chunk
+            )
+            print()
+            print(json.dumps(tool_json(stream_result), indent=2, ensure_ascii=False))
 
 asyncio.run(main())
\ No newline at end of file
@@ -6,13 +6,19 @@ An MCP server that provides tools for translating cricket text to Indian regiona
 while preserving cricket terminology and cultural context.
 """
 
-import json
 import logging
 import argparse
 import asyncio
+import functools
+import shutil
+import socket
 import sys
-from typing import Any, Dict
-from mcp.server.fastmcp import FastMCP
+import tempfile
+from typing import Any, Dict, List, Union
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import CallToolResult, TextContent, Tool
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
 
 # Import common functionality
 import sys
@@ -21,87 +27,413 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.cricket_translation import (
     translate_cricket_text,
-    get_cricket_terminology_data,
+    stream_cricket_translation,
+    get_cricket_terminology_response,
     validate_language,
+    get_translation_stats_data,
+    set_model_factory,
+    warm_up_clients,
+    ModelBusyError,
+    ModelUnavailableError,
+    METRICS,
+    MODEL_EXECUTOR,
+    MODEL_ROUTER,
+    AUTO_MODEL,
+    CLIENT_POOL,
+    TERMINOLOGY,
+    TRANSLATION_CACHE,
+    TRANSLATION_MEMORY,
     logger
 )
+import common.cricket_translation as cricket_translation
+from common.batch_translation import translate_cricket_batch as translate_cricket_batch_texts
+from common.document_translation import needs_chunking, stream_cricket_document, translate_cricket_document
+from common.multilingual_translation import translate_cricket_multilingual as translate_cricket_multilingual_text
+from common.prefork import DEFAULT_WORKERS, bind_socket, run_prefork
+import common.serialization as serialization
+from common.serialization import RESPONSE_FORMATS, encode_json
+import common.instrumentation as instrumentation
+from common.instrumentation import collect_spans, profile_request, span
+
+class CricketMCP(FastMCP):
+    """FastMCP that can start warming up the model clients when a client first lists the tools."""
+
+    warm_up_on_list_tools = False
+
+    async def list_tools(self) -> List[Tool]:
+        tools = await super().list_tools()
+        if self.warm_up_on_list_tools:
+            # The handshake is done by now; the warm-up runs on its own thread so this answer never waits
+            self.warm_up_on_list_tools = False
+            warm_up_clients()
+        return tools
 
 # Create FastMCP instance - will be properly configured based on mode type
 # We initialize with default settings for decorator usage, but will reconfigure in main
-mcp = FastMCP("crick-translate-mcp-server")
+mcp = CricketMCP("crick-translate-mcp-server")
 
 # ==================== TRANSLATION TOOLS ====================
 
+def _tool_response(tool: str, body: Dict[str, Any]) -> Union[str, CallToolResult]:
+    """Return a tool response as compact or indented JSON text, or as structured content, per serialization.RESPONSE_FORMAT."""
+    with span("serialize", tool=tool):
+        if serialization.RESPONSE_FORMAT == "structured":
+            # Passed through by FastMCP as it is; the compact text copy is for clients that only read content
+            return CallToolResult(content=[TextContent(type="text", text=encode_json(body))], structuredContent=body)
+        return encode_json(body, pretty=serialization.RESPONSE_FORMAT == "pretty")
+
+def _to_json(tool: str, body: Dict[str, Any], profiled: Dict[str, Any], spans: List[Dict[str, Any]]) -> Union[str, CallToolResult]:
+    """Serialize a tool response, attaching the profile and stage timings when the request was profiled."""
+    if "profile" in profiled:
+        body["profile"] = profiled["profile"]
+        body["timings"] = spans
+    return _tool_response(tool, body)
+
 @mcp.tool()
-async def translate_cricket(input_text, target_language, model_id="us.amazon.nova-lite-v1:0"):
+async def translate_cricket(input_text, target_language, model_id=AUTO_MODEL, profile=False):
     """
     Translates cricket text to the specified Indian regional language while preserving cricket terminology.
     
     Args:
         input_text (str): The cricket text to translate
         target_language (str): Target language for translation (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi)
-        model_id (str): The model ID to use for translation (default: "us.amazon.nova-lite-v1:0")
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
+        profile (bool): Attach a profile and stage timings to the response (server must run with --enable-profiling)
         
     Returns:
         str: JSON response containing the translated text and metadata
     """
     try:
-        if not input_text:
-            return "Error: Input text cannot be empty"
+        with span("tool", tool="translate_cricket"):
+            if not input_text:
+                return "Error: Input text cannot be empty"
+                
+            is_valid, error_message = validate_language(target_language)
+            if not is_valid:
+                return error_message
             
-        is_valid, error_message = validate_language(target_language)
-        if not is_valid:
-            return error_message
+            logger.info(f"Translating cricket text to {target_language} using model {model_id}")
+            
+            with profile_request(profile) as profiled, collect_spans() as spans:
+                if needs_chunking(input_text):
+                    # Long articles and reports are translated in chunks and reassembled
+                    result = await translate_cricket_document(input_text, target_language, model_id)
+                    body = {
+                        "translated_text": result["translated_text"],
+                        "source_language": "English",
+                        "target_language": target_language,
+                        "chunks": result["chunks"],
+                        "failed_chunks": result["failed_chunks"]
+                    }
+                else:
+                    # Call the translation function
+                    result = await translate_cricket_text(input_text, target_language, model_id)
+                    body = {
+                        "translated_text": result["translated_text"],
+                        "source_language": "English",
+                        "target_language": target_language
+                    }
+            
+            # Return the result as JSON
+            return _to_json("translate_cricket", body, profiled, spans)
+    except (ModelBusyError, ModelUnavailableError) as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket", "error": "rejected"})
+        return f"Error: {str(e)}"
+    except Exception as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket", "error": "exception"})
+        return f"Error translating cricket text: {str(e)}"
+
+@mcp.tool()
+async def translate_cricket_stream(input_text, target_language, ctx: Context, model_id=AUTO_MODEL, profile=False):
+    """
+    Translates cricket text like translate_cricket, streaming translated chunks as progress notifications while the model generates them.
+    
+    Args:
+        input_text (str): The cricket text to translate
+        target_language (str): Target language for translation (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi)
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
+        profile (bool): Attach a profile and stage timings to the response (server must run with --enable-profiling)
         
-        logger.info(f"Translating cricket text to {target_language} using model {model_id}")
+    Returns:
+        str: JSON response containing the full translated text, metadata and time to first chunk
+    """
+    try:
+        with span("tool", tool="translate_cricket_stream"):
+            if not input_text:
+                return "Error: Input text cannot be empty"
+                
+            is_valid, error_message = validate_language(target_language)
+            if not is_valid:
+                return error_message
+            
+            logger.info(f"Streaming cricket text translation to {target_language} using model {model_id}")
+            
+            # Each chunk goes out as a progress notification; clients that did not
+            # send a progress token simply receive the final result
+            chunk_count = 0
+            with profile_request(profile) as profiled, collect_spans() as spans:
+                if needs_chunking(input_text):
+                    # Long documents stream one translated chunk at a time, in order
+                    pieces = []
+                    failed_chunks = []
+                    async for event in stream_cricket_document(input_text, target_language, model_id):
+                        chunk_count += 1
+                        pieces.append(event["joiner"] + event["text"])
+                        if "error" in event:
+                            failed_chunks.append({"index": event["index"], "error": event["error"]})
+                        await ctx.report_progress(chunk_count, message=event["joiner"] + event["text"])
+                    body = {
+                        "translated_text": "".join(pieces),
+                        "source_language": "English",
+                        "target_language": target_language,
+                        "chunks": chunk_count,
+                        "failed_chunks": failed_chunks
+                    }
+                else:
+                    async for event in stream_cricket_translation(input_text, target_language, model_id):
+                        if event["type"] == "chunk":
+                            chunk_count += 1
+                            await ctx.report_progress(chunk_count, message=event["text"])
+                        else:
+                            result = event
+                    body = {
+                        "translated_text": result["translated_text"],
+                        "source_language": "English",
+                        "target_language": target_language,
+                        "chunks": chunk_count,
+                        "time_to_first_chunk_ms": result["time_to_first_chunk_ms"]
+                    }
+            
+            # Return the result as JSON
+            return _to_json("translate_cricket_stream", body, profiled, spans)
+    except (ModelBusyError, ModelUnavailableError) as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket_stream", "error": "rejected"})
+        return f"Error: {str(e)}"
+    except Exception as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket_stream", "error": "exception"})
+        return f"Error translating cricket text: {str(e)}"
+
+@mcp.tool()
+async def translate_cricket_batch(input_texts, target_languages, model_id=AUTO_MODEL, profile=False):
+    """
+    Translates a list of cricket texts into one or more Indian regional languages in a single call.
+    
+    Args:
+        input_texts (list): The cricket texts to translate, e.g. ball-by-ball commentary lines
+        target_languages (list): Target languages for translation (any of Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, Marathi)
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
+        profile (bool): Attach a profile and stage timings to the response (server must run with --enable-profiling)
         
-        # Call the translation function
-        result = await translate_cricket_text(input_text, target_language, model_id)
+    Returns:
+        str: JSON response with one result per input text, in input order, holding a translation or an error per language
+    """
+    try:
+        with span("tool", tool="translate_cricket_batch"):
+            if isinstance(input_texts, str):
+                input_texts = [input_texts]
+            if isinstance(target_languages, str):
+                target_languages = [target_languages]
+            if not input_texts:
+                return "Error: Input texts cannot be empty"
+            if not target_languages:
+                return "Error: At least one target language is required"
+            
+            logger.info(f"Translating {len(input_texts)} cricket texts to {', '.join(target_languages)} using model {model_id}")
+            
+            # Call the batch translation function
+            with profile_request(profile) as profiled, collect_spans() as spans:
+                result = await translate_cricket_batch_texts(input_texts, target_languages, model_id)
+            
+            # Return the result as JSON
+            return _to_json("translate_cricket_batch", result, profiled, spans)
+    except Exception as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket_batch", "error": "exception"})
+        return f"Error translating cricket texts: {str(e)}"
+
+@mcp.tool()
+async def translate_cricket_multilingual(input_text, target_languages, model_id=AUTO_MODEL, profile=False):
+    """
+    Translates one cricket text into several Indian regional languages with a single model call.
+    
+    Args:
+        input_text (str): The cricket text to translate
+        target_languages (list): Target languages for translation (any of Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, Marathi)
+        model_id (str): The model ID to use for translation, or "auto" to pick one by text length (default: "auto")
+        profile (bool): Attach a profile and stage timings to the response (server must run with --enable-profiling)
         
-        # Return the result as JSON
-        return json.dumps({
-            "translated_text": result["translated_text"],
-            "source_language": "English",
-            "target_language": target_language
-        }, indent=2, ensure_ascii=False)
+    Returns:
+        str: JSON response holding a translation or an error per language
+    """
+    try:
+        with span("tool", tool="translate_cricket_multilingual"):
+            if isinstance(target_languages, str):
+                target_languages = [target_languages]
+            if not input_text:
+                return "Error: Input text cannot be empty"
+            if not target_languages:
+                return "Error: At least one target language is required"
+            
+            logger.info(f"Translating cricket text to {', '.join(target_languages)} in one call using model {model_id}")
+            
+            # Call the multi-language translation function
+            with profile_request(profile) as profiled, collect_spans() as spans:
+                result = await translate_cricket_multilingual_text(input_text, target_languages, model_id)
+            
+            # Return the result as JSON
+            return _to_json("translate_cricket_multilingual", result, profiled, spans)
+    except (ModelBusyError, ModelUnavailableError) as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket_multilingual", "error": "rejected"})
+        return f"Error: {str(e)}"
     except Exception as e:
+        METRICS.increment("tool_errors", labels={"tool": "translate_cricket_multilingual", "error": "exception"})
         return f"Error translating cricket text: {str(e)}"
 
 @mcp.tool()
-async def get_cricket_terminology(target_language):
+async def get_cricket_terminology(target_language, terms=None, if_none_match=None):
     """
     Get cricket terminology reference for the specified language.
     
     Args:
-        target_language (str): Target language (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi)
+        target_language (str): Target language (Tamil, Hindi, Telugu, Kannada, Bengali, Malayalam, or Marathi), or "all" for every language in one response
+        terms (list): Only return these term keys, e.g. ["over", "wicket"] (default: all terms)
+        if_none_match (str): The etag of a terminology response already held; when it still matches, a short not_modified answer is returned instead of the terms
         
     Returns:
-        str: JSON response containing cricket terminology in the target language
+        str: JSON response containing cricket terminology in the target language and its etag
     """
     try:
-        is_valid, error_message = validate_language(target_language)
-        if not is_valid:
+        if isinstance(terms, str):
+            terms = [terms]
+        # Responses are serialized when the terminology is loaded, so this is a lookup
+        response = get_cricket_terminology_response(target_language, terms)
+        if response is None:
+            _, error_message = validate_language(target_language)
             return error_message
-        
-        logger.info(f"Getting cricket terminology for {target_language}")
-        
-        # Get the terminology data
-        result = await get_cricket_terminology_data(target_language)
-        
-        # Return the terminology as JSON
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        if if_none_match and if_none_match == response.etag:
+            METRICS.increment("terminology_not_modified")
+            if serialization.RESPONSE_FORMAT == "compact":
+                return response.not_modified
+            return _tool_response("get_cricket_terminology", {"language": response.payload["language"], "etag": response.etag, "not_modified": True})
+        if serialization.RESPONSE_FORMAT == "compact":
+            # Serialized once when the terminology was loaded
+            return response.body
+        return _tool_response("get_cricket_terminology", response.payload)
     except Exception as e:
         return f"Error getting cricket terminology: {str(e)}"
 
+@mcp.tool()
+async def get_translation_stats():
+    """
+    Get runtime statistics for the translation service: cache hits, misses and evictions, prompt size per call and client pool usage.
+    
+    Returns:
+        str: JSON response containing translation metrics
+    """
+    try:
+        return _tool_response("get_translation_stats", get_translation_stats_data())
+    except Exception as e:
+        return f"Error getting translation stats: {str(e)}"
+
+# ==================== METRICS ENDPOINT ====================
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose counters, stage timing histograms and cache/queue gauges in the Prometheus text format."""
+    cache_stats = TRANSLATION_CACHE.stats()
+    gauges = {
+        "cache_entries": cache_stats["entries"],
+        "cache_hit_rate": cache_stats["hit_rate"],
+        "client_pool_size": CLIENT_POOL.stats()["size"],
+    }
+    for model_id, model_stats in MODEL_EXECUTOR.stats().items():
+        gauges[f'model_running{{model="{model_id}"}}'] = model_stats["running"]
+        gauges[f'model_waiting{{model="{model_id}"}}'] = model_stats["waiting"]
+        gauges[f'model_rate_limit{{model="{model_id}"}}'] = model_stats["rate_limiter"]["rate"]
+        gauges[f'model_circuit_open{{model="{model_id}"}}'] = int(model_stats["circuit_breaker"]["state"] != "closed")
+    for model_id, latency in MODEL_ROUTER.stats()["latency"].items():
+        if latency["p95_ms"] is not None:
+            gauges[f'model_latency_p95_ms{{model="{model_id}"}}'] = latency["p95_ms"]
+            gauges[f'model_latency_ewma_ms{{model="{model_id}"}}'] = latency["ewma_ms"]
+    return PlainTextResponse(
+        METRICS.render_prometheus(gauges=gauges),
+        media_type="text/plain; version=0.0.4"
+    )
+
+# ==================== TERMINOLOGY ENDPOINT ====================
+
+@mcp.custom_route("/terminology/{language}", methods=["GET"])
+async def terminology(request: Request) -> Response:
+    """
+    Serve the precomputed terminology response for a language (or "all") with an ETag.
+
+    Clients send the ETag back in If-None-Match and get 304 Not Modified until the
+    terminology changes. ?terms=over,wicket returns only those terms.
+    """
+    terms = [term for term in request.query_params.get("terms", "").split(",") if term]
+    response = get_cricket_terminology_response(request.path_params["language"], terms)
+    if response is None:
+        _, error_message = validate_language(request.path_params["language"])
+        return PlainTextResponse(error_message, status_code=404)
+    headers = {"ETag": f'"{response.etag}"', "Cache-Control": "no-cache"}
+    held = {tag.strip().removeprefix("W/").strip('"') for tag in request.headers.get("if-none-match", "").split(",")}
+    if response.etag in held or "*" in held:
+        METRICS.increment("terminology_not_modified")
+        return Response(status_code=304, headers=headers)
+    return Response(response.body, media_type="application/json", headers=headers)
+
+# ==================== MULTI-WORKER MODE ====================
+
+def _serve_worker(args, cache_path: str, rate_budget_path: str, sock: socket.socket, index: int) -> None:
+    """Run one pre-forked streamable-http worker on the supervisor's socket."""
+    import uvicorn
+
+    # Opened after the fork, so no two processes share a SQLite connection or a thread
+    TRANSLATION_CACHE.configure(path=cache_path)
+    MODEL_EXECUTOR.share_rate_limits(rate_budget_path)
+    TERMINOLOGY.watch(args.terms_reload_interval)
+    if args.warm_up:
+        warm_up_clients()
+    logger.info(f"Worker {index} serving on {args.host}:{args.port}")
+    try:
+        config = uvicorn.Config(mcp.streamable_http_app(), log_level=mcp.settings.log_level.lower())
+        asyncio.run(uvicorn.Server(config).serve(sockets=[sock]))
+    finally:
+        CLIENT_POOL.clear()
+        TRANSLATION_CACHE.close()
+        MODEL_EXECUTOR.shutdown(wait=False)
+
+def _run_workers(args) -> None:
+    """Serve streamable-http from args.workers pre-forked processes sharing one port, cache and rate budget."""
+    state_dir = None
+    cache_path = TRANSLATION_CACHE.path
+    rate_budget_path = MODEL_EXECUTOR.rate_budget.path if MODEL_EXECUTOR.rate_budget else None
+    if cache_path is None or rate_budget_path is None:
+        state_dir = tempfile.mkdtemp(prefix="cricket-workers-")
+        cache_path = cache_path or os.path.join(state_dir, "cache.sqlite")
+        rate_budget_path = rate_budget_path or os.path.join(state_dir, "rate_budget.sqlite")
+    # Workers open their own connections after the fork
+    TRANSLATION_CACHE.close()
+    MODEL_EXECUTOR.share_rate_limits(None)
+    logger.info(f"Starting {args.workers} workers on {args.host}:{args.port}, sharing cache {cache_path} and rate budget {rate_budget_path}")
+    try:
+        run_prefork(
+            bind_socket(args.host, args.port),
+            args.workers,
+            functools.partial(_serve_worker, args, cache_path, rate_budget_path)
+        )
+    finally:
+        if state_dir is not None:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
 # ==================== COMMAND LINE ARGUMENTS ====================
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Crickling Translation Server")
     parser.add_argument(
         "--mode", 
-        choices=["mcp", "standalone"], 
+        choices=["mcp", "standalone", "feed", "bulk"], 
         default="mcp",
-        help="Server mode: 'mcp' for MCP server, 'standalone' for direct function execution"
+        help="Server mode: 'mcp' for MCP server, 'standalone' for direct function execution, 'feed' to translate a live event feed, 'bulk' to translate a JSONL or CSV file"
     )
     parser.add_argument(
         "--mode-type", 
@@ -122,8 +454,20 @@ def parse_args():
     )
     parser.add_argument(
         "--stateless-http",
-        default=True,
-        help="Run HTTP server in stateless mode (used with streamable-http mode type)"
+        type=lambda value: value.lower() in ("1", "true", "yes"),
+        default=os.environ.get("CRICKET_STATELESS_HTTP", "true").lower() in ("1", "true", "yes"),
+        help="Run HTTP server in stateless mode, true or false; --workers above 1 needs it (used with streamable-http mode type, default: CRICKET_STATELESS_HTTP or true)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Worker processes pre-forked behind the port, sharing the translation cache and the model rate budget (used with streamable-http mode type, default: CRICKET_WORKERS or 1)"
+    )
+    parser.add_argument(
+        "--rate-budget-path",
+        default=None,
+        help="SQLite file holding the model rate limits shared by processes on this host; --workers above 1 uses a temporary one if not set (default: CRICKET_RATE_BUDGET_PATH)"
     )
     parser.add_argument(
         "--input-text",
@@ -135,8 +479,237 @@ def parse_args():
     )
     parser.add_argument(
         "--model-id",
-        default="us.amazon.nova-lite-v1:0",
-        help="Model ID to use for translation (standalone mode only)"
+        default=AUTO_MODEL,
+        help="Model ID to use for translation, or auto to pick one by text length (standalone, feed and bulk modes)"
+    )
+    parser.add_argument(
+        "--model-concurrency",
+        type=int,
+        default=None,
+        help="Maximum concurrent model calls per model ID (default: CRICKET_MODEL_CONCURRENCY or 4)"
+    )
+    parser.add_argument(
+        "--model-queue-depth",
+        type=int,
+        default=None,
+        help="Maximum queued model calls per model ID before requests are rejected as busy (default: CRICKET_MODEL_QUEUE_DEPTH or 32)"
+    )
+    parser.add_argument(
+        "--model-rate",
+        type=float,
+        default=None,
+        help="Maximum model calls started per second per model ID, lowered automatically while Bedrock throttles; 0 learns the limit from the first throttle, -1 turns pacing off (default: CRICKET_MODEL_RATE or 0)"
+    )
+    parser.add_argument(
+        "--model-retries",
+        type=int,
+        default=None,
+        help="Retries of a throttled or transiently failing model call, with jittered exponential backoff (default: CRICKET_MODEL_RETRIES or 3)"
+    )
+    parser.add_argument(
+        "--model-tiers",
+        default=None,
+        help="Models picked by text length for model_id auto, as comma-separated max_tokens=model_id entries with a bare catch-all model last, e.g. 60=us.amazon.nova-micro-v1:0,us.amazon.nova-lite-v1:0 (default: CRICKET_MODEL_TIERS, or CRICKET_MODEL_ID for everything)"
+    )
+    parser.add_argument(
+        "--hedge-model",
+        default=None,
+        help="Model that a call is also sent to when the primary model has not answered within its p95 latency; the first answer wins (default: CRICKET_HEDGE_MODEL, off)"
+    )
+    parser.add_argument(
+        "--hedge-quantile",
+        type=float,
+        default=None,
+        help="Latency quantile of the primary model after which a call is hedged (default: CRICKET_HEDGE_QUANTILE or 0.95)"
+    )
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=None,
+        help="Share of the model calls in flight that may be hedged at once; one hedge is always allowed (default: CRICKET_HEDGE_BUDGET or 0.1)"
+    )
+    parser.add_argument(
+        "--client-pool-size",
+        type=int,
+        default=None,
+        help="Maximum number of pooled model clients (default: CRICKET_CLIENT_POOL_SIZE or 8)"
+    )
+    parser.add_argument(
+        "--client-idle-ttl",
+        type=float,
+        default=None,
+        help="Seconds before an unused model client is evicted from the pool (default: CRICKET_CLIENT_IDLE_TTL or 900)"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=None,
+        help="Maximum translations kept in the in-memory cache, 0 disables caching (default: CRICKET_CACHE_SIZE or 10000)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Seconds a cached translation stays valid (default: CRICKET_CACHE_TTL or 86400)"
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=None,
+        help="SQLite file for a persistent translation cache that survives restarts (default: CRICKET_CACHE_PATH)"
+    )
+    parser.add_argument(
+        "--translation-memory",
+        default=None,
+        help="JSONL file of approved translations reused for near-duplicate lines that differ only in numbers or filler words (default: CRICKET_TRANSLATION_MEMORY, off)"
+    )
+    parser.add_argument(
+        "--memory-min-similarity",
+        type=float,
+        default=None,
+        help="Trigram similarity a remembered line needs for its approved translation to be reused (default: CRICKET_MEMORY_MIN_SIMILARITY or 0.9)"
+    )
+    parser.add_argument(
+        "--terms-path",
+        default=None,
+        help="JSON file with the terminology, example translations and supported languages (default: CRICKET_TERMS_PATH or common/data/terminology.json)"
+    )
+    parser.add_argument(
+        "--terms-reload-interval",
+        type=float,
+        default=None,
+        help="Seconds between checks of the terminology file for changes, which are loaded without a restart; 0 turns reloading off (default: CRICKET_TERMS_RELOAD_INTERVAL or 5)"
+    )
+    parser.add_argument(
+        "--fake-model",
+        action="store_true",
+        help="Answer with a local fake Bedrock model instead of AWS, for offline load tests"
+    )
+    parser.add_argument(
+        "--fake-latency",
+        type=float,
+        default=0.5,
+        help="Seconds each fake model request waits before answering (used with --fake-model)"
+    )
+    parser.add_argument(
+        "--fake-token-rate",
+        type=float,
+        default=50,
+        help="Output tokens per second streamed by the fake model, 0 for instant (used with --fake-model)"
+    )
+    parser.add_argument(
+        "--fake-failure-rate",
+        type=float,
+        default=0,
+        help="Share of fake model requests that fail, between 0 and 1 (used with --fake-model)"
+    )
+    parser.add_argument(
+        "--fake-max-rps",
+        type=float,
+        default=0,
+        help="Requests per second the fake model accepts before throttling, 0 for no limit (used with --fake-model)"
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        default=os.environ.get("CRICKET_WARM_UP", "").lower() in ("1", "true", "yes"),
+        help="Load the model SDK and build the model clients in the background once the server is up, instead of on the first translation (default: CRICKET_WARM_UP)"
+    )
+    parser.add_argument(
+        "--response-format",
+        choices=RESPONSE_FORMATS,
+        default=serialization.RESPONSE_FORMAT,
+        help="How tools return JSON: 'compact' text, indented 'pretty' text, or 'structured' MCP content with the compact JSON as a text copy (default: CRICKET_RESPONSE_FORMAT or compact)"
+    )
+    parser.add_argument(
+        "--debug-prompts",
+        action="store_true",
+        default=cricket_translation.DEBUG_PROMPTS,
+        help="Include the rendered prompt as prompt_used in translation results, e.g. the standalone translate output (default: CRICKET_DEBUG_PROMPTS)"
+    )
+    parser.add_argument(
+        "--enable-profiling",
+        action="store_true",
+        help="Allow translation tool calls to request a per-request profile with profile=true"
+    )
+    parser.add_argument(
+        "--feed-source",
+        default="-",
+        help="Feed of JSON events, one per line: a JSONL file, - for stdin, tcp://host:port or unix:/path for a local socket (feed mode only)"
+    )
+    parser.add_argument(
+        "--feed-follow",
+        action="store_true",
+        help="Keep reading events appended to the feed file, like tail -f (feed mode only)"
+    )
+    parser.add_argument(
+        "--feed-output",
+        default=None,
+        help="File the translated events are appended to as JSON lines (feed mode only, default: stdout)"
+    )
+    parser.add_argument(
+        "--feed-languages",
+        nargs="+",
+        default=None,
+        help="Target languages for every event that does not name its own (feed mode only, default: all supported languages)"
+    )
+    parser.add_argument(
+        "--feed-checkpoint",
+        default=os.environ.get("CRICKET_FEED_CHECKPOINT"),
+        help="JSON file recording the last event written per match, so a restart resumes without translating events again (feed mode only, default: CRICKET_FEED_CHECKPOINT)"
+    )
+    parser.add_argument(
+        "--feed-max-in-flight",
+        type=int,
+        default=None,
+        help="Events read but not yet written before the feed stops being read (feed mode only, default: CRICKET_FEED_MAX_IN_FLIGHT or 32)"
+    )
+    parser.add_argument(
+        "--bulk-input",
+        help="JSONL or CSV file of records with a text field to translate (required in bulk mode)"
+    )
+    parser.add_argument(
+        "--bulk-output",
+        default=None,
+        help="JSONL file the translated records are written to, in input order (bulk mode only, default: stdout)"
+    )
+    parser.add_argument(
+        "--bulk-languages",
+        nargs="+",
+        default=None,
+        help="Target languages for every record that does not name its own (bulk mode only, default: all supported languages)"
+    )
+    parser.add_argument(
+        "--bulk-checkpoint",
+        default=os.environ.get("CRICKET_BULK_CHECKPOINT"),
+        help="JSON file recording how far the input has been written, so an interrupted run resumes there (bulk mode only, default: CRICKET_BULK_CHECKPOINT or the output file plus .checkpoint)"
+    )
+    parser.add_argument(
+        "--bulk-concurrency",
+        type=int,
+        default=None,
+        help="Records translated at the same time (bulk mode only, default: CRICKET_BULK_CONCURRENCY or 16)"
+    )
+    parser.add_argument(
+        "--bulk-format",
+        choices=["jsonl", "csv"],
+        default=None,
+        help="Input format (bulk mode only, default: csv for .csv and .tsv files, otherwise jsonl)"
+    )
+    parser.add_argument(
+        "--bulk-id-field",
+        default="id",
+        help="Input field holding the record id, copied to the output (bulk mode only)"
+    )
+    parser.add_argument(
+        "--bulk-text-field",
+        default="text",
+        help="Input field holding the text to translate (bulk mode only)"
+    )
+    parser.add_argument(
+        "--bulk-progress-interval",
+        type=float,
+        default=None,
+        help="Seconds between progress lines with throughput and ETA, 0 for none (bulk mode only, default: CRICKET_BULK_PROGRESS_INTERVAL or 5)"
     )
     parser.add_argument(
         "--function",
@@ -151,11 +724,61 @@ def parse_args():
 if __name__ == "__main__":
     try:
         args = parse_args()
+        MODEL_EXECUTOR.configure(
+            max_concurrency=args.model_concurrency,
+            max_queue_depth=args.model_queue_depth,
+            max_rate=args.model_rate
+        )
+        if args.model_retries is not None:
+            MODEL_EXECUTOR.retry_policy.retries = args.model_retries
+        MODEL_ROUTER.configure(
+            tiers=args.model_tiers,
+            hedge_model=args.hedge_model,
+            hedge_quantile=args.hedge_quantile,
+            hedge_budget=args.hedge_budget
+        )
+        if args.client_pool_size is not None:
+            CLIENT_POOL.max_size = args.client_pool_size
+        if args.client_idle_ttl is not None:
+            CLIENT_POOL.idle_ttl = args.client_idle_ttl
+        TRANSLATION_CACHE.configure(
+            max_entries=args.cache_size,
+            ttl=args.cache_ttl,
+            path=args.cache_path
+        )
+        TERMINOLOGY.configure(path=args.terms_path)
+        TRANSLATION_MEMORY.configure(path=args.translation_memory, min_similarity=args.memory_min_similarity)
+        multi_worker = args.mode == "mcp" and args.mode_type == "streamable-http" and args.workers > 1
+        if multi_worker and not args.stateless_http:
+            logger.error("--workers above 1 needs --stateless-http true, as a session cannot follow its requests to another worker")
+            sys.exit(1)
+        if args.rate_budget_path is not None:
+            MODEL_EXECUTOR.share_rate_limits(args.rate_budget_path)
+        if args.mode != "standalone" and not multi_worker:
+            # Each worker starts its own watcher after the fork
+            TERMINOLOGY.watch(args.terms_reload_interval)
+        if args.enable_profiling:
+            instrumentation.PROFILING_ENABLED = True
+        serialization.RESPONSE_FORMAT = args.response_format
+        cricket_translation.DEBUG_PROMPTS = args.debug_prompts
+        if args.fake_model:
+            # Imported here so normal deployments never load the benchmark package
+            from benchmark.fake_bedrock import fake_bedrock_factory
+            logger.info(f"Using fake Bedrock model: latency {args.fake_latency}s, failure rate {args.fake_failure_rate}")
+            set_model_factory(fake_bedrock_factory(
+                latency=args.fake_latency,
+                token_rate=args.fake_token_rate,
+                failure_rate=args.fake_failure_rate,
+                max_rps=args.fake_max_rps
+            ))
         
         if args.mode == "mcp":
             # Reconfigure MCP based on mode type
             if args.mode_type == "stdio":
                 logger.info("Starting Crickling MCP Server: Mode Type stdio")
+                if args.warm_up:
+                    # Q CLI waits for initialize and list_tools, so warming up waits for them too
+                    mcp.warm_up_on_list_tools = True
                 # Reinitialize with appropriate settings for stdio
                 mcp.run(transport="stdio")
             elif args.mode_type == "streamable-http":
@@ -163,10 +786,52 @@ if __name__ == "__main__":
                 # Reinitialize with appropriate settings for HTTP
                 mcp.settings.host = args.host
                 mcp.settings.port = args.port
-                mcp.settings.stateless_http = True
-                mcp.run(
-                    transport="streamable-http"
-                )
+                mcp.settings.stateless_http = args.stateless_http
+                if multi_worker:
+                    _run_workers(args)
+                else:
+                    if args.warm_up:
+                        warm_up_clients()
+                    mcp.run(
+                        transport="streamable-http"
+                    )
+        elif args.mode == "feed":
+            # Imported here so the MCP server does not load the feed subsystem
+            from common.feed_ingestion import run_feed
+            output = open(args.feed_output, "a", encoding="utf-8") if args.feed_output else sys.stdout
+            try:
+                counts = asyncio.run(run_feed(
+                    args.feed_source,
+                    args.feed_languages,
+                    args.model_id,
+                    output,
+                    checkpoint_path=args.feed_checkpoint,
+                    follow=args.feed_follow,
+                    max_in_flight=args.feed_max_in_flight
+                ))
+                logger.info(f"Feed finished: {counts}")
+            finally:
+                if output is not sys.stdout:
+                    output.close()
+        elif args.mode == "bulk":
+            if not args.bulk_input:
+                print("Error: --bulk-input is required in bulk mode")
+                sys.exit(1)
+            # Imported here so the MCP server does not load the bulk subsystem
+            from common.bulk_translation import run_bulk
+            counts = asyncio.run(run_bulk(
+                args.bulk_input,
+                args.bulk_languages,
+                args.model_id,
+                output_path=args.bulk_output,
+                checkpoint_path=args.bulk_checkpoint,
+                input_format=args.bulk_format,
+                id_field=args.bulk_id_field,
+                text_field=args.bulk_text_field,
+                concurrency=args.bulk_concurrency,
+                progress_interval=args.bulk_progress_interval
+            ))
+            logger.info(f"Bulk translation finished: {counts}")
         else:
             # Standalone mode - directly execute the functions
             if args.function == "translate":
@@ -186,15 +851,19 @@ if __name__ == "__main__":
                     print("Error: --target-language is required for terminology lookup in standalone mode")
                     sys.exit(1)
                     
-                result = asyncio.run(get_cricket_terminology_data(args.target_language))
-                print(json.dumps(result, indent=2, ensure_ascii=False))
+                response = get_cricket_terminology_response(args.target_language)
+                if response is None:
+                    print(validate_language(args.target_language)[1])
+                    sys.exit(1)
+                print(response.body)
     except KeyboardInterrupt:
         logger.info("Server shutdown requested")
     except Exception as e:
         logger.error(f"Error running server: {str(e)}")
     finally:
-        # Clean up agents
-        from common.cricket_translation import AGENTS
-        logger.info(f"Cleaning up {len(AGENTS)} agent instances")
-        AGENTS.clear()
+        # Clean up pooled model clients
+        logger.info(f"Cleaning up {len(CLIENT_POOL)} model clients")
+        CLIENT_POOL.clear()
+        TRANSLATION_CACHE.close()
+        MODEL_EXECUTOR.shutdown(wait=False)
         logger.info("Server shutdown complete")